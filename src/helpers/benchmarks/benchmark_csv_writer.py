@@ -0,0 +1,76 @@
+# src/helpers/benchmarks/benchmark_csv_writer.py
+
+import os
+import time
+import tempfile
+import argparse
+import numpy as np
+import pandas as pd
+from src.interfaces.writers.csv_writer import CsvWriter
+
+def build_sample_data(num_rows, seed=42):
+    """
+    Build a synthetic normalized frame resembling a bronze CSV output.
+
+    Args:
+    - num_rows (int): Number of rows to generate.
+    - seed (int): Random seed for reproducible data.
+
+    Returns:
+    - pd.DataFrame: Synthetic normalized data.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Column1': rng.integers(0, 1_000_000, num_rows),
+        'Column2': rng.random(num_rows),
+        'Column3': rng.choice(['alpha', 'beta', 'gamma', 'delta'], num_rows),
+        'source_filepath': 'datalake/source/example_file_1.xlsx',
+        'source_sheetname': 'Sheet1',
+        'created_time': pd.Timestamp.now(),
+    })
+
+def run_benchmark(num_rows=1_000_000, chunk_size=None, engines=('pandas', 'pyarrow'), compressions=(None, 'gzip', 'zstd')):
+    """
+    Measure write throughput and output size for each engine/compression combination.
+
+    Args:
+    - num_rows (int): Number of rows written per run.
+    - chunk_size (int, optional): Rows written per chunk.
+    - engines (tuple): CSV engines to compare.
+    - compressions (tuple): Compression codecs to compare (None for uncompressed).
+
+    Returns:
+    - list: One dict per combination with elapsed seconds, rows/s and output size.
+    """
+    data = build_sample_data(num_rows)
+    writer = CsvWriter()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for engine in engines:
+            for compression in compressions:
+                output_path = os.path.join(tmp_dir, f"{engine}_{compression or 'none'}.csv")
+                start = time.perf_counter()
+                written_path = writer.write(data, output_path, compression=compression, engine=engine, chunk_size=chunk_size)
+                elapsed = time.perf_counter() - start
+                results.append({
+                    'engine': engine,
+                    'compression': compression or 'none',
+                    'seconds': elapsed,
+                    'rows_per_second': num_rows / elapsed,
+                    'size_mb': os.path.getsize(written_path) / (1024 * 1024),
+                })
+
+    print(f"\nCSV writer benchmark ({num_rows:,} rows):")
+    print(f"  {'engine':<8} {'compression':<12} {'seconds':>8} {'rows/s':>12} {'size MB':>9}")
+    for result in results:
+        print(f"  {result['engine']:<8} {result['compression']:<12} {result['seconds']:8.2f} "
+              f"{result['rows_per_second']:12,.0f} {result['size_mb']:9.1f}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark CsvWriter engines and compression codecs.')
+    parser.add_argument('--num-rows', type=int, default=1_000_000, help='Number of rows to write.')
+    parser.add_argument('--chunk-size', type=int, default=None, help='Rows written per chunk.')
+    args = parser.parse_args()
+    run_benchmark(args.num_rows, args.chunk_size)
@@ -0,0 +1,100 @@
+# src/helpers/benchmarks/benchmark_duckdb_partitioning.py
+
+import os
+import time
+import tempfile
+import argparse
+import duckdb
+import numpy as np
+import pandas as pd
+from src.interfaces.writers.duckdb_writer import DuckdbWriter
+
+def build_sample_data(num_files, rows_per_file, seed=42):
+    """
+    Build a synthetic bronze frame with one partition per source file, shuffled so that
+    an unordered insert interleaves partitions across row groups.
+
+    Args:
+    - num_files (int): Number of distinct `source_filepath` values.
+    - rows_per_file (int): Number of rows per source file.
+    - seed (int): Random seed for reproducible data.
+
+    Returns:
+    - pd.DataFrame: Synthetic normalized data.
+    """
+    rng = np.random.default_rng(seed)
+    total_rows = num_files * rows_per_file
+    data = pd.DataFrame({
+        'Column1': rng.integers(0, 1_000_000, total_rows),
+        'Column2': rng.random(total_rows),
+        'source_filepath': np.repeat([f"datalake/source/file_{i:04d}.xlsx" for i in range(num_files)], rows_per_file),
+        'source_sheetname': 'Sheet1',
+        'created_time': pd.Timestamp.now(),
+    })
+    return data.sample(frac=1, random_state=seed).reset_index(drop=True)
+
+def time_query(conn, query, repeats):
+    """
+    Run a query several times and return the best wall-clock time in milliseconds.
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        conn.execute(query).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return min(timings)
+
+def run_benchmark(num_files=200, rows_per_file=10_000, repeats=5):
+    """
+    Compare a filtered query on an unordered heap table, a table clustered by its partition
+    columns, and a hive-partitioned Parquet export.
+
+    Args:
+    - num_files (int): Number of distinct partitions.
+    - rows_per_file (int): Rows per partition.
+    - repeats (int): Number of timed runs per query (best time is reported).
+
+    Returns:
+    - dict: Best query time in milliseconds for each layout.
+    """
+    data = build_sample_data(num_files, rows_per_file)
+    target_file = f"datalake/source/file_{num_files // 2:04d}.xlsx"
+    writer = DuckdbWriter()
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'benchmark.duckdb')
+        conn = duckdb.connect(db_path)
+        conn.execute("CREATE SCHEMA IF NOT EXISTS main_bronze")
+        conn.close()
+
+        # Unordered heap: insert everything in arrival order
+        writer.write(data.copy(), db_path, 'main_bronze', 'heap', [], sort_by=[])
+        # Clustered: insert ordered by the partition columns
+        writer.write(data.copy(), db_path, 'main_bronze', 'clustered', [], sort_by=['source_filepath', 'source_sheetname'])
+        writer.export_parquet(db_path, 'main_bronze', 'clustered', os.path.join(tmp_dir, 'parquet'), ['source_filepath', 'source_sheetname'])
+
+        conn = duckdb.connect(db_path, read_only=True)
+        predicate = f"source_filepath = '{target_file}' AND source_sheetname = 'Sheet1'"
+        results['heap'] = time_query(conn, f"SELECT sum(Column2) FROM main_bronze.heap WHERE {predicate}", repeats)
+        results['clustered'] = time_query(conn, f"SELECT sum(Column2) FROM main_bronze.clustered WHERE {predicate}", repeats)
+        parquet_glob = os.path.join(tmp_dir, 'parquet', '**', '*.parquet')
+        results['hive_parquet'] = time_query(
+            conn,
+            f"SELECT sum(Column2) FROM read_parquet('{parquet_glob}', hive_partitioning = true) WHERE {predicate}",
+            repeats,
+        )
+        conn.close()
+
+    print(f"Filtered query on {num_files * rows_per_file:,} rows ({num_files} partitions), best of {repeats}:")
+    for layout, elapsed in results.items():
+        print(f"  {layout:<14} {elapsed:8.2f} ms")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark filtered queries on DuckDB bronze table layouts.')
+    parser.add_argument('--num-files', type=int, default=200, help='Number of distinct source files (partitions).')
+    parser.add_argument('--rows-per-file', type=int, default=10_000, help='Rows per source file.')
+    parser.add_argument('--repeats', type=int, default=5, help='Timed runs per query.')
+    args = parser.parse_args()
+    run_benchmark(args.num_files, args.rows_per_file, args.repeats)
@@ -0,0 +1,74 @@
+# src/helpers/benchmarks/benchmark_excel_engines.py
+
+import os
+import time
+import tempfile
+import argparse
+import numpy as np
+import pandas as pd
+from src.interfaces.loaders.excel_loader import ExcelLoader, EXCEL_ENGINES
+
+def build_sample_workbook(file_path, num_rows, num_columns=10, seed=42):
+    """
+    Write a synthetic single-sheet workbook mixing integer, float, string and date columns.
+
+    Args:
+    - file_path (str): Path of the workbook to create.
+    - num_rows (int): Number of data rows.
+    - num_columns (int): Number of columns (cycled across the four column types).
+    - seed (int): Random seed for reproducible data.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for idx in range(num_columns):
+        kind = idx % 4
+        if kind == 0:
+            columns[f"int_{idx}"] = rng.integers(0, 1_000_000, num_rows)
+        elif kind == 1:
+            columns[f"float_{idx}"] = rng.random(num_rows)
+        elif kind == 2:
+            columns[f"str_{idx}"] = rng.choice(['alpha', 'beta', 'gamma', 'delta'], num_rows)
+        else:
+            columns[f"date_{idx}"] = pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365, num_rows), unit='D')
+    pd.DataFrame(columns).to_excel(file_path, sheet_name='Sheet1', index=False)
+
+def run_benchmark(row_counts=(1_000, 10_000, 100_000), engines=None, num_columns=10):
+    """
+    Time `ExcelLoader.load` for each engine on workbooks of increasing size.
+
+    Args:
+    - row_counts (tuple): Workbook sizes (rows) to benchmark.
+    - engines (list, optional): Engines to compare. Defaults to every registered engine.
+    - num_columns (int): Number of columns per workbook.
+
+    Returns:
+    - list: One dict per (rows, engine) with the elapsed seconds, or None if the engine is unavailable.
+    """
+    engines = engines or list(EXCEL_ENGINES)
+    loader = ExcelLoader()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in row_counts:
+            file_path = os.path.join(tmp_dir, f"workbook_{num_rows}.xlsx")
+            build_sample_workbook(file_path, num_rows, num_columns)
+            for engine in engines:
+                start = time.perf_counter()
+                data = loader.load(file_path, ['Sheet1'], engine=engine)
+                elapsed = time.perf_counter() - start
+                results.append({'rows': num_rows, 'engine': engine, 'seconds': elapsed if 'Sheet1' in data else None})
+
+    print(f"\nExcel engine benchmark ({num_columns} columns, seconds per sheet):")
+    print(f"  {'rows':>8} " + " ".join(f"{engine:>16}" for engine in engines))
+    for num_rows in row_counts:
+        timings = [r['seconds'] for r in results if r['rows'] == num_rows]
+        cells = " ".join(f"{t:16.2f}" if t is not None else f"{'n/a':>16}" for t in timings)
+        print(f"  {num_rows:>8,} {cells}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark ExcelLoader parsing engines.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000], help='Workbook sizes in rows.')
+    parser.add_argument('--columns', type=int, default=10, help='Number of columns per workbook.')
+    args = parser.parse_args()
+    run_benchmark(tuple(args.rows), num_columns=args.columns)
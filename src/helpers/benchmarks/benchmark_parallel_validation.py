@@ -0,0 +1,85 @@
+# src/helpers/benchmarks/benchmark_parallel_validation.py
+
+import os
+import time
+import tempfile
+import argparse
+import numpy as np
+import pandas as pd
+import pandera as pa
+from src.interfaces.schema_manager import SchemaManager
+
+def build_sample_schema():
+    """
+    Build a schema mixing type checks, row-level checks and a uniqueness constraint.
+    """
+    return pa.DataFrameSchema({
+        "id": pa.Column(int, unique=True),
+        "amount": pa.Column(float, checks=pa.Check.in_range(0, 1_000)),
+        "quantity": pa.Column(int, checks=pa.Check.greater_than_or_equal_to(0)),
+        "category": pa.Column(str, checks=pa.Check.isin(['alpha', 'beta', 'gamma', 'delta'])),
+        "code": pa.Column(str, checks=pa.Check.str_matches(r'^[A-Z]{3}-\d{4}$')),
+    })
+
+def build_sample_frame(num_rows, seed=42):
+    """
+    Build a frame of `num_rows` rows that passes `build_sample_schema`.
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "id": np.arange(num_rows),
+        "amount": rng.random(num_rows) * 1_000,
+        "quantity": rng.integers(0, 100, num_rows),
+        "category": rng.choice(['alpha', 'beta', 'gamma', 'delta'], num_rows),
+        "code": rng.choice(['ABC-1234', 'XYZ-0001', 'QRS-9876'], num_rows),
+    })
+
+def run_benchmark(num_rows=2_000_000, worker_counts=(1, 2, 4, 8), executors=('thread', 'process'), chunk_rows=250_000):
+    """
+    Time `SchemaManager.validate_data` serially and with each executor and worker count.
+
+    Args:
+    - num_rows (int): Rows of the validated frame.
+    - worker_counts (tuple): Worker counts to benchmark (1 is the serial baseline).
+    - executors (tuple): Executors to compare.
+    - chunk_rows (int): Rows per chunk.
+
+    Returns:
+    - list: One dict per (executor, workers) with the elapsed seconds and the speedup over serial.
+    """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        schema_path = os.path.join(tmp_dir, 'source', 'benchmark', 'benchmark_schema.yaml')
+        os.makedirs(os.path.dirname(schema_path))
+        build_sample_schema().to_yaml(schema_path)
+        schema_manager = SchemaManager(schema_path)
+    dataframe = build_sample_frame(num_rows)
+
+    start = time.perf_counter()
+    schema_manager.validate_data(dataframe)
+    serial = time.perf_counter() - start
+    results = [{'executor': 'serial', 'workers': 1, 'seconds': serial, 'speedup': 1.0}]
+
+    for executor in executors:
+        for workers in worker_counts:
+            if workers < 2:
+                continue
+            start = time.perf_counter()
+            validated = schema_manager.validate_data(dataframe, workers=workers, chunk_rows=chunk_rows, executor=executor)
+            elapsed = time.perf_counter() - start
+            assert validated is not None and len(validated) == num_rows
+            results.append({'executor': executor, 'workers': workers, 'seconds': elapsed, 'speedup': serial / elapsed})
+
+    print(f"\nParallel validation benchmark ({num_rows:,} rows, {chunk_rows:,} rows per chunk, {os.cpu_count()} CPUs):")
+    print(f"  {'executor':>8} {'workers':>8} {'seconds':>9} {'speedup':>8}")
+    for r in results:
+        print(f"  {r['executor']:>8} {r['workers']:>8} {r['seconds']:9.2f} {r['speedup']:7.2f}x")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark chunk-parallel schema validation.')
+    parser.add_argument('--rows', type=int, default=2_000_000, help='Rows of the validated frame.')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Worker counts to benchmark.')
+    parser.add_argument('--executors', nargs='+', default=['thread', 'process'], help='Executors to compare.')
+    parser.add_argument('--chunk-rows', type=int, default=250_000, help='Rows per chunk.')
+    args = parser.parse_args()
+    run_benchmark(args.rows, tuple(args.workers), tuple(args.executors), args.chunk_rows)
@@ -0,0 +1,95 @@
+# src/helpers/benchmarks/benchmark_sheet_scan.py
+
+import os
+import time
+import zipfile
+import tempfile
+import argparse
+from openpyxl import Workbook, load_workbook
+from openpyxl.chart import BarChart, Reference
+from src.helpers.data_profiling.profile_excel_files import (
+    detect_charts_in_sheet, detect_formulas_in_sheet, scan_charts_in_sheet, scan_formulas_in_sheet
+)
+from src.interfaces.loaders.xlsx_metadata import read_sheet_paths
+
+def build_sample_workbook(file_path, num_rows, num_columns=10, with_formulas=True):
+    """
+    Write a single-sheet workbook of numbers, optionally with a formula column and a chart.
+
+    Args:
+    - file_path (str): Path of the workbook to create.
+    - num_rows (int): Number of rows.
+    - num_columns (int): Number of columns, the last one holding formulas if `with_formulas`.
+    - with_formulas (bool): Add the formula column and a bar chart over the first rows.
+    """
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet('Sheet1')
+    for row in range(1, num_rows + 1):
+        values = [row * col for col in range(1, num_columns)]
+        values.append(f"=A{row}+B{row}" if with_formulas else row)
+        worksheet.append(values)
+    if with_formulas:
+        chart = BarChart()
+        chart.add_data(Reference(worksheet, min_col=1, min_row=1, max_row=10))
+        worksheet.add_chart(chart, 'M2')
+    workbook.save(file_path)
+
+def detect_with_object_model(file_path):
+    """
+    Detect charts and formulas by loading the workbook with openpyxl, as the profiler used to.
+    """
+    workbook = load_workbook(file_path, data_only=False)
+    worksheet = workbook['Sheet1']
+    return detect_charts_in_sheet(worksheet), detect_formulas_in_sheet(worksheet)
+
+def detect_with_xml_scan(file_path):
+    """
+    Detect charts and formulas by scanning the sheet's parts in the xlsx archive.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_path = read_sheet_paths(archive)['Sheet1']
+        return scan_charts_in_sheet(archive, sheet_path), scan_formulas_in_sheet(archive, sheet_path)
+
+def run_benchmark(row_counts=(100_000, 300_000), num_columns=10):
+    """
+    Time chart and formula detection with openpyxl's object model and with the XML scan.
+
+    Args:
+    - row_counts (tuple): Sheet sizes (rows) to benchmark.
+    - num_columns (int): Number of columns per sheet.
+
+    Returns:
+    - list: One dict per (rows, formulas) with the seconds taken by each method.
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for num_rows in row_counts:
+            for with_formulas in (True, False):
+                file_path = os.path.join(tmp_dir, f"sheet_{num_rows}_{with_formulas}.xlsx")
+                build_sample_workbook(file_path, num_rows, num_columns, with_formulas)
+
+                start = time.perf_counter()
+                expected = detect_with_object_model(file_path)
+                object_model = time.perf_counter() - start
+
+                start = time.perf_counter()
+                scanned = detect_with_xml_scan(file_path)
+                xml_scan = time.perf_counter() - start
+
+                assert scanned == expected
+                results.append({'cells': num_rows * num_columns, 'formulas': with_formulas,
+                                'object_model': object_model, 'xml_scan': xml_scan})
+
+    print(f"\nFormula and chart detection benchmark ({num_columns} columns, seconds per sheet):")
+    print(f"  {'cells':>12} {'formulas':>9} {'object model':>13} {'xml scan':>9} {'speedup':>8}")
+    for r in results:
+        print(f"  {r['cells']:>12,} {str(r['formulas']):>9} {r['object_model']:13.2f} {r['xml_scan']:9.2f} "
+              f"{r['object_model'] / r['xml_scan']:7.1f}x")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark formula and chart detection on large sheets.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000, 300_000], help='Sheet sizes in rows.')
+    parser.add_argument('--columns', type=int, default=10, help='Number of columns per sheet.')
+    args = parser.parse_args()
+    run_benchmark(tuple(args.rows), num_columns=args.columns)
@@ -0,0 +1,419 @@
+# src/helpers/data_profiling/column_sketches.py
+
+import math
+import base64
+import random
+import hashlib
+import datetime
+
+# Quantiles reported in the profile, from the KLL sketch of numeric values
+REPORTED_QUANTILES = {'p05': 0.05, 'p25': 0.25, 'p50': 0.5, 'p75': 0.75, 'p95': 0.95}
+
+# Number of most frequent values reported in the profile
+REPORTED_TOP_VALUES = 10
+
+# Cell value types grouped by how their min/max are compared
+RANGE_FAMILIES = {'int': 'number', 'float': 'number', 'datetime': 'datetime', 'str': 'str'}
+
+def value_type(value):
+    """
+    Name the type of a cell value as read by openpyxl ('int', 'float', 'bool', 'str', 'datetime' or 'time').
+    """
+    if isinstance(value, bool):
+        return 'bool'
+    if isinstance(value, int):
+        return 'int'
+    if isinstance(value, float):
+        return 'float'
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return 'datetime'
+    if isinstance(value, datetime.time):
+        return 'time'
+    return 'str'
+
+def value_key(value):
+    """
+    Render a cell value as the string its distinct count and frequency are tracked by, so that
+    1 and 1.0 count as the same value.
+    """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    return str(value)
+
+class HyperLogLog:
+    """
+    HyperLogLog sketch estimating the number of distinct values, within about 1.04 / sqrt(2^p).
+    Sketches with the same precision merge by taking the maximum of each register.
+    """
+
+    def __init__(self, p=11, registers=None):
+        """
+        Initializes the HyperLogLog.
+
+        Args:
+        - p (int): Precision; the sketch holds 2^p one-byte registers.
+        - registers (bytearray, optional): Registers of a serialized sketch.
+        """
+        self.p = p
+        self.registers = bytearray(registers) if registers is not None else bytearray(1 << p)
+
+    def add(self, key):
+        """
+        Add a value, given as its string key.
+        """
+        hashed = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'big')
+        index = hashed >> (64 - self.p)
+        remainder = hashed & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """
+        Merge another sketch of the same precision into this one.
+        """
+        if other.p != self.p:
+            raise ValueError(f"Cannot merge HyperLogLog sketches of precision {self.p} and {other.p}.")
+        self.registers = bytearray(max(a, b) for a, b in zip(self.registers, other.registers))
+
+    def estimate(self):
+        """
+        Return the estimated number of distinct values.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        empty = self.registers.count(0)
+        if raw <= 2.5 * m and empty:
+            # Linear counting is more accurate while many registers are still empty
+            return round(m * math.log(m / empty))
+        return round(raw)
+
+    def to_dict(self):
+        return {'p': self.p, 'registers': base64.b64encode(bytes(self.registers)).decode()}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['p'], base64.b64decode(state['registers']))
+
+class KllSketch:
+    """
+    KLL quantile sketch over numeric values. It keeps a hierarchy of compactors where an item at
+    level h stands for 2^h values; a full level is sorted and every other item is promoted, so the
+    sketch holds O(k) items whatever the number of values, with a rank error of about 1.7 / k.
+    Sketches merge by concatenating their levels and compacting again.
+    """
+
+    def __init__(self, k=200, n=0, levels=None, seed=0):
+        """
+        Initializes the KllSketch.
+
+        Args:
+        - k (int): Capacity of the top level; larger is more accurate.
+        - n (int): Number of values summarized by a serialized sketch.
+        - levels (list, optional): Items of each level of a serialized sketch.
+        - seed (int): Seed of the coin deciding which half of a level is promoted.
+        """
+        self.k = k
+        self.n = n
+        self.levels = [list(level) for level in levels] if levels else [[]]
+        self.rng = random.Random(seed)
+        self.size = sum(len(level) for level in self.levels)
+        self.max_size = self.compute_max_size()
+
+    def capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def compute_max_size(self):
+        return sum(self.capacity(level) for level in range(len(self.levels)))
+
+    def add(self, value):
+        """
+        Add a numeric value.
+        """
+        self.levels[0].append(value)
+        self.n += 1
+        self.size += 1
+        if self.size >= self.max_size:
+            self.compress()
+
+    def compress(self):
+        """
+        Compact the lowest full level until the sketch fits its capacity again.
+        """
+        while self.size >= self.max_size:
+            for level, items in enumerate(self.levels):
+                if len(items) < self.capacity(level):
+                    continue
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                    self.max_size = self.compute_max_size()
+                items.sort()
+                # An odd item out stays at its level
+                kept = [items.pop()] if len(items) % 2 else []
+                offset = self.rng.random() < 0.5
+                self.levels[level + 1].extend(items[offset::2])
+                self.levels[level] = kept
+                self.size = sum(len(level_items) for level_items in self.levels)
+                break
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+        """
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self.n += other.n
+        self.size = sum(len(items) for items in self.levels)
+        self.max_size = self.compute_max_size()
+        self.compress()
+
+    def quantiles(self, fractions):
+        """
+        Return the estimated value at each fraction of the sorted values, or None without values.
+        """
+        weighted = sorted((item, 1 << level) for level, items in enumerate(self.levels) for item in items)
+        if not weighted:
+            return [None for _ in fractions]
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            target = fraction * total
+            cumulative = 0
+            for item, weight in weighted:
+                cumulative += weight
+                if cumulative >= target:
+                    break
+            results.append(item)
+        return results
+
+    def to_dict(self):
+        return {'k': self.k, 'n': self.n, 'levels': self.levels}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['k'], state['n'], state['levels'])
+
+class MisraGries:
+    """
+    Misra-Gries summary of the most frequent values, using at most k counters. Every value
+    occurring more than n / (k + 1) times is kept, and each count is an underestimate by at most
+    n / (k + 1). Summaries merge by adding their counters and subtracting the (k+1)-th largest.
+    """
+
+    def __init__(self, k=64, counters=None):
+        """
+        Initializes the MisraGries summary.
+
+        Args:
+        - k (int): Maximum number of counters.
+        - counters (dict, optional): Counters of a serialized summary.
+        """
+        self.k = k
+        self.counters = dict(counters or {})
+
+    def add(self, key):
+        """
+        Count a value, given as its string key.
+        """
+        if key in self.counters:
+            self.counters[key] += 1
+        elif len(self.counters) < self.k:
+            self.counters[key] = 1
+        else:
+            self.counters = {tracked: count - 1 for tracked, count in self.counters.items() if count > 1}
+
+    def merge(self, other):
+        """
+        Merge another summary into this one, keeping at most k counters.
+        """
+        counters = dict(self.counters)
+        for key, count in other.counters.items():
+            counters[key] = counters.get(key, 0) + count
+        if len(counters) > self.k:
+            threshold = sorted(counters.values(), reverse=True)[self.k]
+            counters = {key: count - threshold for key, count in counters.items() if count > threshold}
+        self.counters = counters
+
+    def top(self, n):
+        """
+        Return the n most frequent values as [value, count] pairs, most frequent first.
+        """
+        return [[key, count] for key, count in sorted(self.counters.items(), key=lambda item: (-item[1], item[0]))[:n]]
+
+    def to_dict(self):
+        return {'k': self.k, 'counters': self.counters}
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['k'], state['counters'])
+
+class ColumnSketch:
+    """
+    Statistics of one column computed in a single pass over its values: null and type counts,
+    exact min/max, and mergeable sketches for the distinct count (HyperLogLog), quantiles of the
+    numeric values (KLL) and the most frequent values (Misra-Gries). Column sketches of different
+    sheets or files merge into corpus-level statistics without going back to the data.
+    """
+
+    def __init__(self, count=0, null_count=0, type_counts=None, ranges=None, hll=None, kll=None, misra_gries=None):
+        """
+        Initializes the ColumnSketch. The arguments restore a serialized sketch (see `from_dict`).
+        """
+        self.count = count
+        self.null_count = null_count
+        self.type_counts = dict(type_counts or {})
+        # Range family ('number', 'datetime' or 'str') -> [min, max]
+        self.ranges = {family: list(bounds) for family, bounds in (ranges or {}).items()}
+        self.hll = hll or HyperLogLog()
+        self.kll = kll or KllSketch()
+        self.misra_gries = misra_gries or MisraGries()
+
+    def add(self, value):
+        """
+        Add a cell value; None and empty strings count as nulls.
+        """
+        if value is None or value == '':
+            self.null_count += 1
+            return
+        self.count += 1
+        kind = value_type(value)
+        self.type_counts[kind] = self.type_counts.get(kind, 0) + 1
+
+        key = value_key(value)
+        self.hll.add(key)
+        self.misra_gries.add(key)
+
+        family = RANGE_FAMILIES.get(kind)
+        if family is None:
+            return
+        comparable = key if family == 'datetime' else value
+        bounds = self.ranges.get(family)
+        if bounds is None:
+            self.ranges[family] = [comparable, comparable]
+        elif comparable < bounds[0]:
+            bounds[0] = comparable
+        elif comparable > bounds[1]:
+            bounds[1] = comparable
+        if family == 'number':
+            self.kll.add(value)
+
+    def merge(self, other):
+        """
+        Merge the sketch of the same column from another sheet or file into this one.
+        """
+        self.count += other.count
+        self.null_count += other.null_count
+        for kind, count in other.type_counts.items():
+            self.type_counts[kind] = self.type_counts.get(kind, 0) + count
+        for family, (low, high) in other.ranges.items():
+            bounds = self.ranges.get(family)
+            self.ranges[family] = [min(bounds[0], low), max(bounds[1], high)] if bounds else [low, high]
+        self.hll.merge(other.hll)
+        self.kll.merge(other.kll)
+        self.misra_gries.merge(other.misra_gries)
+
+    def inferred_type(self):
+        """
+        Infer the column type from the types of its values: 'empty', 'mixed', or the single type
+        found ('int' and 'float' together infer 'float').
+        """
+        kinds = set(self.type_counts)
+        if not kinds:
+            return 'empty'
+        if kinds == {'int', 'float'}:
+            return 'float'
+        return kinds.pop() if len(kinds) == 1 else 'mixed'
+
+    def to_dict(self):
+        """
+        Serialize the sketch: readable statistics, and the sketch states `from_dict` merges from.
+        """
+        inferred_type = self.inferred_type()
+        bounds = self.ranges.get(RANGE_FAMILIES.get(inferred_type), [None, None])
+        quantiles = self.kll.quantiles(list(REPORTED_QUANTILES.values()))
+        return {
+            'count': self.count,
+            'null_count': self.null_count,
+            'inferred_type': inferred_type,
+            'type_counts': self.type_counts,
+            'min': bounds[0],
+            'max': bounds[1],
+            'distinct_count': self.hll.estimate() if self.count else 0,
+            'quantiles': dict(zip(REPORTED_QUANTILES, quantiles)) if self.kll.n else {},
+            'top_values': self.misra_gries.top(REPORTED_TOP_VALUES),
+            'sketches': {
+                'ranges': self.ranges,
+                'hll': self.hll.to_dict(),
+                'kll': self.kll.to_dict(),
+                'misra_gries': self.misra_gries.to_dict(),
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, statistics):
+        """
+        Restore a sketch from the output of `to_dict`.
+        """
+        sketches = statistics['sketches']
+        return cls(
+            count=statistics['count'],
+            null_count=statistics['null_count'],
+            type_counts=statistics['type_counts'],
+            ranges=sketches['ranges'],
+            hll=HyperLogLog.from_dict(sketches['hll']),
+            kll=KllSketch.from_dict(sketches['kll']),
+            misra_gries=MisraGries.from_dict(sketches['misra_gries']),
+        )
+
+class ReservoirSample:
+    """
+    Uniform random sample of at most k items from a stream of unknown length (Algorithm L).
+    Once the reservoir is full, the number of items to pass over before the next replacement is
+    drawn directly, so a skipped item only costs a counter decrement and is never inspected.
+    """
+
+    def __init__(self, k, seed=0):
+        """
+        Initializes the ReservoirSample.
+
+        Args:
+        - k (int): Maximum number of items kept.
+        - seed (int): Seed of the sampling, for reproducible samples.
+        """
+        self.k = k
+        self.items = []
+        self.seen = 0
+        self.rng = random.Random(seed)
+        self.weight = 1.0
+        self.skip = 0
+
+    def random_exponent(self):
+        # 1 - random() lies in (0, 1], so its logarithm is defined
+        return math.log(1 - self.rng.random()) / self.k
+
+    def next_skip(self):
+        self.weight *= math.exp(self.random_exponent())
+        if self.weight >= 1.0:
+            return 0
+        return int(math.log(1 - self.rng.random()) / math.log(1 - self.weight))
+
+    def add(self, item):
+        """
+        Offer the next item of the stream.
+        """
+        self.seen += 1
+        if len(self.items) < self.k:
+            self.items.append(item)
+            if len(self.items) == self.k:
+                self.skip = self.next_skip()
+        elif self.skip > 0:
+            self.skip -= 1
+        else:
+            self.items[self.rng.randrange(self.k)] = item
+            self.skip = self.next_skip()
@@ -1,13 +1,43 @@
 # src/helpers/data_profiling/profile_excel_files.py
 
 import os
-import pandas as pd
+import zipfile
 from openpyxl import load_workbook
+from openpyxl.utils.cell import coordinate_from_string, get_column_letter
 from openpyxl.chart import (
     BarChart, LineChart, ScatterChart, PieChart, 
     AreaChart, BubbleChart, RadarChart, DoughnutChart
 )
 import json
+from src.helpers.data_profiling.column_sketches import ColumnSketch, ReservoirSample
+from src.interfaces.loaders.xlsx_metadata import (
+    FORMULA_TAG_PATTERN, VALUE_TAG_PATTERN, decode_cell, get_row_number, iter_row_fragments, iter_sheet_formulas, parse_row_fragment,
+    part_contains, read_date_styles, read_formula, read_namespace_declarations,
+    read_shared_strings, read_sheet_chart_types, read_sheet_paths
+)
+
+# Chart elements that openpyxl reads as the chart classes `detect_charts_in_sheet` looks for
+# (3D bar, line and pie charts, stock, surface and bar-of-pie charts are not among them)
+DETECTED_CHART_ELEMENTS = {
+    'barChart', 'lineChart', 'scatterChart', 'pieChart', 'areaChart', 'area3DChart',
+    'bubbleChart', 'radarChart', 'doughnutChart',
+}
+
+# In sampled mode, formula examples are taken from the first rows containing formulas
+SAMPLED_FORMULA_ROWS = 1000
+
+# Which statistics of a sampled profile are exact and which are estimated from the sample
+SAMPLED_STATISTICS_ACCURACY = {
+    'charts': 'exact',
+    'contains_formulas': 'exact',
+    'columns_with_formulas': 'estimated',
+    # Columns past the header's last non-blank cell are only found if sampled rows reach them
+    'columns': 'estimated',
+    'num_rows': 'exact',
+    'num_columns': 'estimated',
+    'missing_values_percentage': 'estimated',
+    'column_statistics': 'estimated',
+}
 
 def detect_charts_in_sheet(worksheet):
     """
@@ -52,53 +82,286 @@ def detect_formulas_in_sheet(worksheet):
         'columns_with_formulas': columns_with_formulas
     }
 
-def profile_excel_file(file_path):
+def scan_charts_in_sheet(archive, sheet_path):
+    """
+    Detects charts like `detect_charts_in_sheet`, from the sheet's drawing and chart parts in the xlsx archive.
+
+    Args:
+    archive (zipfile.ZipFile): The open xlsx archive.
+    sheet_path (str): Zip path of the sheet part.
+
+    Returns:
+    bool: True if there are charts present in the sheet, False otherwise.
+    """
+    return any(chart_type in DETECTED_CHART_ELEMENTS for chart_type in read_sheet_chart_types(archive, sheet_path))
+
+def scan_formulas_in_sheet(archive, sheet_path):
+    """
+    Detects formulas like `detect_formulas_in_sheet`, by streaming the sheet's XML part instead of loading its cells.
+
+    Args:
+    archive (zipfile.ZipFile): The open xlsx archive.
+    sheet_path (str): Zip path of the sheet part.
+
+    Returns:
+    dict: Information about whether the sheet contains formulas and columns with formula examples.
+    """
+    columns_with_formulas = {}
+    for coordinate, formula in iter_sheet_formulas(archive, sheet_path):
+        col_letter = coordinate_from_string(coordinate)[0]
+        # Record one example of the formula for this column
+        if col_letter not in columns_with_formulas:
+            columns_with_formulas[col_letter] = formula
+
+    return {
+        'contains_formulas': bool(columns_with_formulas),
+        'columns_with_formulas': columns_with_formulas
+    }
+
+def get_row_width(row):
+    """
+    Return the position after the last non-blank cell of a row, or 0 for a blank row.
+    """
+    for idx in range(len(row), 0, -1):
+        if row[idx - 1] is not None and row[idx - 1] != '':
+            return idx
+    return 0
+
+def get_column_names(header, width=None):
+    """
+    Name the columns from the header row the way `pd.read_excel` does: blank headers become
+    'Unnamed: <position>' and repeated names get a '.1', '.2', ... suffix.
+
+    Args:
+    header (tuple): The values of the header row.
+    width (int, optional): Number of columns, when data rows extend past the header's last
+        non-blank cell. Defaults to the header's width.
+
+    Returns:
+    list: The column names.
+    """
+    # Trailing blank cells of the header row are only columns if data rows extend past them
+    header = tuple(header)[:get_row_width(header)]
+    if width is not None and width > len(header):
+        header += (None,) * (width - len(header))
+    names = []
+    seen = {}
+    for idx, value in enumerate(header):
+        name = f"Unnamed: {idx}" if value is None or value == '' else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+def profile_sheet_rows(rows, sample_step=10, sample_size=10):
+    """
+    Profiles a sheet from its rows in a single pass, keeping only the column sketches and the sample rows in memory.
+
+    As with `pd.read_excel`, the columns span the widest non-blank row: values past the header's
+    last non-blank cell (or under a blank header row) get 'Unnamed: <position>' columns.
+
+    Args:
+    rows (iterable): The sheet's rows as tuples of cell values, header row first.
+    sample_step (int): Keep every `sample_step`-th row as sample data.
+    sample_size (int): Maximum number of sample rows.
+
+    Returns:
+    dict: The sheet's columns, row and column counts, percentage of missing values, sample data,
+    and `column_statistics` (see `ColumnSketch.to_dict`) for each column.
+    """
+    rows = iter(rows)
+    header = tuple(next(rows, None) or ())
+    columns = get_column_names(header)
+    sketches = [ColumnSketch() for _ in columns]
+    sample_data = []
+    num_rows = 0
+    # Blank rows only count once a non-blank row follows them, as trailing blank rows are not data
+    pending_blank_rows = 0
+
+    for row in rows:
+        row = tuple(row)
+        width = get_row_width(row)
+        if width == 0:
+            pending_blank_rows += 1
+            continue
+        if width > len(columns):
+            # A wider row adds columns, blank in every row before it
+            columns = get_column_names(header, width)
+            sketches += [ColumnSketch(null_count=num_rows) for _ in range(len(sketches), width)]
+            for sample in sample_data:
+                sample.update({column: '' for column in columns[len(sample):]})
+        row = row[:len(columns)] + (None,) * (len(columns) - len(row))
+        for values in [(None,) * len(columns)] * pending_blank_rows + [row]:
+            for sketch, value in zip(sketches, values):
+                sketch.add(value)
+            if num_rows % sample_step == 0 and len(sample_data) < sample_size:
+                sample_data.append({column: '' if value is None else str(value) for column, value in zip(columns, values)})
+            num_rows += 1
+        pending_blank_rows = 0
+
+    return {
+        'columns': columns,
+        'num_rows': num_rows,
+        'num_columns': len(columns),
+        'missing_values_percentage': {
+            column: round(sketch.null_count / num_rows, 4) if num_rows else 0.0
+            for column, sketch in zip(columns, sketches)
+        },
+        'sample_data': sample_data,
+        'column_statistics': {column: sketch.to_dict() for column, sketch in zip(columns, sketches)},
+    }
+
+def profile_sheet_sample(archive, sheet_path, sample_size=10_000, seed=0, sample_data_size=10):
+    """
+    Profiles a sheet from its header row and a uniform random sample of its rows, without parsing the other rows.
+
+    The row count runs to the last row holding a value, as in full mode: trailing rows that are
+    only styled (and the sheet's `<dimension>`, which covers them) are not counted. Rows are located
+    in the raw worksheet XML and only the sampled ones are parsed, so the cost is dominated by
+    decompressing the part. Statistics computed from the sample are estimates (see
+    `SAMPLED_STATISTICS_ACCURACY`).
+
+    Args:
+    archive (zipfile.ZipFile): The open xlsx archive.
+    sheet_path (str): Zip path of the worksheet part.
+    sample_size (int): Maximum number of rows sampled.
+    seed (int): Seed of the sampling, for reproducible profiles.
+    sample_data_size (int): Number of sampled rows kept as sample data.
+
+    Returns:
+    dict: The same entries as `profile_sheet_rows`, formula detection, and `sampled_rows`.
+    """
+    namespaces = read_namespace_declarations(archive, sheet_path)
+    # Formula-free sheets are recognized from their raw bytes, so rows only need checking if there are formulas
+    contains_formulas = part_contains(archive, sheet_path, FORMULA_TAG_PATTERN)
+    reservoir = ReservoirSample(sample_size, seed)
+    # The header is the sheet's first row, blank if it is not stored
+    header_fragment = None
+    header_row = last_value_row = 1
+    row_number = 0
+    formula_fragments = []
+
+    for fragment in iter_row_fragments(archive, sheet_path):
+        row_number = get_row_number(fragment) or row_number + 1
+        if contains_formulas and len(formula_fragments) < SAMPLED_FORMULA_ROWS and FORMULA_TAG_PATTERN.search(fragment):
+            formula_fragments.append(fragment)
+        if row_number == header_row:
+            header_fragment = fragment
+            continue
+        # Rows holding only styled, empty cells are blank in every column, like rows that are not stored
+        if VALUE_TAG_PATTERN.search(fragment):
+            reservoir.add((reservoir.seen, fragment))
+            last_value_row = row_number
+
+    # Only the header and the sampled rows are parsed, and only their shared strings are read
+    header_cells = parse_row_fragment(header_fragment, namespaces) if header_fragment is not None else []
+    sampled_cells = [parse_row_fragment(fragment, namespaces) for _, fragment in sorted(reservoir.items)]
+    string_indices = {int(raw_value) for cells in [header_cells] + sampled_cells
+                      for _, cell_type, _, raw_value, _ in cells if cell_type == 's' and raw_value is not None}
+    shared_strings = read_shared_strings(archive, string_indices)
+    date_styles, epoch = read_date_styles(archive)
+
+    def row_values(cells, width):
+        values = {column: decode_cell(cell_type, style, raw_value, shared_strings, date_styles, epoch)
+                  for column, cell_type, style, raw_value, _ in cells}
+        return tuple(values.get(column) for column in range(1, width + 1))
+
+    # As in full mode, the columns span the widest non-blank row (here, of the header and the sample)
+    header_values = row_values(header_cells, max((column for column, *_ in header_cells), default=0))
+    sampled_values = [row_values(cells, max((column for column, *_ in cells), default=0)) for cells in sampled_cells]
+    columns = get_column_names(header_values, max(map(get_row_width, sampled_values), default=0))
+    sketches = [ColumnSketch() for _ in columns]
+    sample_data = []
+    sample_step = max(1, len(sampled_cells) // sample_data_size)
+    for idx, values in enumerate(sampled_values):
+        values = values[:len(columns)] + (None,) * (len(columns) - len(values))
+        for sketch, value in zip(sketches, values):
+            sketch.add(value)
+        if idx % sample_step == 0 and len(sample_data) < sample_data_size:
+            sample_data.append({column: '' if value is None else str(value) for column, value in zip(columns, values)})
+
+    # Rows are counted from the header row to the last row holding a value
+    num_rows = last_value_row - header_row
+    # Rows without any value (not stored, or only styled) are blank in every column
+    absent_rows = max(num_rows - reservoir.seen, 0)
+
+    columns_with_formulas = {}
+    shared_formulas = {}
+    for fragment in formula_fragments:
+        row_number = get_row_number(fragment) or 1
+        for column, _, _, _, formula in parse_row_fragment(fragment, namespaces):
+            if formula is None:
+                continue
+            value = read_formula(formula, f"{get_column_letter(column)}{row_number}", shared_formulas)
+            columns_with_formulas.setdefault(get_column_letter(column), value)
+
+    return {
+        'contains_formulas': contains_formulas and bool(columns_with_formulas),
+        'columns_with_formulas': columns_with_formulas,
+        'columns': columns,
+        'num_rows': num_rows,
+        'num_columns': len(columns),
+        'missing_values_percentage': {
+            column: round((sketch.null_count / len(sampled_cells) * reservoir.seen + absent_rows) / num_rows, 4)
+            if sampled_cells else (1.0 if num_rows else 0.0)
+            for column, sketch in zip(columns, sketches)
+        },
+        'sample_data': sample_data,
+        'column_statistics': {column: sketch.to_dict() for column, sketch in zip(columns, sketches)},
+        'sampled_rows': len(sampled_cells),
+    }
+
+def profile_excel_file(file_path, sample_size=None, seed=0):
     """
     Profiles an Excel file to document its schema, presence of charts, formulas, and missing values.
     
     Args:
     file_path (str): The path to the Excel file to be profiled.
+    sample_size (int, optional): Profile each sheet from a random sample of this many rows (see
+        `profile_sheet_sample`) instead of reading every row. Defaults to a full scan.
+    seed (int): Seed of the row sampling.
 
     Returns:
     dict: A dictionary containing the schema, chart presence, formulas, and missing value information for each sheet.
     """
-    # Load the workbook to access charts
-    workbook = load_workbook(file_path, data_only=False)  # Load with formulas
+    # Charts and formulas are found by scanning the sheets' XML parts directly
+    archive = zipfile.ZipFile(file_path)
+    sheet_paths = read_sheet_paths(archive)
+    # In full mode, cell values are streamed in read-only mode (cached values instead of formulas)
+    values_workbook = load_workbook(file_path, read_only=True, data_only=True) if sample_size is None else None
     file_profile = {'filepath': file_path}
 
-    for sheet_name in workbook.sheetnames:
-        sheet_profile = {}
-        worksheet = workbook[sheet_name]
+    for sheet_name, sheet_path in sheet_paths.items():
+        sheet_profile = {'profile_mode': 'full' if sample_size is None else 'sampled'}
 
         # Detect charts in the current sheet
-        sheet_profile['charts'] = detect_charts_in_sheet(worksheet)
+        sheet_profile['charts'] = scan_charts_in_sheet(archive, sheet_path)
 
-        # Detect formulas in the current sheet
-        formulas_info = detect_formulas_in_sheet(worksheet)
-        sheet_profile.update(formulas_info)
-
-        # Use pandas to read the Excel file and load the specific sheet
         try:
-            df = pd.read_excel(file_path, sheet_name=sheet_name)
-            # Extract schema information
-            sheet_profile['columns'] = list(df.columns)
-            sheet_profile['num_rows'] = len(df)
-            sheet_profile['num_columns'] = len(df.columns)
-            # Calculate % of missing values
-            sheet_profile['missing_values_percentage'] = df.isna().mean().round(4).to_dict()  # Convert Series to dict
-            # Extract sample data (10 rows: 1, 10, 20, etc.)
-            sample_indices = list(range(0, min(len(df), 100), 10))
-            sheet_profile['sample_data'] = df.iloc[sample_indices].fillna('').astype(str).to_dict(orient='records')  # Convert sample to JSON-serializable format
-
+            if sample_size is None:
+                # Detect formulas in the current sheet
+                formulas_info = scan_formulas_in_sheet(archive, sheet_path)
+                sheet_profile.update(formulas_info)
+                # Stream the sheet's values in one pass, without loading it into a DataFrame
+                sheet_profile.update(profile_sheet_rows(values_workbook[sheet_name].iter_rows(values_only=True)))
+            else:
+                sheet_profile.update(profile_sheet_sample(archive, sheet_path, sample_size, seed))
+                sheet_profile['statistics_accuracy'] = SAMPLED_STATISTICS_ACCURACY
         except Exception as e:
             sheet_profile['error'] = str(e)
             print(f"Error reading sheet {sheet_name}: {e}")
 
         file_profile[sheet_name] = sheet_profile
 
+    archive.close()
+    if values_workbook is not None:
+        values_workbook.close()
     return file_profile
 
-def profile_excel_files(directory_path, output_folder, exclude_folders=None):
+def profile_excel_files(directory_path, output_folder, exclude_folders=None, sample_size=None):
     """
     Profiles all Excel files in the given directory and its subdirectories,
     excluding specified subfolders, and saves each profile result as a JSON file 
@@ -108,6 +371,7 @@ def profile_excel_files(directory_path, output_folder, exclude_folders=None):
     directory_path (str): The path to the directory containing Excel files.
     output_folder (str): The path to the output folder for saving JSON files.
     exclude_folders (list): A list of subfolder names to exclude from profiling.
+    sample_size (int, optional): Profile sheets from a sample of this many rows (see `profile_excel_file`).
 
     Returns:
     dict: A dictionary containing profiles of all Excel files processed.
@@ -127,7 +391,7 @@ def profile_excel_files(directory_path, output_folder, exclude_folders=None):
                 file_path = os.path.join(root, file)
                 print(f"Profiling {file_path}...")
 
-                profile = profile_excel_file(file_path)
+                profile = profile_excel_file(file_path, sample_size=sample_size)
                 all_profiles[file_path] = profile
 
                 relative_path = os.path.relpath(root, directory_path)
@@ -141,3 +405,29 @@ def profile_excel_files(directory_path, output_folder, exclude_folders=None):
 
     print(f"Profiled all Excel files successfully! JSON files are saved in '{output_folder}'.")
     return all_profiles
+
+def merge_profile_statistics(profiles, sheet_filter=None):
+    """
+    Merges the column statistics of several file profiles into corpus-level statistics, column by column.
+
+    Args:
+    profiles (iterable): File profiles as returned by `profile_excel_file` or read from their JSON files.
+    sheet_filter (callable, optional): Called with (file path, sheet name); only sheets it returns True for are merged.
+
+    Returns:
+    dict: Merged statistics for each column name found in the profiles (see `ColumnSketch.to_dict`).
+    """
+    merged = {}
+    for profile in profiles:
+        for sheet_name, sheet_profile in profile.items():
+            if not isinstance(sheet_profile, dict) or 'column_statistics' not in sheet_profile:
+                continue
+            if sheet_filter is not None and not sheet_filter(profile.get('filepath'), sheet_name):
+                continue
+            for column, statistics in sheet_profile['column_statistics'].items():
+                sketch = ColumnSketch.from_dict(statistics)
+                if column in merged:
+                    merged[column].merge(sketch)
+                else:
+                    merged[column] = sketch
+    return {column: sketch.to_dict() for column, sketch in merged.items()}
@@ -3,8 +3,13 @@
 import os
 import json
 import re
+import hashlib
 from collections import defaultdict
 
+# Groups of the categorization output, and the match groups in priority order (highest first)
+CATEGORY_GROUPS = ['exact_match_groups', 'extended_match_groups', 'partial_match_groups', 'no_match_sheets', 'out_scope_sheets']
+MATCH_GROUP_PRIORITY = ['exact_match_groups', 'extended_match_groups', 'partial_match_groups']
+
 # Define function to load and analyze a JSON file
 def load_json_file(file_path):
     try:
@@ -14,18 +19,24 @@ def load_json_file(file_path):
     except Exception as e:
         return {'error': str(e)}
 
+# Function to list the JSON files of a directory, in traversal order
+def list_json_files(directory_path):
+    return [
+        os.path.join(root, file)
+        for root, _, files in os.walk(directory_path)
+        for file in files
+        if file.endswith('.json')
+    ]
+
 # Function to traverse a directory and analyze all JSON files
 def traverse_files(directory_path, base_folder=''):
     json_structures = {}
 
     # Traverse the directory
-    for root, _, files in os.walk(directory_path):
-        for file in files:
-            if file.endswith('.json'):
-                file_path = os.path.join(root, file)
-                print(f"Analyzing {file_path}...")
-                json_data = load_json_file(file_path)
-                json_structures[file_path] = json_data
+    for file_path in list_json_files(directory_path):
+        print(f"Analyzing {file_path}...")
+        json_data = load_json_file(file_path)
+        json_structures[file_path] = json_data
     
     return json_structures
 
@@ -207,13 +218,13 @@ def categorize_files(json_files, schemas, out_scope_sheetnames=None):
 
 # Assuming `json_structures` contains your data and the `schemas_path` is None
 def get_schemas_from_json(json_structures):
-    # Use a set to gather unique column combinations
-    unique_schemas = {
+    # Use a set to gather unique column combinations, sorted so schema names are stable across runs
+    unique_schemas = sorted({
         tuple(val['columns'])
         for dict_obj in json_structures.values()
         for item_key, val in dict_obj.items()
         if item_key != 'filepath'
-    }
+    }, key=lambda columns: [str(col) for col in columns])
 
     # Initialize a dictionary to hold the base schemas and their variations
     schema_dict = {}
@@ -229,10 +240,85 @@ def get_schemas_from_json(json_structures):
 
     return schema_dict
 
-def main(json_files_path, output_path, filename, schemas_path=None, out_scope_sheetnames=None):
+def get_profile_fingerprint(file_path):
+    """
+    Fingerprint a JSON profile by its size and modification time, to detect changes without reading it.
+    """
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+def get_profile_skeleton(json_data):
+    """
+    Keep only what categorization reads from a profile: its filepath and the columns of each sheet.
+    """
+    return {
+        key: {'columns': value.get('columns', [])} if key != 'filepath' and isinstance(value, dict) else value
+        for key, value in json_data.items()
+    }
+
+def get_schema_set_hash(schemas, out_scope_sheetnames=None):
+    """
+    Hash the schemas (in priority order) and the out-of-scope sheet names a categorization depends on.
+    """
+    settings = [list(schemas.items()), sorted(str(name) for name in (out_scope_sheetnames or []))]
+    return hashlib.blake2b(json.dumps(settings, default=str).encode(), digest_size=16).hexdigest()
+
+def merge_categorizations(categorizations, schemas):
+    """
+    Merge per-profile categorizations into one output, in the format of `categorize_files`.
+
+    A (filepath, sheet) pair categorized by several profiles is kept in its highest-priority match
+    group only, as `remove_lower_priority_entries` does.
+
+    Args:
+    categorizations (list): Outputs of `categorize_files`, in profile traversal order.
+    schemas (dict): The schemas used, in priority order.
+
+    Returns:
+    dict: The merged categorization.
+    """
+    merged = {group_name: defaultdict(list) for group_name in CATEGORY_GROUPS}
+    for categorization in categorizations:
+        for group_name in CATEGORY_GROUPS:
+            for key, entries in categorization.get(group_name, {}).items():
+                merged[group_name][key].extend(entries)
+
+    match_groups = {(group_name, schema_name): entries
+                    for group_name in MATCH_GROUP_PRIORITY for schema_name, entries in merged[group_name].items()}
+    priority_order = [(group_name, schema_name) for group_name in MATCH_GROUP_PRIORITY for schema_name in schemas
+                      if (group_name, schema_name) in match_groups]
+    # Schemas no longer in the schema set rank last
+    priority_order += [key for key in match_groups if key not in priority_order]
+    match_groups = remove_lower_priority_entries(match_groups, priority_order)
+    for group_name in MATCH_GROUP_PRIORITY:
+        merged[group_name] = {schema_name: match_groups[(group_name, schema_name)] for schema_name in merged[group_name]
+                              if match_groups[(group_name, schema_name)]}
+
+    # Sort all_groups values by key name
+    return {group_name: dict(sorted(merged[group_name].items())) for group_name in CATEGORY_GROUPS}
+
+def load_categorization_state(state_path):
+    """
+    Load the state of the previous categorization, or an empty state if there is none.
+    """
+    if not os.path.exists(state_path):
+        return {}
+    state = load_json_file(state_path)
+    if 'error' in state:
+        print(f"Ignoring unreadable categorization state {state_path}: {state['error']}")
+        return {}
+    return state
+
+def main(json_files_path, output_path, filename, schemas_path=None, out_scope_sheetnames=None, incremental=True):
     """
     Main function to categorize files based on JSON profiles.
 
+    The categorization of each profile is saved in a state file next to the output
+    (`<filename>.state.json`), with the profile's fingerprint and the hash of the schema set. On the
+    next run, only new and changed profiles are loaded and categorized; the others reuse their
+    saved categorization, unless the schema set or the out-of-scope sheets changed, in which case
+    every profile is recategorized from the columns saved in the state.
+
     Args:
     json_files_path (str): The path to the directory containing JSON files.
     output_path (str): The path to the output directory.
@@ -240,9 +326,26 @@ def main(json_files_path, output_path, filename, schemas_path=None, out_scope_sh
     schemas_path (str, optional): Path to a JSON file containing predefined schemas. 
                                   If not provided, schemas will be inferred from the input files.
     out_scope_sheetnames (list, optional): A list of sheet names to exclude from analysis.
+    incremental (bool): Reuse the previous categorization state. If False, every profile is
+                        loaded and categorized again.
     """
-    # Traverse the JSON files directory and load file structures
-    json_structures = traverse_files(json_files_path)
+    state_path = os.path.join(output_path, f'{filename}.state.json')
+    state = load_categorization_state(state_path) if incremental else {}
+    previous_profiles = state.get('profiles', {})
+
+    # Load only the profiles that are new or changed since the previous run
+    profiles = {}
+    changed_profiles = set()
+    for file_path in list_json_files(json_files_path):
+        fingerprint = get_profile_fingerprint(file_path)
+        previous = previous_profiles.get(file_path)
+        if previous is not None and previous['fingerprint'] == fingerprint:
+            profiles[file_path] = previous
+            continue
+        print(f"Analyzing {file_path}...")
+        profiles[file_path] = {'fingerprint': fingerprint, 'profile': get_profile_skeleton(load_json_file(file_path))}
+        changed_profiles.add(file_path)
+    json_structures = {file_path: entry['profile'] for file_path, entry in profiles.items()}
 
     if schemas_path is None:
         # Get schemas from input data if no predefined schemas are provided
@@ -251,8 +354,17 @@ def main(json_files_path, output_path, filename, schemas_path=None, out_scope_sh
         # Load predefined schemas from the given schemas_path
         schemas = load_json_file(schemas_path)
 
-    # Categorize the files based on the schemas
-    categorized_files = categorize_files(json_structures, schemas, out_scope_sheetnames)
+    # Categorize the changed profiles, or all of them if the schema set changed
+    schema_set_hash = get_schema_set_hash(schemas, out_scope_sheetnames)
+    full_recompute = schema_set_hash != state.get('schema_set_hash')
+    for file_path, entry in profiles.items():
+        if full_recompute or file_path in changed_profiles:
+            entry['categorization'] = categorize_files({file_path: entry['profile']}, schemas, out_scope_sheetnames)
+    recategorized = len(profiles) if full_recompute else len(changed_profiles)
+    print(f"Categorized {recategorized} of {len(profiles)} profiles"
+          f"{' (schema set changed, full recompute)' if full_recompute and state else ''}.")
+
+    categorized_files = merge_categorizations([entry['categorization'] for entry in profiles.values()], schemas)
     
     # Ensure the output directory exists
     os.makedirs(output_path, exist_ok=True)
@@ -262,4 +374,8 @@ def main(json_files_path, output_path, filename, schemas_path=None, out_scope_sh
     with open(output_file_path, 'w') as f:
         json.dump(categorized_files, f, indent=4)
 
+    # Save the state for the next incremental run
+    with open(state_path, 'w') as f:
+        json.dump({'schema_set_hash': schema_set_hash, 'profiles': profiles}, f)
+
     print(f"Categorized files are saved in '{output_file_path}'.")
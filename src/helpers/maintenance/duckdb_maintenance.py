@@ -0,0 +1,227 @@
+# src/helpers/maintenance/duckdb_maintenance.py
+
+import os
+import argparse
+import duckdb
+import pandas as pd
+
+# DuckDB's default number of rows per row group
+ROW_GROUP_SIZE = 122880
+
+def quote_identifier(name):
+    """
+    Quote a DuckDB identifier, escaping embedded double quotes.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+def quote_literal(value):
+    """
+    Quote a SQL string literal, for statements that do not accept parameters (e.g. ATTACH).
+    """
+    return "'" + str(value).replace("'", "''") + "'"
+
+def list_tables(conn, schema=None):
+    """
+    List the base tables of the database as (schema, table) pairs.
+    """
+    query = "SELECT schema_name, table_name FROM duckdb_tables() WHERE NOT internal AND database_name = current_database()"
+    parameters = []
+    if schema:
+        query += " AND schema_name = ?"
+        parameters.append(schema)
+    return conn.execute(query + " ORDER BY 1, 2", parameters).fetchall()
+
+def table_fragmentation(conn, schema, table, partition_columns=None):
+    """
+    Measure the fragmentation of a table from its storage layout.
+
+    Args:
+    - conn (duckdb.DuckDBPyConnection): An open connection.
+    - schema (str): The schema name.
+    - table (str): The table name.
+    - partition_columns (list, optional): Columns the table is filtered on (e.g. `source_filepath`).
+
+    Returns:
+    - dict: `live_rows`, `stored_rows` (including deleted rows not yet reclaimed), `deleted_rows`,
+      `row_groups`, `fill_ratio` (stored rows / row group capacity) and, with partition columns,
+      `row_groups_per_partition` (average row groups a partition filter has to scan) against
+      `ideal_row_groups_per_partition` for a table sorted by those columns.
+    """
+    qualified_table = f"{quote_identifier(schema)}.{quote_identifier(table)}"
+    live_rows = conn.execute(f"SELECT count(*) FROM {qualified_table}").fetchone()[0]
+    # Segments of the first column (without its validity mask) give the rows stored per row group
+    row_groups, stored_rows = conn.execute(
+        "SELECT count(DISTINCT row_group_id), coalesce(sum(count), 0) FROM pragma_storage_info(?) "
+        "WHERE column_id = 0 AND column_path = '[0]'",
+        [f"{schema}.{table}"],
+    ).fetchone()
+    stats = {
+        'schema': schema,
+        'table': table,
+        'live_rows': live_rows,
+        'stored_rows': int(stored_rows),
+        'deleted_rows': max(int(stored_rows) - live_rows, 0),
+        'row_groups': row_groups,
+        'fill_ratio': round(stored_rows / (row_groups * ROW_GROUP_SIZE), 3) if row_groups else 1.0,
+    }
+
+    if partition_columns:
+        partition_list = ', '.join(quote_identifier(col) for col in partition_columns)
+        spread, ideal = conn.execute(f"""
+            SELECT avg(row_groups), avg(ceil(partition_rows / {ROW_GROUP_SIZE}))
+            FROM (
+                SELECT count(DISTINCT rowid // {ROW_GROUP_SIZE}) AS row_groups, count(*) AS partition_rows
+                FROM {qualified_table}
+                GROUP BY {partition_list}
+            )
+        """).fetchone()
+        stats['row_groups_per_partition'] = round(spread or 0, 2)
+        stats['ideal_row_groups_per_partition'] = round(ideal or 0, 2)
+    return stats
+
+def database_size(conn):
+    """
+    Return the size of the database file and its share of free blocks.
+    """
+    block_size, total_blocks, free_blocks = conn.execute(
+        "SELECT block_size, total_blocks, free_blocks FROM pragma_database_size() WHERE database_name = current_database()"
+    ).fetchone()
+    return {
+        'size_mb': round(block_size * total_blocks / (1024 * 1024), 2),
+        'free_blocks': free_blocks,
+        'free_ratio': round(free_blocks / total_blocks, 3) if total_blocks else 0.0,
+    }
+
+def report(db_path, schema=None, partition_columns=None):
+    """
+    Print and return the fragmentation of every table and the free space in the database file.
+
+    Args:
+    - db_path (str): Path to the DuckDB database file.
+    - schema (str, optional): Only report the tables of this schema.
+    - partition_columns (list, optional): Columns used to measure partition spread, for the
+      tables that have them all.
+
+    Returns:
+    - pd.DataFrame: One row per table (see `table_fragmentation`).
+    """
+    conn = duckdb.connect(db_path, read_only=True)
+    try:
+        rows = []
+        for table_schema, table in list_tables(conn, schema):
+            columns = set(conn.execute(
+                "SELECT column_name FROM duckdb_columns() WHERE schema_name = ? AND table_name = ? "
+                "AND database_name = current_database()", [table_schema, table]).fetchdf()['column_name'])
+            table_partitions = partition_columns if partition_columns and set(partition_columns) <= columns else None
+            rows.append(table_fragmentation(conn, table_schema, table, table_partitions))
+        size = database_size(conn)
+    finally:
+        conn.close()
+
+    fragmentation = pd.DataFrame(rows)
+    print(f"Database {db_path}: {size['size_mb']} MB, {size['free_blocks']} free blocks ({size['free_ratio']:.1%}).")
+    print(fragmentation.to_string(index=False) if not fragmentation.empty else "No tables found.")
+    return fragmentation
+
+def vacuum(db_path):
+    """
+    Reclaim the space of deleted rows: VACUUM refreshes table statistics, and a forced CHECKPOINT
+    writes the tables back, merging row groups emptied by deletes and marking their blocks free
+    for reuse. The file itself only shrinks with `compact`.
+    """
+    conn = duckdb.connect(db_path)
+    try:
+        conn.execute("VACUUM ANALYZE")
+        conn.execute("FORCE CHECKPOINT")
+    finally:
+        conn.close()
+    print(f"Vacuumed and checkpointed {db_path}.")
+
+def rewrite_table(db_path, schema, table, sort_by):
+    """
+    Rewrite a table sorted by the given columns (typically its partition columns), so each
+    partition occupies contiguous row groups and zonemaps can skip the others.
+
+    Args:
+    - db_path (str): Path to the DuckDB database file.
+    - schema (str): The schema name.
+    - table (str): The table name.
+    - sort_by (list): Columns to sort the rows by.
+    """
+    qualified_table = f"{quote_identifier(schema)}.{quote_identifier(table)}"
+    order_by = ', '.join(quote_identifier(col) for col in sort_by)
+    conn = duckdb.connect(db_path)
+    try:
+        conn.execute("BEGIN TRANSACTION")
+        conn.execute(f"CREATE OR REPLACE TABLE {qualified_table} AS SELECT * FROM {qualified_table} ORDER BY {order_by}")
+        conn.execute("COMMIT")
+        conn.execute("FORCE CHECKPOINT")
+    finally:
+        conn.close()
+    print(f"Rewrote table '{schema}.{table}' sorted by {sort_by}.")
+
+def compact(db_path):
+    """
+    Shrink the database file by copying every schema, table and view into a new file and replacing
+    the original. DuckDB reuses free blocks but never truncates its file, so this is the only way to
+    give the space back after heavy churn. Requires exclusive access to the database.
+
+    Returns:
+    - tuple: File size in bytes before and after compaction.
+    """
+    # Flush the write-ahead log first, so no WAL is left to be replayed against the new file
+    conn = duckdb.connect(db_path)
+    conn.execute("FORCE CHECKPOINT")
+    conn.close()
+
+    size_before = os.path.getsize(db_path)
+    compacted_path = f"{db_path}.compacting"
+    if os.path.exists(compacted_path):
+        os.remove(compacted_path)
+
+    conn = duckdb.connect()
+    try:
+        conn.execute(f"ATTACH {quote_literal(db_path)} AS source_db (READ_ONLY)")
+        conn.execute(f"ATTACH {quote_literal(compacted_path)} AS compacted_db")
+        conn.execute("COPY FROM DATABASE source_db TO compacted_db")
+        conn.execute("DETACH source_db")
+        conn.execute("DETACH compacted_db")
+    except Exception:
+        conn.close()
+        if os.path.exists(compacted_path):
+            os.remove(compacted_path)
+        raise
+    conn.close()
+
+    os.replace(compacted_path, db_path)
+    size_after = os.path.getsize(db_path)
+    print(f"Compacted {db_path}: {size_before / (1024 * 1024):.2f} MB -> {size_after / (1024 * 1024):.2f} MB.")
+    return size_before, size_after
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Maintain a DuckDB database after heavy upsert churn.')
+    parser.add_argument('--db-path', type=str, required=True, help='Path to the DuckDB database file.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    report_parser = subparsers.add_parser('report', help='Report table fragmentation and free space.')
+    report_parser.add_argument('--schema', type=str, help='Only report the tables of this schema.')
+    report_parser.add_argument('--partition-by', nargs='+', help='Partition columns used to measure partition spread.')
+
+    subparsers.add_parser('vacuum', help='Run VACUUM and a forced CHECKPOINT.')
+
+    rewrite_parser = subparsers.add_parser('rewrite', help='Rewrite a table sorted by its partition columns.')
+    rewrite_parser.add_argument('--schema', type=str, required=True, help='Schema of the table.')
+    rewrite_parser.add_argument('--table', type=str, required=True, help='Table to rewrite.')
+    rewrite_parser.add_argument('--sort-by', nargs='+', required=True, help='Columns to sort the rows by.')
+
+    subparsers.add_parser('compact', help='Copy the database into a new file to shrink it.')
+
+    args = parser.parse_args()
+    if args.command == 'report':
+        report(args.db_path, schema=args.schema, partition_columns=args.partition_by)
+    elif args.command == 'vacuum':
+        vacuum(args.db_path)
+    elif args.command == 'rewrite':
+        rewrite_table(args.db_path, args.schema, args.table, args.sort_by)
+    elif args.command == 'compact':
+        compact(args.db_path)
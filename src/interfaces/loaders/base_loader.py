@@ -1,5 +1,6 @@
 # src/pipelines/loaders/base_loader.py
 from abc import ABC, abstractmethod
+import numpy as np
 import pandas as pd
 
 class BaseLoader(ABC):
@@ -19,3 +20,14 @@ class BaseLoader(ABC):
         - pd.DataFrame: Loaded data as a DataFrame.
         """
         pass
+
+def arrow_to_pandas(table) -> pd.DataFrame:
+    """
+    Convert an Arrow table to a DataFrame the way the loaders return data.
+
+    Arrow nulls come back as None in object columns; loaders return NaN, like pandas' readers.
+    """
+    dataframe = table.to_pandas()
+    for col in dataframe.columns[dataframe.dtypes == object]:
+        dataframe[col] = dataframe[col].where(dataframe[col].notna(), np.nan)
+    return dataframe
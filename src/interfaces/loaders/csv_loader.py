@@ -0,0 +1,137 @@
+# src/pipelines/loaders/csv_loader.py
+import os
+import pandas as pd
+from src.interfaces.loaders.base_loader import BaseLoader, arrow_to_pandas
+
+# Arrow types for the dtype hints a schema can push down (pandas/Pandera dtype names and Python types)
+ARROW_TYPE_NAMES = {
+    'str': 'string',
+    'string': 'string',
+    'object': 'string',
+    'int64': 'int64',
+    'int32': 'int32',
+    'float64': 'float64',
+    'float32': 'float32',
+    'bool': 'bool_',
+    'boolean': 'bool_',
+    'datetime64[ns]': 'timestamp_ns',
+}
+
+def to_arrow_type(dtype):
+    """
+    Translate a pandas dtype hint (e.g. `str`, 'int64', 'datetime64[ns]') into an Arrow type.
+
+    Returns:
+    - pyarrow.DataType: The matching Arrow type, or None when the type should be inferred.
+    """
+    import pyarrow as pa
+
+    name = getattr(dtype, '__name__', str(dtype))
+    arrow_name = ARROW_TYPE_NAMES.get(name)
+    if arrow_name is None:
+        return None
+    if arrow_name == 'timestamp_ns':
+        return pa.timestamp('ns')
+    return getattr(pa, arrow_name)()
+
+class CsvLoader(BaseLoader):
+    """
+    CSV file loader backed by pyarrow's multithreaded CSV reader.
+    """
+
+    def load(self, file_path: str, sheet_names: list = None, columns: list = None, dtypes: dict = None,
+             delimiter: str = ',', encoding: str = 'utf8', block_size: int = None, use_threads: bool = True) -> dict:
+        """
+        Load data from a CSV file (optionally gzip or zstd compressed, detected from the extension).
+
+        Args:
+        - file_path (str): The path to the CSV file.
+        - sheet_names (list, optional): A CSV file has a single table; the first name is used as its
+          key (and as `source_sheetname` downstream). Defaults to the file name without extension.
+        - columns (list, optional): Only parse these columns. Columns missing from the file are ignored.
+        - dtypes (dict, optional): Column name to dtype hints (e.g. {'Code': str}) used as the Arrow
+          column types instead of inferring them.
+        - delimiter (str): Field delimiter.
+        - encoding (str): Text encoding of the file.
+        - block_size (int, optional): Bytes per parsed block; blocks are parsed in parallel.
+        - use_threads (bool): Parse blocks on multiple threads.
+
+        Returns:
+        - dict: Dictionary containing the file's data under a single table name.
+        """
+        table_name = sheet_names[0] if sheet_names else self.default_table_name(file_path)
+        data = {}
+        try:
+            import pyarrow.csv as pacsv
+
+            read_options, parse_options, convert_options = self.build_csv_options(
+                file_path, columns, dtypes, delimiter, encoding, block_size, use_threads)
+            if columns is not None and not convert_options.include_columns:
+                # None of the requested columns are in the file
+                data[table_name] = pd.DataFrame()
+                return data
+            table = pacsv.read_csv(file_path, read_options=read_options, parse_options=parse_options,
+                                   convert_options=convert_options)
+            data[table_name] = arrow_to_pandas(table)
+        except Exception as e:
+            print(f"Error loading file {file_path}: {e}")
+        return data
+
+    def iter_batches(self, file_path: str, columns: list = None, dtypes: dict = None, delimiter: str = ',',
+                     encoding: str = 'utf8', block_size: int = None, use_threads: bool = True):
+        """
+        Stream a CSV file as Arrow record batches of roughly `block_size` bytes each, so files larger
+        than memory can be processed batch by batch. Arguments are the same as for `load`.
+
+        Yields:
+        - pyarrow.RecordBatch: The next batch of parsed rows.
+        """
+        import pyarrow.csv as pacsv
+
+        read_options, parse_options, convert_options = self.build_csv_options(
+            file_path, columns, dtypes, delimiter, encoding, block_size, use_threads)
+        if columns is not None and not convert_options.include_columns:
+            return
+        with pacsv.open_csv(file_path, read_options=read_options, parse_options=parse_options,
+                            convert_options=convert_options) as reader:
+            for batch in reader:
+                yield batch
+
+    @staticmethod
+    def default_table_name(file_path):
+        """
+        Return the file name without directory and extensions (e.g. 'data' for 'out/data.csv.gz').
+        """
+        return os.path.basename(file_path).split('.')[0]
+
+    @staticmethod
+    def build_csv_options(file_path, columns=None, dtypes=None, delimiter=',', encoding='utf8',
+                          block_size=None, use_threads=True):
+        """
+        Build pyarrow's read, parse and convert options from the loader options.
+
+        Empty fields are read as nulls in every column, matching pandas and the Excel loader.
+        """
+        import pyarrow.csv as pacsv
+
+        read_options = pacsv.ReadOptions(encoding=encoding, use_threads=use_threads)
+        if block_size is not None:
+            read_options.block_size = block_size
+        parse_options = pacsv.ParseOptions(delimiter=delimiter)
+
+        column_types = {}
+        for column, dtype in (dtypes or {}).items():
+            arrow_type = to_arrow_type(dtype)
+            if arrow_type is not None:
+                column_types[column] = arrow_type
+
+        include_columns = []
+        if columns is not None:
+            # Only project columns present in the header, so missing columns are ignored rather than fatal
+            with pacsv.open_csv(file_path, read_options=read_options, parse_options=parse_options) as reader:
+                header = set(reader.schema.names)
+            include_columns = [column for column in columns if column in header]
+
+        convert_options = pacsv.ConvertOptions(column_types=column_types, include_columns=include_columns,
+                                               strings_can_be_null=True)
+        return read_options, parse_options, convert_options
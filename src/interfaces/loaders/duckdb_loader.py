@@ -0,0 +1,138 @@
+# src/pipelines/loaders/duckdb_loader.py
+import weakref
+import duckdb
+from src.interfaces.loaders.base_loader import BaseLoader, arrow_to_pandas
+
+def quote_identifier(name):
+    """
+    Quote a DuckDB identifier, escaping embedded double quotes.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+def build_select_query(table, columns=None, filters=None):
+    """
+    Build a parameterized SELECT with the projection and filters pushed down into DuckDB.
+
+    Args:
+    - table (str): Table name, optionally qualified by its schema (e.g. 'main_bronze.example').
+    - columns (list, optional): Columns to read. Defaults to all columns.
+    - filters (dict, optional): Column name to a value, or a list of accepted values
+      (e.g. {'source_filepath': ['a.xlsx', 'b.xlsx']}). Conditions are combined with AND; None matches NULL.
+
+    Returns:
+    - tuple: The SQL query and its parameters.
+    """
+    qualified_table = '.'.join(quote_identifier(part) for part in table.split('.'))
+    select_list = ', '.join(quote_identifier(column) for column in columns) if columns else '*'
+
+    conditions = []
+    parameters = []
+    for column, value in (filters or {}).items():
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            if not values:
+                conditions.append('FALSE')
+                continue
+            placeholders = ', '.join('?' for _ in values)
+            conditions.append(f"{quote_identifier(column)} IN ({placeholders})")
+            parameters.extend(values)
+        else:
+            conditions.append(f"{quote_identifier(column)} IS NOT DISTINCT FROM ?")
+            parameters.append(value)
+
+    query = f"SELECT {select_list} FROM {qualified_table}"
+    if conditions:
+        query += f" WHERE {' AND '.join(conditions)}"
+    return query, parameters
+
+class DuckdbLoader(BaseLoader):
+    """
+    DuckDB table loader, e.g. for reading bronze tables written by `DuckdbWriter` back in later stages.
+    """
+
+    def load(self, file_path: str, sheet_names: list = None, table: str = None, columns: list = None,
+             filters: dict = None, batch_size: int = 1_000_000, dtypes: dict = None) -> dict:
+        """
+        Load the filtered rows of DuckDB tables into DataFrames.
+
+        Args:
+        - file_path (str): The path to the DuckDB database.
+        - sheet_names (list, optional): Tables to read (e.g. ['main_bronze.example']), used as the keys
+          of the result and as `source_sheetname` downstream. Ignored when `table` is given.
+        - table (str, optional): A single table to read.
+        - columns (list, optional): Columns to read. Columns missing from a table are ignored.
+        - filters (dict, optional): Column name to value(s) the rows must match (see `build_select_query`).
+        - batch_size (int): Rows per Arrow record batch fetched from DuckDB.
+        - dtypes (dict, optional): Accepted for compatibility with the pipeline's projection; DuckDB
+          columns are already typed.
+
+        Returns:
+        - dict: Dictionary containing data for each table.
+        """
+        tables = [table] if table else list(sheet_names or [])
+        data = {}
+        try:
+            with duckdb.connect(file_path, read_only=True) as conn:
+                for table_name in tables:
+                    batches = self.iter_batches(file_path, table_name, columns, filters, batch_size, conn=conn)
+                    data[table_name] = arrow_to_pandas(batches.read_all())
+        except Exception as e:
+            print(f"Error loading tables {tables} from {file_path}: {e}")
+        return data
+
+    def iter_batches(self, file_path: str, table: str, columns: list = None, filters: dict = None,
+                     batch_size: int = 1_000_000, conn=None):
+        """
+        Stream the filtered rows of a table as Arrow record batches.
+
+        Only the requested columns and the rows matching `filters` are read, so a filter on the
+        partition columns of a table written sorted by them skips the other partitions' row groups.
+        Without `conn`, the database is opened read-only and closed once the reader is exhausted or
+        released, including readers that are dropped before (or without) being iterated. Pass `conn`
+        to close the connection deterministically, e.g. when stopping after the first batches.
+
+        Args:
+        - file_path (str): The path to the DuckDB database.
+        - table (str): Table name, optionally qualified by its schema.
+        - columns (list, optional): Columns to read. Columns missing from the table are ignored.
+        - filters (dict, optional): Column name to value(s) the rows must match.
+        - batch_size (int): Rows per record batch.
+        - conn (duckdb.DuckDBPyConnection, optional): Connection to read with, left open for the caller
+          to close. The reader must not be used after the connection is closed.
+
+        Returns:
+        - pyarrow.RecordBatchReader: Reader over the result batches.
+        """
+        import pyarrow as pa
+
+        owns_connection = conn is None
+        if owns_connection:
+            conn = duckdb.connect(file_path, read_only=True)
+        try:
+            if columns is not None:
+                query, _ = build_select_query(table)
+                available = set(conn.execute(f"{query} LIMIT 0").fetchdf().columns)
+                columns = [column for column in columns if column in available]
+                if not columns:
+                    if owns_connection:
+                        conn.close()
+                    return pa.RecordBatchReader.from_batches(pa.schema([]), [])
+            query, parameters = build_select_query(table, columns, filters)
+            result = conn.execute(query, parameters)
+            reader = result.to_arrow_reader(batch_size) if hasattr(result, 'to_arrow_reader') else result.fetch_record_batch(batch_size)
+        except Exception:
+            if owns_connection:
+                conn.close()
+            raise
+        if not owns_connection:
+            return reader
+
+        def generate_batches():
+            yield from reader
+            conn.close()
+
+        batches = pa.RecordBatchReader.from_batches(reader.schema, generate_batches())
+        # A generator's cleanup only runs once it has started, so tie the connection to the reader
+        # instead: it is closed when the reader is released, however far it was read
+        weakref.finalize(batches, conn.close)
+        return batches
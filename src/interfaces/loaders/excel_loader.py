@@ -1,28 +1,313 @@
 # src/pipelines/loaders/excel_loader.py
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import zipfile
 import pandas as pd
+import openpyxl
+from openpyxl import load_workbook
+from openpyxl.utils import column_index_from_string
+from openpyxl.worksheet._reader import WorkSheetParser
+from pandas.io.parsers import TextParser
 from src.interfaces.loaders.base_loader import BaseLoader
+from src.interfaces.loaders.sheet_cache import SheetCache
+from src.interfaces.loaders.xlsx_metadata import read_sheet_paths
+
+# Private openpyxl internals used by the 'openpyxl_stream' engine. openpyxl is pinned to the 3.1 series
+# they were written against; `check_openpyxl_internals` fails loudly if a release moves them.
+OPENPYXL_WORKSHEET_INTERNALS = ['_get_source', '_shared_strings']
+OPENPYXL_WORKBOOK_INTERNALS = ['epoch', '_date_formats', '_timedelta_formats']
+OPENPYXL_PARSER_INTERNALS = ['parse', 'parse_row', 'parse_cell']
+
+def normalize_header_label(label):
+    """
+    Return the text a header label is matched against the projected `columns` with, so every
+    engine projects numeric headers the same way (e.g. a header cell 2024 matches '2024').
+    """
+    return str(convert_cell_value(label))
+
+def build_read_excel_options(columns=None, header_row=0, max_rows=None, dtypes=None):
+    """
+    Translate the loader's projection options into `pd.read_excel` keyword arguments.
+    """
+    options = {'header': header_row, 'nrows': max_rows}
+    if columns is not None:
+        wanted_columns = {str(column) for column in columns}
+        options['usecols'] = lambda column: normalize_header_label(column) in wanted_columns
+    if dtypes:
+        options['dtype'] = dtypes
+    return options
+
+def read_sheet_openpyxl(file_path, sheet_name, **options):
+    """
+    Read a sheet with pandas' default openpyxl engine.
+    """
+    return pd.read_excel(file_path, sheet_name=sheet_name, engine='openpyxl', **build_read_excel_options(**options))
+
+def read_sheet_calamine(file_path, sheet_name, **options):
+    """
+    Read a sheet with the Rust-backed calamine engine (requires the optional `python-calamine` package).
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError as e:
+        raise ImportError("The 'calamine' Excel engine requires the 'python-calamine' package.") from e
+    return pd.read_excel(file_path, sheet_name=sheet_name, engine='calamine', **build_read_excel_options(**options))
+
+def check_openpyxl_internals(workbook, worksheet, parser):
+    """
+    Check that the installed openpyxl still has the private attributes the streaming engine uses.
+
+    Raises:
+    - RuntimeError: If one of them is missing.
+    """
+    missing = ([f"Workbook.{name}" for name in OPENPYXL_WORKBOOK_INTERNALS if not hasattr(workbook, name)]
+               + [f"ReadOnlyWorksheet.{name}" for name in OPENPYXL_WORKSHEET_INTERNALS if not hasattr(worksheet, name)]
+               + [f"WorkSheetParser.{name}" for name in OPENPYXL_PARSER_INTERNALS if not hasattr(parser, name)])
+    if missing:
+        raise RuntimeError(f"The 'openpyxl_stream' engine does not support openpyxl {openpyxl.__version__}: "
+                           f"missing {', '.join(missing)}. Use the 'openpyxl' engine or openpyxl 3.1.")
+
+class ProjectedWorkSheetParser(WorkSheetParser):
+    """
+    openpyxl worksheet parser that only converts the cells of the wanted columns.
+
+    The XML of every cell is still tokenized, but the per-cell work (type conversion, shared string
+    and date lookups) is skipped for columns outside the projection.
+    """
+
+    def __init__(self, src, shared_strings, wanted_columns=None, **kwargs):
+        super().__init__(src, shared_strings, **kwargs)
+        self.row_counter = 0
+        self.wanted_columns = wanted_columns
+        self.column_cache = {}
+
+    def parse_row(self, row):
+        """
+        Parse a `<row>` element into its row number and a {column index: value} dictionary.
+        """
+        row_number = row.get('r')
+        self.row_counter = int(float(row_number)) if row_number is not None else self.row_counter + 1
+
+        values = {}
+        column = 0
+        for element in row:
+            coordinate = element.get('r')
+            if coordinate is None:
+                column += 1
+            else:
+                letters = coordinate.rstrip('0123456789')
+                column = self.column_cache.get(letters)
+                if column is None:
+                    column = self.column_cache[letters] = column_index_from_string(letters)
+            if self.wanted_columns is None or column in self.wanted_columns:
+                values[column] = self.parse_cell(element)['value']
+        return self.row_counter, values
+
+def read_sheet_openpyxl_stream(file_path, sheet_name, columns=None, header_row=0, max_rows=None, dtypes=None):
+    """
+    Read a sheet by streaming the worksheet XML of a read-only openpyxl workbook.
+
+    Cell values are converted by openpyxl's own cell parser and then the same way pandas' openpyxl
+    engine converts them, so the resulting DataFrame has identical values and dtypes. No cell objects
+    are built, and when `columns` is given only the cells under the matching header positions are
+    converted, so the conversion cost scales with the schema width rather than the sheet width.
+    """
+    workbook = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        worksheet = workbook[sheet_name]
+        check_openpyxl_internals(workbook, worksheet, WorkSheetParser)
+        header_number = header_row + 1
+        header = None
+        positions = None
+        rows = []
+        previous_row = header_number
+
+        with worksheet._get_source() as source:
+            parser = ProjectedWorkSheetParser(source, worksheet._shared_strings, data_only=True,
+                                              epoch=workbook.epoch, date_formats=workbook._date_formats,
+                                              timedelta_formats=workbook._timedelta_formats)
+            for row_number, values in parser.parse():
+                if row_number < header_number:
+                    continue
+                if header is None:
+                    header = values
+                    if columns is not None:
+                        wanted_columns = {str(column) for column in columns}
+                        positions = sorted(col for col, name in header.items()
+                                           if name is not None and normalize_header_label(name) in wanted_columns)
+                        if not positions:
+                            return pd.DataFrame()
+                        # From here on only the wanted columns are converted
+                        parser.wanted_columns = set(positions)
+                    previous_row = row_number
+                    continue
+                if max_rows is not None and row_number - header_number > max_rows:
+                    break
+                # Rows missing from the XML are empty rows
+                rows.extend({} for _ in range(row_number - previous_row - 1))
+                rows.append(values)
+                previous_row = row_number
+    finally:
+        workbook.close()
+
+    if header is None:
+        return pd.DataFrame()
+    if max_rows is not None:
+        rows = rows[:max_rows]
+
+    if positions is None:
+        # Like pandas, the width is the last non-empty cell across the header and data rows
+        last_columns = [max((col for col, value in row.items() if value is not None), default=0) for row in [header] + rows]
+        positions = list(range(1, max(last_columns) + 1))
+
+    table = [[convert_cell_value(row.get(col)) for col in positions] for row in [header] + rows]
+    # Trailing empty rows (e.g. formatted but blank cells) are dropped, as pandas does
+    while len(table) > 1 and all(value == '' for value in table[-1]):
+        table.pop()
+    return TextParser(table, header=0, dtype=dtypes).read()
+
+def convert_cell_value(value):
+    """
+    Convert a raw openpyxl cell value the way pandas' openpyxl engine does: empty cells become ''
+    (parsed as missing) and integral floats become ints.
+    """
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+# Sheet readers selectable through the `engine` loader option
+EXCEL_ENGINES = {
+    'openpyxl': read_sheet_openpyxl,
+    'openpyxl_stream': read_sheet_openpyxl_stream,
+    'calamine': read_sheet_calamine,
+}
+
+# Engines whose parsing releases the GIL, so threads are enough to use several cores
+GIL_RELEASING_ENGINES = {'calamine'}
+
+def load_sheet(file_path, sheet_name, engine='openpyxl', cache_dir=None, cache_max_bytes=1024 * 1024 * 1024, **read_options):
+    """
+    Read a single sheet, going through the parsed-sheet cache when `cache_dir` is set.
+
+    Module-level so it can be submitted to a process pool.
+    """
+    cache = SheetCache(cache_dir, cache_max_bytes) if cache_dir else None
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.build_key(file_path, sheet_name, {'engine': engine, **read_options})
+        sheet_data = cache.get(cache_key)
+        if sheet_data is not None:
+            print(f"Loaded sheet {sheet_name} of {file_path} from cache.")
+            return sheet_data
+
+    sheet_data = EXCEL_ENGINES[engine](file_path, sheet_name, **read_options)
+    if cache is not None:
+        cache.put(cache_key, sheet_data)
+    return sheet_data
 
 class ExcelLoader(BaseLoader):
     """
     Excel file loader.
     """
 
-    def load(self, file_path: str, sheet_names: list) -> dict:
+    def load(self, file_path: str, sheet_names: list, engine: str = 'openpyxl', columns: list = None,
+             header_row: int = 0, max_rows: int = None, dtypes: dict = None, cache_dir: str = None,
+             cache_max_bytes: int = 1024 * 1024 * 1024, sheet_workers: int = 1, sheet_executor: str = 'auto') -> dict:
         """
         Load data from an Excel file.
 
         Args:
         - file_path (str): The path to the Excel file.
-        - sheet_names (list): List of relevant sheet names to be read.
+        - sheet_names (list): List of relevant sheet names to be read. None reads every sheet.
+        - engine (str): Parsing engine, one of 'openpyxl' (default), 'openpyxl_stream' or 'calamine'.
+        - columns (list, optional): Only parse these columns (e.g. the target schema's columns).
+          Columns missing from a sheet are ignored.
+        - header_row (int): Zero-based row index of the header.
+        - max_rows (int, optional): Maximum number of data rows to read per sheet.
+        - dtypes (dict, optional): Column name to dtype hints applied while parsing (e.g. {'Code': str}).
+        - cache_dir (str, optional): Directory of the parsed-sheet cache. When set, sheets of unchanged
+          workbooks are read from Arrow files instead of being parsed again.
+        - cache_max_bytes (int): Size limit of the cache directory before LRU eviction.
+        - sheet_workers (int): Number of sheets parsed concurrently.
+        - sheet_executor (str): 'thread', 'process' or 'auto' (default), which uses threads for
+          GIL-releasing engines and processes otherwise.
 
         Returns:
-        - dict: Dictionary containing data for each sheet.
+        - dict: Dictionary containing data for each sheet, in the order of `sheet_names` (workbook
+          order when reading every sheet).
         """
+        sheets = self.iter_sheets(file_path, sheet_names, engine, columns, header_row, max_rows, dtypes,
+                                  cache_dir, cache_max_bytes, sheet_workers, sheet_executor)
         data = {}
         try:
-            for sheet_name in sheet_names:
-                sheet_data = pd.read_excel(file_path, sheet_name=sheet_name)
+            for sheet_name, sheet_data in sheets:
                 data[sheet_name] = sheet_data
         except Exception as e:
             print(f"Error loading file {file_path} with sheets {sheet_names}: {e}")
-        return data
+        if sheet_names is None:
+            return data
+        return {sheet_name: data[sheet_name] for sheet_name in sheet_names if sheet_name in data}
+
+    def iter_sheets(self, file_path: str, sheet_names: list, engine: str = 'openpyxl', columns: list = None,
+                    header_row: int = 0, max_rows: int = None, dtypes: dict = None, cache_dir: str = None,
+                    cache_max_bytes: int = 1024 * 1024 * 1024, sheet_workers: int = 1, sheet_executor: str = 'auto'):
+        """
+        Parse the sheets of an Excel file, yielding each one as soon as it is ready.
+
+        With `sheet_workers` > 1 independent sheets are parsed concurrently and yielded in completion
+        order, so a single workbook with many large tabs can use several cores. A sheet that fails to
+        load (e.g. a missing sheet) is reported and skipped, so the other sheets are always yielded,
+        however the sheets are scheduled. Arguments are the same as for `load`.
+
+        Returns:
+        - iterator: (sheet_name, pd.DataFrame) for each sheet.
+
+        Raises:
+        - ValueError: If the engine or sheet executor is not supported.
+        """
+        if engine not in EXCEL_ENGINES:
+            raise ValueError(f"Unsupported Excel engine '{engine}'. Expected one of {list(EXCEL_ENGINES)}.")
+        if sheet_executor not in ('auto', 'thread', 'process'):
+            raise ValueError(f"Unsupported sheet executor '{sheet_executor}'. Expected 'auto', 'thread' or 'process'.")
+        sheet_options = {'engine': engine, 'cache_dir': cache_dir, 'cache_max_bytes': cache_max_bytes,
+                         'columns': columns, 'header_row': header_row, 'max_rows': max_rows, 'dtypes': dtypes}
+        if sheet_executor == 'auto':
+            sheet_executor = 'thread' if engine in GIL_RELEASING_ENGINES else 'process'
+        return self._generate_sheets(file_path, sheet_names, sheet_options, sheet_workers, sheet_executor)
+
+    @staticmethod
+    def _generate_sheets(file_path, sheet_names, sheet_options, sheet_workers, sheet_executor):
+        """
+        Generator behind `iter_sheets`, kept separate so option errors are raised on call.
+        """
+        if sheet_names is None:
+            with zipfile.ZipFile(file_path) as archive:
+                sheet_names = list(read_sheet_paths(archive))
+
+        if sheet_workers <= 1 or len(sheet_names) <= 1:
+            for sheet_name in sheet_names:
+                try:
+                    sheet_data = load_sheet(file_path, sheet_name, **sheet_options)
+                except Exception as e:
+                    print(f"Error loading sheet {sheet_name} of file {file_path}: {e}")
+                    continue
+                yield sheet_name, sheet_data
+            return
+
+        executor_class = ThreadPoolExecutor if sheet_executor == 'thread' else ProcessPoolExecutor
+        with executor_class(max_workers=min(sheet_workers, len(sheet_names))) as executor:
+            futures = {executor.submit(load_sheet, file_path, sheet_name, **sheet_options): sheet_name
+                       for sheet_name in sheet_names}
+            try:
+                for future in as_completed(futures):
+                    try:
+                        sheet_data = future.result()
+                    except Exception as e:
+                        print(f"Error loading sheet {futures[future]} of file {file_path}: {e}")
+                        continue
+                    yield futures[future], sheet_data
+            finally:
+                # Stop queued sheets from starting if the consumer stops early
+                for future in futures:
+                    future.cancel()
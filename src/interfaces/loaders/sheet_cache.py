@@ -0,0 +1,208 @@
+# src/interfaces/loaders/sheet_cache.py
+import os
+import json
+import hashlib
+import numbers
+import datetime
+import tempfile
+import pandas as pd
+from src.interfaces.loaders.base_loader import arrow_to_pandas
+
+# Workbook content hashes, memoized per (path, size, mtime) so each workbook is hashed once per process
+_FINGERPRINTS = {}
+
+# Arrow schema metadata key holding the original column labels, which Arrow stores as strings
+COLUMN_LABELS_KEY = b'sheet_cache.column_labels'
+
+def encode_column_labels(columns):
+    """
+    Encode column labels as (type, value) pairs, so labels such as a numeric header 2024 come back
+    with their type. Returns None if a label has a type that cannot be restored.
+    """
+    encoded = []
+    for label in columns:
+        if isinstance(label, str):
+            encoded.append(['str', label])
+        elif isinstance(label, bool):
+            encoded.append(['bool', label])
+        elif isinstance(label, numbers.Integral):
+            encoded.append(['int', int(label)])
+        elif isinstance(label, numbers.Real):
+            encoded.append(['float', float(label)])
+        elif isinstance(label, datetime.datetime):
+            encoded.append(['datetime', pd.Timestamp(label).isoformat()])
+        else:
+            return None
+    return encoded
+
+def decode_column_labels(encoded):
+    """
+    Restore column labels encoded by `encode_column_labels`.
+    """
+    decoders = {'str': str, 'bool': bool, 'int': int, 'float': float, 'datetime': pd.Timestamp}
+    return [decoders[label_type](value) for label_type, value in encoded]
+
+class SheetCache:
+    """
+    Sidecar cache of parsed sheets stored as uncompressed Arrow IPC (Feather v2) files.
+
+    Entries are keyed on the workbook's content hash, the sheet name and the loader options, so
+    a changed workbook or different projection never returns stale data. Cached sheets are read
+    through a memory map, and the least recently used entries are evicted once the cache directory
+    exceeds its size limit.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024):
+        """
+        Initializes the SheetCache.
+
+        Args:
+        - cache_dir (str): Directory holding the cached `.arrow` files.
+        - max_bytes (int): Maximum total size of the cache directory before LRU eviction.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def fingerprint_workbook(file_path: str) -> str:
+        """
+        Compute the SHA-256 hash of a workbook's contents.
+
+        Args:
+        - file_path (str): The path to the workbook.
+
+        Returns:
+        - str: Hex digest of the file contents.
+        """
+        stat = os.stat(file_path)
+        memo_key = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in _FINGERPRINTS:
+            digest = hashlib.sha256()
+            with open(file_path, 'rb') as file:
+                for block in iter(lambda: file.read(1024 * 1024), b''):
+                    digest.update(block)
+            _FINGERPRINTS[memo_key] = digest.hexdigest()
+        return _FINGERPRINTS[memo_key]
+
+    def build_key(self, file_path: str, sheet_name: str, options: dict) -> str:
+        """
+        Build the cache key of a sheet.
+
+        Args:
+        - file_path (str): The path to the workbook.
+        - sheet_name (str): The sheet name.
+        - options (dict): Loader options affecting the parsed result (engine, columns, dtypes, ...).
+
+        Returns:
+        - str: Hex digest identifying the cached entry.
+        """
+        payload = json.dumps({
+            'workbook': self.fingerprint_workbook(file_path),
+            'sheet': sheet_name,
+            'options': options,
+        }, sort_keys=True, default=lambda value: getattr(value, '__name__', str(value)))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        """
+        Return the path of the cache file for a key.
+        """
+        return os.path.join(self.cache_dir, f"{key}.arrow")
+
+    def get(self, key: str):
+        """
+        Read a cached sheet through a memory map.
+
+        Args:
+        - key (str): Cache key from `build_key`.
+
+        Returns:
+        - pd.DataFrame: The cached sheet, or None on a cache miss.
+        """
+        import pyarrow.feather as feather
+
+        path = self.entry_path(key)
+        try:
+            table = feather.read_table(path, memory_map=True)
+        except (FileNotFoundError, OSError):
+            return None
+
+        # Mark the entry as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker since it was read
+            pass
+        dataframe = arrow_to_pandas(table)
+        labels = (table.schema.metadata or {}).get(COLUMN_LABELS_KEY)
+        if labels is not None:
+            dataframe.columns = decode_column_labels(json.loads(labels))
+        return dataframe
+
+    def put(self, key: str, dataframe: pd.DataFrame) -> bool:
+        """
+        Store a parsed sheet, then evict least recently used entries if the cache is over its limit.
+
+        Args:
+        - key (str): Cache key from `build_key`.
+        - dataframe (pd.DataFrame): The parsed sheet.
+
+        Returns:
+        - bool: True if the sheet was cached, False if it cannot be represented in Arrow (e.g. mixed-type
+          columns or column labels of an unsupported type).
+        """
+        import pyarrow as pa
+        import pyarrow.feather as feather
+
+        labels = encode_column_labels(dataframe.columns)
+        if labels is None:
+            print("Sheet not cached, its column labels cannot be restored from Arrow.")
+            return False
+        try:
+            table = pa.Table.from_pandas(dataframe, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            print(f"Sheet not cached, unable to convert it to Arrow: {e}")
+            return False
+        # Arrow field names are strings; the original labels are restored from the metadata in `get`
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), COLUMN_LABELS_KEY: json.dumps(labels).encode()})
+
+        # Write to a temporary file and rename so readers never see a partial entry
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(file_descriptor)
+        try:
+            feather.write_feather(table, temp_path, compression='uncompressed')
+            os.replace(temp_path, self.entry_path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.evict()
+        return True
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits within `max_bytes`.
+
+        Several workers may evict from the same directory at once (e.g. with the process sheet
+        executor); entries another worker removed first are skipped.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.arrow'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total_bytes <= self.max_bytes:
+                break
+            total_bytes -= size
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            print(f"Evicted cached sheet {path}")
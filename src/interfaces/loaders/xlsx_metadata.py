@@ -0,0 +1,493 @@
+# src/interfaces/loaders/xlsx_metadata.py
+import re
+import datetime
+import hashlib
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from openpyxl.cell.text import Text
+from openpyxl.formula.translate import Translator
+from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+from openpyxl.utils.cell import coordinate_to_tuple, get_column_letter, range_boundaries
+from openpyxl.utils.datetime import CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900, from_excel
+
+# Namespaces of the SpreadsheetML parts read here
+MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PACKAGE_RELATIONSHIPS_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+OFFICE_DOCUMENT_TYPE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+CHART_NS = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+DRAWING_TYPE_SUFFIX = '/drawing'
+
+# Opening tag of a formula element, with or without a namespace prefix (e.g. '<f>', '<x:f t="shared"')
+FORMULA_TAG_PATTERN = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?f[\s/>]')
+
+# Opening tag of a row element, capturing its namespace prefix
+ROW_TAG_PATTERN = re.compile(rb'<((?:[A-Za-z_][\w.-]*:)?)row[\s/>]')
+ROW_NUMBER_PATTERN = re.compile(rb'\sr="([0-9.]+)"')
+# Opening tag of a cell value or inline string: rows without one only hold styled, empty cells
+VALUE_TAG_PATTERN = re.compile(rb'<(?:[A-Za-z_][\w.-]*:)?(?:v|is)[\s>]')
+NAMESPACE_DECLARATION_PATTERN = re.compile(rb'xmlns(?::[\w.-]+)?="[^"]*"')
+
+# Workbook-level parts that sheet cells refer to: string cells hold indices into the shared strings
+# table, and the styles' number formats decide whether a number is read as a date
+CELL_REFERENCE_PART_TYPES = ('/sharedStrings', '/styles')
+
+# Bytes read at a time when hashing a part
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def resolve_target(source_path, target):
+    """
+    Resolve a relationship target relative to the part that owns the relationship.
+
+    Args:
+    - source_path (str): Zip path of the source part (e.g. 'xl/workbook.xml').
+    - target (str): Target attribute of the relationship (e.g. 'worksheets/sheet1.xml').
+
+    Returns:
+    - str: Zip path of the target part (e.g. 'xl/worksheets/sheet1.xml').
+    """
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_path), target))
+
+def get_rels_path(part_path):
+    """
+    Return the zip path of a part's relationships (e.g. 'xl/_rels/workbook.xml.rels').
+    """
+    directory, name = posixpath.split(part_path)
+    return posixpath.join(directory, '_rels', f'{name}.rels')
+
+def read_relationships(archive, part_path):
+    """
+    Read the relationships of a part.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+    - part_path (str): Zip path of the part.
+
+    Returns:
+    - dict: Relationship id to (type, resolved target path). Empty if the part has no relationships.
+    """
+    rels_path = get_rels_path(part_path)
+    if rels_path not in archive.NameToInfo:
+        return {}
+    root = ET.fromstring(archive.read(rels_path))
+    relationships = {}
+    for relationship in root.iter(f'{{{PACKAGE_RELATIONSHIPS_NS}}}Relationship'):
+        if relationship.get('TargetMode') == 'External':
+            continue
+        relationships[relationship.get('Id')] = (relationship.get('Type'), resolve_target(part_path, relationship.get('Target')))
+    return relationships
+
+def get_workbook_path(archive):
+    """
+    Return the zip path of the workbook part, normally 'xl/workbook.xml'.
+    """
+    for relationship_type, target in read_relationships(archive, '').values():
+        if relationship_type == OFFICE_DOCUMENT_TYPE:
+            return target
+    return 'xl/workbook.xml'
+
+def read_sheet_paths(archive):
+    """
+    Map the sheet names of a workbook to their worksheet XML parts, in workbook order.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+
+    Returns:
+    - dict: Sheet name to zip path (e.g. {'Sheet1': 'xl/worksheets/sheet1.xml'}).
+    """
+    workbook_path = get_workbook_path(archive)
+    relationships = read_relationships(archive, workbook_path)
+    root = ET.fromstring(archive.read(workbook_path))
+
+    sheet_paths = {}
+    for sheet in root.iter(f'{{{MAIN_NS}}}sheet'):
+        relationship = relationships.get(sheet.get(f'{{{RELATIONSHIPS_NS}}}id'))
+        if relationship is not None:
+            sheet_paths[sheet.get('name')] = relationship[1]
+    return sheet_paths
+
+def read_dimension(archive, sheet_path):
+    """
+    Read the used range declared by a worksheet's `<dimension>` element without parsing any cells.
+
+    The element precedes `<sheetData>`, so only the beginning of the part is read.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+    - sheet_path (str): Zip path of the worksheet part.
+
+    Returns:
+    - tuple: (min_col, min_row, max_col, max_row), or None if the sheet declares no dimension.
+    """
+    with archive.open(sheet_path) as source:
+        for _, element in ET.iterparse(source, events=('start',)):
+            if element.tag == f'{{{MAIN_NS}}}dimension':
+                reference = element.get('ref')
+                if not reference:
+                    return None
+                try:
+                    return range_boundaries(reference)
+                except ValueError:
+                    return None
+            if element.tag == f'{{{MAIN_NS}}}sheetData':
+                return None
+    return None
+
+def get_sheet_dimensions(file_path, sheet_names=None):
+    """
+    Read the declared row and column extent of the sheets of an xlsx workbook.
+
+    Args:
+    - file_path (str): The path to the workbook.
+    - sheet_names (list, optional): Sheets to read. Defaults to every sheet.
+
+    Returns:
+    - dict: Sheet name to (rows, columns) counted from A1, or None when a sheet declares no usable
+      dimension. Requested sheets missing from the workbook are left out.
+    """
+    dimensions = {}
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_paths = read_sheet_paths(archive)
+        for sheet_name in (sheet_names if sheet_names is not None else list(sheet_paths)):
+            if sheet_name not in sheet_paths:
+                continue
+            boundaries = read_dimension(archive, sheet_paths[sheet_name])
+            # Some writers only declare 'A1' regardless of content, which tells us nothing
+            if boundaries is None or boundaries[2] is None or boundaries[3] is None or boundaries[2:] == (1, 1):
+                dimensions[sheet_name] = None
+            else:
+                dimensions[sheet_name] = (boundaries[3], boundaries[2])
+    return dimensions
+
+def hash_part(archive, part_path, digest):
+    """
+    Feed the uncompressed bytes of a part to a hash object, streaming it in chunks.
+    """
+    with archive.open(part_path) as source:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+
+def hash_sheet_contents(file_path, sheet_names=None):
+    """
+    Compute a content hash of the sheets of an xlsx workbook from their raw XML parts, without
+    parsing any cells.
+
+    A sheet's hash covers its worksheet part together with the workbook's shared strings and styles
+    parts, which its cells refer to. Identical copies of a workbook (whatever their file name) hash
+    their sheets identically; a sheet copied into a workbook with other content may not, since the
+    shared strings table is workbook-wide, so duplicates can be missed but are never invented.
+
+    Args:
+    - file_path (str): The path to the workbook.
+    - sheet_names (list, optional): Sheets to hash. Defaults to every sheet.
+
+    Returns:
+    - dict: Sheet name to hexadecimal BLAKE2b digest. Requested sheets missing from the workbook are left out.
+    """
+    hashes = {}
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_paths = read_sheet_paths(archive)
+        workbook_path = get_workbook_path(archive)
+        reference_paths = sorted(
+            target for relationship_type, target in read_relationships(archive, workbook_path).values()
+            if relationship_type.endswith(CELL_REFERENCE_PART_TYPES) and target in archive.NameToInfo
+        )
+
+        # Hash the shared parts once and reuse the state for every sheet
+        workbook_digest = hashlib.blake2b(digest_size=20)
+        for part_path in reference_paths:
+            hash_part(archive, part_path, workbook_digest)
+
+        for sheet_name in (sheet_names if sheet_names is not None else list(sheet_paths)):
+            if sheet_name not in sheet_paths:
+                continue
+            digest = workbook_digest.copy()
+            hash_part(archive, sheet_paths[sheet_name], digest)
+            hashes[sheet_name] = digest.hexdigest()
+    return hashes
+
+def part_contains(archive, part_path, pattern):
+    """
+    Check whether the uncompressed bytes of a part match a pattern, streaming it in chunks.
+    The pattern must not match more than 256 bytes, the overlap kept between chunks.
+    """
+    tail = b''
+    with archive.open(part_path) as source:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            if pattern.search(tail + chunk):
+                return True
+            tail = chunk[-256:]
+    return False
+
+def read_formula(element, coordinate, shared_formulas):
+    """
+    Render a formula element the way openpyxl reports the cell's value.
+
+    Cells sharing a formula only hold its index: the formula is translated from the cell that
+    defines it, as openpyxl does. Array and data table formulas are returned as their text.
+    """
+    value = '=' + (element.text or '')
+    if element.get('t') == 'shared':
+        index = element.get('si')
+        if index in shared_formulas:
+            return shared_formulas[index].translate_formula(coordinate)
+        if value != '=':
+            shared_formulas[index] = Translator(value, coordinate)
+    return value
+
+def iter_sheet_formulas(archive, sheet_path):
+    """
+    Yield the formula cells of a worksheet by streaming its XML part, without building cells.
+
+    Parts without any formula element are recognized from their raw bytes and not parsed at all.
+    Otherwise rows are discarded as soon as they are read, so memory stays flat however large the sheet.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+    - sheet_path (str): Zip path of the worksheet part.
+
+    Yields:
+    - tuple: (coordinate, formula) in row-major order, e.g. ('C2', '=A2*B2').
+    """
+    if not part_contains(archive, sheet_path, FORMULA_TAG_PATTERN):
+        return
+    row_tag, cell_tag, formula_tag = f'{{{MAIN_NS}}}row', f'{{{MAIN_NS}}}c', f'{{{MAIN_NS}}}f'
+    sheet_data_tag = f'{{{MAIN_NS}}}sheetData'
+    shared_formulas = {}
+    sheet_data = None
+    row_number, column_number, coordinate = 0, 0, None
+
+    with archive.open(sheet_path) as source:
+        for event, element in ET.iterparse(source, events=('start', 'end')):
+            tag = element.tag
+            if event == 'start':
+                # Cells and rows may omit their reference, in which case they follow the previous one
+                if tag == cell_tag:
+                    coordinate = element.get('r')
+                    if coordinate:
+                        _, column_number = coordinate_to_tuple(coordinate)
+                    else:
+                        column_number += 1
+                        coordinate = f"{get_column_letter(column_number)}{row_number}"
+                elif tag == row_tag:
+                    row_number = int(float(element.get('r'))) if element.get('r') else row_number + 1
+                    column_number = 0
+                elif tag == sheet_data_tag:
+                    sheet_data = element
+            elif tag == formula_tag:
+                yield coordinate, read_formula(element, coordinate, shared_formulas)
+            elif tag == row_tag and sheet_data is not None:
+                sheet_data.clear()
+            elif tag == sheet_data_tag:
+                return
+
+def read_chart_type(archive, chart_path):
+    """
+    Return the type of a chart part, i.e. the tag of the first plot in its plot area (e.g. 'barChart').
+    """
+    root = ET.fromstring(archive.read(chart_path))
+    plot_area = root.find(f'.//{{{CHART_NS}}}plotArea')
+    if plot_area is None:
+        return None
+    for element in plot_area:
+        name = element.tag.rsplit('}', 1)[-1]
+        if name.endswith('Chart'):
+            return name
+    return None
+
+def read_sheet_chart_types(archive, sheet_path):
+    """
+    List the charts drawn on a worksheet or chartsheet, following its drawing relationships.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+    - sheet_path (str): Zip path of the sheet part.
+
+    Returns:
+    - list: The type of each chart (see `read_chart_type`), in drawing order.
+    """
+    chart_types = []
+    for relationship_type, drawing_path in read_relationships(archive, sheet_path).values():
+        if not relationship_type.endswith(DRAWING_TYPE_SUFFIX) or drawing_path not in archive.NameToInfo:
+            continue
+        drawing_relationships = read_relationships(archive, drawing_path)
+        for chart in ET.fromstring(archive.read(drawing_path)).iter(f'{{{CHART_NS}}}chart'):
+            relationship = drawing_relationships.get(chart.get(f'{{{RELATIONSHIPS_NS}}}id'))
+            if relationship is not None and relationship[1] in archive.NameToInfo:
+                chart_types.append(read_chart_type(archive, relationship[1]))
+    return chart_types
+
+def read_namespace_declarations(archive, part_path):
+    """
+    Read the namespace declarations of a part's root element, needed to parse fragments of the part on their own.
+    """
+    with archive.open(part_path) as source:
+        head = source.read(64 * 1024)
+    root_start = re.search(rb'<(?![?!])[^>]*>', head)
+    return b' '.join(NAMESPACE_DECLARATION_PATTERN.findall(root_start.group(0))) if root_start else b''
+
+def iter_row_fragments(archive, sheet_path):
+    """
+    Yield the raw XML of each row of a worksheet, in order, without parsing it.
+
+    The decompressed part is streamed and rows are only located by their tags, so skipping a row
+    costs a couple of byte searches. Rows without cells are not stored in the part and are not yielded.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+    - sheet_path (str): Zip path of the worksheet part.
+
+    Yields:
+    - bytes: The `<row>` element, to be parsed with `parse_row_fragment` if needed.
+    """
+    buffer = b''
+    with archive.open(sheet_path) as source:
+        for chunk in iter(lambda: source.read(HASH_CHUNK_SIZE), b''):
+            buffer += chunk
+            position = 0
+            while True:
+                match = ROW_TAG_PATTERN.search(buffer, position)
+                if match is None:
+                    # Keep enough of the end for a row tag split across chunks
+                    position = max(position, len(buffer) - 64)
+                    break
+                tag_end = buffer.find(b'>', match.end() - 1)
+                if tag_end == -1:
+                    position = match.start()
+                    break
+                if buffer[tag_end - 1] == ord('/'):
+                    end = tag_end + 1
+                else:
+                    closing_tag = b'</' + match.group(1) + b'row>'
+                    end = buffer.find(closing_tag, tag_end)
+                    if end == -1:
+                        position = match.start()
+                        break
+                    end += len(closing_tag)
+                yield buffer[match.start():end]
+                position = end
+            buffer = buffer[position:]
+
+def get_row_number(fragment):
+    """
+    Return the row number declared by a row fragment, or None if it omits it.
+    """
+    match = ROW_NUMBER_PATTERN.search(fragment, 0, fragment.find(b'>'))
+    return int(float(match.group(1))) if match else None
+
+def parse_row_fragment(fragment, namespace_declarations):
+    """
+    Parse a row fragment into its cells.
+
+    Args:
+    - fragment (bytes): A row from `iter_row_fragments`.
+    - namespace_declarations (bytes): Declarations from `read_namespace_declarations` for the worksheet part.
+
+    Returns:
+    - list: One (column number, type, style index, raw value, formula element or None) tuple per
+      cell, where type is the cell's `t` attribute ('n' by default) and the raw value is the text of
+      its `<v>` element, or the text of an inline string.
+    """
+    row = ET.fromstring(b'<sheetData ' + namespace_declarations + b'>' + fragment + b'</sheetData>')[0]
+    cells = []
+    column_number = 0
+    for cell in row.iter(f'{{{MAIN_NS}}}c'):
+        reference = cell.get('r')
+        column_number = coordinate_to_tuple(reference)[1] if reference else column_number + 1
+        cell_type = cell.get('t', 'n')
+        if cell_type == 'inlineStr':
+            inline_string = cell.find(f'{{{MAIN_NS}}}is')
+            raw_value = Text.from_tree(inline_string).content if inline_string is not None else None
+        else:
+            value = cell.find(f'{{{MAIN_NS}}}v')
+            raw_value = value.text if value is not None else None
+        cells.append((column_number, cell_type, int(cell.get('s', 0)), raw_value, cell.find(f'{{{MAIN_NS}}}f')))
+    return cells
+
+def get_workbook_part(archive, relationship_suffix):
+    """
+    Return the zip path of a workbook-level part by relationship type suffix (e.g. '/sharedStrings'), or None.
+    """
+    for relationship_type, target in read_relationships(archive, get_workbook_path(archive)).values():
+        if relationship_type.endswith(relationship_suffix) and target in archive.NameToInfo:
+            return target
+    return None
+
+def read_shared_strings(archive, indices):
+    """
+    Read some entries of the shared strings table, streaming it only up to the last one needed.
+
+    Args:
+    - archive (zipfile.ZipFile): The open xlsx archive.
+    - indices (set): Indices of the strings to read.
+
+    Returns:
+    - dict: Index to string, as openpyxl reads it.
+    """
+    strings_path = get_workbook_part(archive, '/sharedStrings')
+    if not indices or strings_path is None:
+        return {}
+    strings = {}
+    last_index = max(indices)
+    index = 0
+    with archive.open(strings_path) as source:
+        for _, element in ET.iterparse(source):
+            if element.tag != f'{{{MAIN_NS}}}si':
+                continue
+            if index in indices:
+                strings[index] = Text.from_tree(element).content.replace('x005F_', '')
+            element.clear()
+            if index == last_index:
+                break
+            index += 1
+    return strings
+
+def read_date_styles(archive):
+    """
+    Find the cell styles whose number format displays dates, and the workbook's date system.
+
+    Returns:
+    - tuple: The set of style indices with a date format, and the epoch serial dates count from.
+    """
+    workbook = ET.fromstring(archive.read(get_workbook_path(archive)))
+    properties = workbook.find(f'{{{MAIN_NS}}}workbookPr')
+    date1904 = properties is not None and properties.get('date1904') in ('1', 'true')
+    epoch = CALENDAR_MAC_1904 if date1904 else CALENDAR_WINDOWS_1900
+
+    styles_path = get_workbook_part(archive, '/styles')
+    if styles_path is None:
+        return set(), epoch
+    styles = ET.fromstring(archive.read(styles_path))
+    formats = dict(BUILTIN_FORMATS)
+    for number_format in styles.iter(f'{{{MAIN_NS}}}numFmt'):
+        formats[int(number_format.get('numFmtId'))] = number_format.get('formatCode')
+    cell_formats = styles.find(f'{{{MAIN_NS}}}cellXfs')
+    date_styles = set()
+    for style_index, cell_format in enumerate(cell_formats if cell_formats is not None else []):
+        number_format = formats.get(int(cell_format.get('numFmtId', 0)))
+        if number_format and is_date_format(number_format):
+            date_styles.add(style_index)
+    return date_styles, epoch
+
+def decode_cell(cell_type, style_index, raw_value, shared_strings, date_styles, epoch):
+    """
+    Convert the raw value of a cell from `parse_row_fragment` to the value openpyxl reads.
+    """
+    if raw_value is None:
+        return None
+    if cell_type == 's':
+        return shared_strings.get(int(raw_value))
+    if cell_type == 'b':
+        return bool(int(raw_value))
+    if cell_type in ('str', 'inlineStr', 'e'):
+        return raw_value
+    if cell_type == 'd':
+        return datetime.datetime.fromisoformat(raw_value)
+    value = float(raw_value) if ('.' in raw_value or 'E' in raw_value or 'e' in raw_value) else int(raw_value)
+    if style_index in date_styles:
+        return from_excel(value, epoch)
+    return value
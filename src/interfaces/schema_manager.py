@@ -1,8 +1,42 @@
 import os
+import copy
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 import pandas as pd
 import pandera as pa
 from pandera import DataFrameSchema
 
+# Built-in checks whose outcome for a row only depends on that row, so they can run on row chunks
+ROW_PARTITIONABLE_CHECKS = {
+    'equal_to', 'not_equal_to', 'greater_than', 'greater_than_or_equal_to', 'less_than',
+    'less_than_or_equal_to', 'in_range', 'isin', 'notin', 'str_matches', 'str_contains',
+    'str_startswith', 'str_endswith', 'str_length',
+}
+
+# Executors available to the parallel validation mode
+VALIDATION_EXECUTORS = {'thread': ThreadPoolExecutor, 'process': ProcessPoolExecutor}
+
+def is_row_partitionable(check):
+    """
+    Check whether a Pandera check gives the same result on row chunks as on the whole frame.
+    """
+    return check.element_wise or check.name in ROW_PARTITIONABLE_CHECKS
+
+def validate_chunk(schema, chunk):
+    """
+    Validate a row chunk, collecting every failure.
+
+    Args:
+    - schema (DataFrameSchema): The schema restricted to row-partitionable checks.
+    - chunk (pd.DataFrame): Rows of the frame, with their original index.
+
+    Returns:
+    - tuple: The validated chunk (None if it failed) and the list of `SchemaError`s found.
+    """
+    try:
+        return schema.validate(chunk, lazy=True), []
+    except pa.errors.SchemaErrors as e:
+        return None, e.schema_errors
+
 class SchemaManager:
     def __init__(self, schema_path: str):
         """
@@ -54,12 +88,17 @@ class SchemaManager:
         except Exception as e:
             print(f"An error occurred while reading the schema: {e}")
 
-    def validate_data(self, dataframe: pd.DataFrame):
+    def validate_data(self, dataframe: pd.DataFrame, workers=1, chunk_rows=250_000, executor='thread'):
         """
         Validates the given DataFrame against the initialized schema.
 
         Args:
         - dataframe (pd.DataFrame): The DataFrame to validate.
+        - workers (int): Number of workers validating row chunks in parallel. With 1 worker, or a
+          frame of at most `chunk_rows` rows, the frame is validated in one call.
+        - chunk_rows (int): Number of rows per chunk in parallel mode.
+        - executor (str): 'thread' or 'process'. Processes sidestep the GIL but pickle every chunk
+          and require the schema's checks to be picklable.
 
         Returns:
         - pd.DataFrame: The validated DataFrame if successful, or None if validation fails.
@@ -67,7 +106,10 @@ class SchemaManager:
         if not self.schema:
             print("No schema initialized for validation.")
             return None
-        
+
+        if workers > 1 and len(dataframe) > chunk_rows:
+            return self.validate_chunks(dataframe, workers, chunk_rows, executor)
+
         try:
             validated_df = self.schema.validate(dataframe)
             print(f"Data validated successfully against schema '{self.schema_name}'.")
@@ -76,12 +118,83 @@ class SchemaManager:
             self.handle_validation_error(e)
             return None
 
+    def validate_chunks(self, dataframe, workers, chunk_rows, executor='thread'):
+        """
+        Validates the DataFrame in row chunks across a worker pool.
+
+        Chunks are validated against a copy of the schema keeping only row-partitionable checks
+        (see `ROW_PARTITIONABLE_CHECKS`). Uniqueness, schema-level checks and any other column
+        check need every row at once, so they run afterwards on the reassembled frame. Chunks keep
+        the frame's index, so the failure cases of every chunk and of the final pass are merged
+        into one report whose `index` column refers to rows of the whole frame.
+
+        Args:
+        - dataframe (pd.DataFrame): The DataFrame to validate.
+        - workers (int): Number of workers.
+        - chunk_rows (int): Number of rows per chunk.
+        - executor (str): 'thread' or 'process'.
+
+        Returns:
+        - pd.DataFrame: The validated DataFrame if successful, or None if validation fails.
+        """
+        if executor not in VALIDATION_EXECUTORS:
+            raise ValueError(f"Unsupported validation executor '{executor}'. Expected one of {sorted(VALIDATION_EXECUTORS)}.")
+
+        chunk_schema, full_frame_schema = self.split_schema()
+        chunks = [dataframe.iloc[start:start + chunk_rows] for start in range(0, len(dataframe), chunk_rows)]
+        with VALIDATION_EXECUTORS[executor](max_workers=min(workers, len(chunks))) as pool:
+            results = list(pool.map(validate_chunk, [chunk_schema] * len(chunks), chunks))
+
+        schema_errors = [error for _, chunk_errors in results for error in chunk_errors]
+        if schema_errors:
+            # The rows of failed chunks are not available validated, so the full-frame checks are skipped
+            self.handle_validation_error(pa.errors.SchemaErrors(self.schema, schema_errors, dataframe))
+            return None
+
+        validated_df = pd.concat([validated_chunk for validated_chunk, _ in results])
+        if full_frame_schema is not None:
+            _, schema_errors = validate_chunk(full_frame_schema, validated_df)
+            if schema_errors:
+                self.handle_validation_error(pa.errors.SchemaErrors(self.schema, schema_errors, dataframe))
+                return None
+
+        print(f"Data validated successfully against schema '{self.schema_name}' in {len(chunks)} chunks.")
+        return validated_df
+
+    def split_schema(self):
+        """
+        Split the schema into the part validated per row chunk and the part needing the whole frame.
+
+        Returns:
+        - tuple: The chunk schema, and a schema holding the uniqueness constraints, schema-level
+          checks and non-partitionable column checks (None if there are none).
+        """
+        chunk_schema = copy.deepcopy(self.schema)
+        chunk_schema.checks = []
+        chunk_schema.unique = None
+
+        full_frame_columns = {}
+        for name, column in chunk_schema.columns.items():
+            full_frame_checks = [check for check in column.checks if not is_row_partitionable(check)]
+            if full_frame_checks or column.unique:
+                # Types and nullability are already enforced by the chunk schema
+                full_frame_columns[name] = pa.Column(None, checks=full_frame_checks, nullable=True, unique=column.unique,
+                                                     report_duplicates=column.report_duplicates, regex=column.regex)
+            column.checks = [check for check in column.checks if is_row_partitionable(check)]
+            column.unique = False
+
+        if not (full_frame_columns or self.schema.checks or self.schema.unique):
+            return chunk_schema, None
+        full_frame_schema = DataFrameSchema(full_frame_columns, checks=self.schema.checks, unique=self.schema.unique,
+                                            report_duplicates=self.schema.report_duplicates)
+        return chunk_schema, full_frame_schema
+
     def handle_validation_error(self, error):
         """
         Handles validation errors and prints detailed information.
 
         Args:
-        - error (pa.errors.SchemaError): The schema validation error to handle.
+        - error (pa.errors.SchemaError | pa.errors.SchemaErrors): The schema validation error to handle.
         """
         print(f"Validation error for schema '{self.schema_name}': {error}")
         # Additional error handling logic can be added here
@@ -95,4 +208,15 @@ class SchemaManager:
         """
         return self.schema is not None
 
+    def get_column_dtypes(self):
+        """
+        Returns the declared dtype of each schema column.
+
+        Returns:
+        - dict: Column name to dtype string (e.g. {'Column1': 'int64', 'Column2': 'str'}), empty if no schema is initialized.
+        """
+        if not self.schema:
+            return {}
+        return {name: str(column.dtype) for name, column in self.schema.columns.items()}
+
     # Additional methods for schema management can be added here
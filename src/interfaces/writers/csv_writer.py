@@ -3,20 +3,109 @@ import pandas as pd
 from src.interfaces.writers.base_writer import BaseWriter
 import os
 
+# File extension appended to the output path for each supported compression codec
+COMPRESSION_EXTENSIONS = {
+    'gzip': '.gz',
+    'zstd': '.zst',
+}
+
+def has_zstandard():
+    """
+    Return whether the optional `zstandard` package, which pandas uses for zstd, is installed.
+    """
+    try:
+        import zstandard  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
 class CsvWriter(BaseWriter):
     """
     CSV file writer.
     """
 
-    def write(self, dataframe: pd.DataFrame, file_path: str) -> None:
+    def write(self, dataframe: pd.DataFrame, file_path: str, compression: str = None,
+              engine: str = 'pandas', chunk_size: int = None, compression_level: int = None) -> str:
         """
         Write data to a CSV file.
 
         Args:
         - dataframe (pd.DataFrame): The data to write.
         - file_path (str): The path where data should be written.
+        - compression (str, optional): 'gzip' or 'zstd' to stream compressed output. The matching
+          extension ('.gz' or '.zst') is appended to `file_path` if missing.
+        - engine (str): 'pandas' (default) or 'pyarrow'. The pyarrow engine converts values to text
+          in multithreaded C++ and is considerably faster on large frames.
+        - chunk_size (int, optional): Number of rows written per chunk, bounding the size of the
+          intermediate text buffers for large frames.
+        - compression_level (int, optional): Codec-specific compression level (pandas engine only;
+          pyarrow streams use the codec's default level).
+
+        Returns:
+        - str: The path of the written file.
         """
+        if compression is not None:
+            if compression not in COMPRESSION_EXTENSIONS:
+                raise ValueError(f"Unsupported CSV compression '{compression}'. Expected one of {list(COMPRESSION_EXTENSIONS)}.")
+            extension = COMPRESSION_EXTENSIONS[compression]
+            if not file_path.endswith(extension):
+                file_path = f"{file_path}{extension}"
+
         # Create the output directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        dataframe.to_csv(file_path, index=False)
+
+        if engine == 'pyarrow':
+            self.write_pyarrow(dataframe, file_path, compression, chunk_size, compression_level)
+        elif engine == 'pandas':
+            self.write_pandas(dataframe, file_path, compression, chunk_size, compression_level)
+        else:
+            raise ValueError(f"Unsupported CSV engine '{engine}'. Expected 'pandas' or 'pyarrow'.")
+
         print(f"Normalized data saved to {file_path}")
+        return file_path
+
+    def write_pandas(self, dataframe, file_path, compression=None, chunk_size=None, compression_level=None):
+        """
+        Write data with `DataFrame.to_csv`, streaming through the compression codec if requested.
+        pandas needs the optional `zstandard` package for zstd; without it, zstd output is streamed
+        through pyarrow's codec instead, at its default level.
+        """
+        if compression == 'zstd' and not has_zstandard():
+            import pyarrow as pa
+
+            if compression_level is not None:
+                print("zstandard is not installed, writing zstd at pyarrow's default level.")
+            with pa.CompressedOutputStream(file_path, 'zstd') as sink:
+                dataframe.to_csv(sink, index=False, chunksize=chunk_size)
+            return
+
+        compression_options = None
+        if compression is not None:
+            compression_options = {'method': compression}
+            if compression_level is not None:
+                compression_options['compresslevel' if compression == 'gzip' else 'level'] = compression_level
+        dataframe.to_csv(file_path, index=False, compression=compression_options, chunksize=chunk_size)
+
+    def write_pyarrow(self, dataframe, file_path, compression=None, chunk_size=None, compression_level=None):
+        """
+        Write data with pyarrow's CSV writer, one record batch of `chunk_size` rows at a time.
+        Falls back to pandas for frames that cannot be converted to Arrow (e.g. mixed-type object columns).
+        """
+        import pyarrow as pa
+        import pyarrow.csv as pacsv
+
+        try:
+            table = pa.Table.from_pandas(dataframe, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            print(f"Unable to convert data to Arrow for {file_path}, falling back to pandas: {e}")
+            self.write_pandas(dataframe, file_path, compression, chunk_size, compression_level)
+            return
+
+        if compression is not None:
+            sink = pa.CompressedOutputStream(file_path, compression)
+        else:
+            sink = pa.OSFile(file_path, 'wb')
+
+        with sink, pacsv.CSVWriter(sink, table.schema) as csv_writer:
+            for batch in table.to_batches(max_chunksize=chunk_size):
+                csv_writer.write_batch(batch)
@@ -1,15 +1,84 @@
 # src/pipelines/writers/duckdb_writer.py
 
+import os
+import shutil
+import tempfile
 import duckdb
+import pandas as pd
+
+# Write modes accepted by `DuckdbWriter.write`
+WRITE_MODES = {'upsert', 'diff'}
+
+# File written into every Parquet export, so a later export only ever replaces a directory it created
+EXPORT_MARKER = '.duckdb_parquet_export'
 
 class DuckdbWriter:
     def __init__(self):
-        pass
+        # Connections kept open between writes (see `open_connection`), keyed by database path
+        self.connections = {}
+        # Settings applied to every connection (see `configure`)
+        self.settings = {}
+
+    def configure(self, settings):
+        """
+        Set DuckDB settings (e.g. `memory_limit`, `threads`, `temp_directory`) applied to every
+        connection the writer opens, including connections already kept open.
+
+        Args:
+        - settings (dict): Setting name to value.
+        """
+        self.settings = dict(settings)
+        for conn in self.connections.values():
+            self.apply_settings(conn)
 
-    def write(self, normalized_data, db_path, schema, table_name, partition_columns):
+    def apply_settings(self, conn):
+        """
+        Apply the configured settings to a connection.
+        """
+        for name, value in self.settings.items():
+            conn.execute(f"SET {name} = ?", [value])
+
+    def open_connection(self, db_path):
+        """
+        Keep a connection to the database open and reuse it for every following write, instead of
+        connecting per write. Used by long-running processes such as the pipeline's watch mode.
+
+        Args:
+        - db_path (str): Path to the DuckDB database file.
+        """
+        if db_path not in self.connections:
+            self.connections[db_path] = duckdb.connect(db_path)
+            self.apply_settings(self.connections[db_path])
+
+    def close_connections(self):
+        """
+        Close the connections opened with `open_connection`.
+        """
+        for conn in self.connections.values():
+            conn.close()
+        self.connections = {}
+
+    def connect(self, db_path):
+        """
+        Return a connection to the database and whether it is a kept-open connection that must
+        not be closed after use.
+        """
+        if db_path in self.connections:
+            return self.connections[db_path], True
+        conn = duckdb.connect(db_path)
+        self.apply_settings(conn)
+        return conn, False
+
+    def write(self, normalized_data, db_path, schema, table_name, partition_columns, sort_by=None,
+              checkpoints=None, checkpoint_table='ingestion_checkpoints', write_mode='upsert', row_hash_column='row_hash'):
         """
         Perform an upsert operation to store the normalized data in a DuckDB schema and table,
-        partitioning by dynamic columns.
+        partitioning by dynamic columns. A batch may span several partitions (e.g. several sheets
+        concatenated by the pipeline's write buffer); each partition present in the batch is replaced.
+
+        Rows are inserted ordered by the sort key so that each partition lands in a contiguous
+        set of row groups, which lets DuckDB's min/max zonemaps skip row groups when queries
+        filter on those columns.
 
         Args:
         - normalized_data (pd.DataFrame): Normalized data.
@@ -17,42 +86,386 @@ class DuckdbWriter:
         - schema (str): The schema name (e.g., 'bronze', 'silver', 'gold').
         - table_name (str): The table name to write data to.
         - partition_columns (list): List of partition columns for managing data.
-        """
+        - sort_by (list, optional): Columns to order the inserted rows by. Defaults to the partition columns.
+        - checkpoints (pd.DataFrame, optional): Checkpoint entries appended to `schema.checkpoint_table`
+          in the same transaction as the data, so they are committed if and only if the data is.
+        - checkpoint_table (str): Table holding the checkpoint entries.
+        - write_mode (str): 'upsert' replaces every partition of the batch. 'diff' compares the batch
+          with the stored partitions by row hash: new rows are inserted, vanished rows are deleted and
+          unchanged rows are left untouched (keeping their original `created_time`). Requires partition
+          columns and a row hash column (see `normalize_data`).
+        - row_hash_column (str): Column holding the row hash, used by the diff write mode.
 
+        Returns:
+        - dict: In diff mode, the number of rows `inserted`, `deleted` and `unchanged`. None otherwise.
+        """
         # Connect to DuckDB
-        conn = duckdb.connect(db_path)
+        conn, persistent = self.connect(db_path)
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            counts = self.upsert(conn, normalized_data, schema, table_name, partition_columns, sort_by=sort_by,
+                                 checkpoints=checkpoints, checkpoint_table=checkpoint_table,
+                                 write_mode=write_mode, row_hash_column=row_hash_column)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            if not persistent:
+                conn.close()
+            raise
+
+        # Close the connection
+        if not persistent:
+            conn.close()
+        return counts
+
+    def upsert(self, conn, normalized_data, schema, table_name, partition_columns, sort_by=None,
+               checkpoints=None, checkpoint_table='ingestion_checkpoints', write_mode='upsert', row_hash_column='row_hash'):
+        """
+        Apply a batch to a table through an open connection, inside the caller's transaction. Used by
+        `write`, and by the writer service to group batches from several producers in one transaction.
+
+        Args: see `write`, with `conn` (duckdb.DuckDBPyConnection) in place of `db_path`.
+
+        Returns:
+        - dict: In diff mode, the number of rows `inserted`, `deleted` and `unchanged`. None otherwise.
+        """
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"Unsupported write mode '{write_mode}'. Expected one of {sorted(WRITE_MODES)}.")
+        if write_mode == 'diff':
+            if not partition_columns:
+                raise ValueError("The diff write mode requires partition columns.")
+            if row_hash_column not in normalized_data.columns:
+                raise ValueError(f"The diff write mode requires a '{row_hash_column}' column in the data.")
 
         # Add partition columns to the normalized data
         for col in partition_columns:
             if col not in normalized_data.columns:
                 normalized_data[col] = ""
 
+        # Columns holding only nulls (e.g. schema columns missing from an older file, see `normalize_data`)
+        # carry no type: DuckDB would read them as INTEGER. They are left out of the insert, so they are
+        # NULL in the table, and the column is added once a batch holds values for it
+        if len(normalized_data):
+            null_columns = [col for col in normalized_data.columns
+                            if col not in partition_columns and col != row_hash_column and normalized_data[col].isna().all()]
+            normalized_data = normalized_data.drop(columns=null_columns)
+
         # Create table if it doesn't exist
+        storage_select = self.build_storage_select(normalized_data)
         conn.execute(f"""
             CREATE TABLE IF NOT EXISTS {schema}.{table_name} AS 
-            SELECT * FROM normalized_data WHERE 1=0
+            {storage_select} WHERE 1=0
         """)
 
-        # Prepare the WHERE clause dynamically
-        where_clause = ' AND '.join([f"{col} = '{normalized_data[col][0]}'" for col in partition_columns])
+        # Add new columns and widen changed types so the batch fits the table
+        self.evolve_table(conn, normalized_data, schema, table_name)
+
+        if write_mode == 'diff':
+            counts = self.write_diff(conn, normalized_data, schema, table_name, partition_columns,
+                                     partition_columns if sort_by is None else sort_by, row_hash_column)
+            if checkpoints is not None:
+                self.append_rows(conn, schema, checkpoint_table, checkpoints)
+            print(f"Diff-wrote data into DuckDB table '{schema}.{table_name}' with partitions on {partition_columns}: "
+                  f"{counts['inserted']} inserted, {counts['deleted']} deleted, {counts['unchanged']} unchanged.")
+            return counts
 
         # Perform the upsert operation
-        # Step 1: Delete existing records for the same partition columns
+        # Step 1: Delete existing records for every partition present in the batch (plain append without partitions)
+        if partition_columns:
+            partition_list = ', '.join(f'"{col}"' for col in partition_columns)
+            where_clause = ' AND '.join(
+                f'{table_name}."{col}" IS NOT DISTINCT FROM batch_partitions."{col}"' for col in partition_columns
+            )
+            conn.execute(f"""
+                DELETE FROM {schema}.{table_name} 
+                USING (SELECT DISTINCT {partition_list} FROM normalized_data) AS batch_partitions
+                WHERE {where_clause}
+            """)
+
+        # Step 2: Insert new data, clustered by the sort key
+        order_by_clause = self.build_order_by_clause(partition_columns if sort_by is None else sort_by)
         conn.execute(f"""
-            DELETE FROM {schema}.{table_name} 
-            WHERE {where_clause}
+            INSERT INTO {schema}.{table_name} BY NAME
+            {storage_select}
+            {order_by_clause}
         """)
 
-        # Step 2: Insert new data
+        # Step 3: Log the written units, committed by the caller together with the data
+        if checkpoints is not None:
+            self.append_rows(conn, schema, checkpoint_table, checkpoints)
+
+        print(f"Upserted data into DuckDB table '{schema}.{table_name}' with partitions on {partition_columns}.")
+        return None
+
+    def evolve_table(self, conn, normalized_data, schema, table_name):
+        """
+        Evolve an existing table to fit a batch, inside the caller's transaction.
+
+        Columns of the batch missing from the table are added as nullable columns (a catalog change,
+        existing rows read them as NULL), and rows are inserted by column name, so table columns
+        missing from the batch are NULL too. When a column's type changes, the common supertype of the
+        stored and incoming types is the type DuckDB resolves for a UNION of both:
+        - If both types cast implicitly to it (e.g. BIGINT and DOUBLE), the column is altered in place
+          to the supertype, or left as is if it already is the supertype.
+        - Otherwise the types are incompatible (e.g. BIGINT and VARCHAR) and the column is altered in
+          place to VARCHAR, the only type every value can be rendered as.
+
+        Args:
+        - conn (duckdb.DuckDBPyConnection): Connection with an open transaction.
+        - normalized_data (pd.DataFrame): The batch to be written.
+        - schema (str): The schema name.
+        - table_name (str): The table name.
+        """
+        stored_types = dict(conn.execute(
+            "SELECT column_name, data_type FROM duckdb_columns() "
+            "WHERE database_name = current_database() AND schema_name = ? AND table_name = ?",
+            [schema, table_name],
+        ).fetchall())
+        incoming_types = {row[0]: row[1] for row in conn.execute(f"DESCRIBE {self.build_storage_select(normalized_data)}").fetchall()}
+
+        for col, incoming_type in incoming_types.items():
+            stored_type = stored_types.get(col)
+            if stored_type is None:
+                conn.execute(f'ALTER TABLE {schema}.{table_name} ADD COLUMN "{col}" {incoming_type}')
+                print(f"Added column '{col}' ({incoming_type}) to DuckDB table '{schema}.{table_name}'.")
+                continue
+            if stored_type == incoming_type:
+                continue
+
+            supertype = self.get_supertype(conn, stored_type, incoming_type)
+            # Values of any type are inserted into a VARCHAR column as text
+            if supertype == stored_type or (supertype is None and stored_type == 'VARCHAR'):
+                continue
+            if supertype is not None:
+                conn.execute(f'ALTER TABLE {schema}.{table_name} ALTER COLUMN "{col}" SET DATA TYPE {supertype}')
+                print(f"Widened column '{col}' of DuckDB table '{schema}.{table_name}' from {stored_type} to {supertype}.")
+            else:
+                conn.execute(f'ALTER TABLE {schema}.{table_name} ALTER COLUMN "{col}" SET DATA TYPE VARCHAR')
+                print(f"Altered column '{col}' of DuckDB table '{schema}.{table_name}' to VARCHAR: "
+                      f"stored type {stored_type} is incompatible with {incoming_type}.")
+
+    @staticmethod
+    def get_supertype(conn, stored_type, incoming_type):
+        """
+        Return the type DuckDB resolves for a UNION of both types, or None if either type does not
+        cast implicitly to it.
+        """
+        try:
+            supertype = conn.execute(
+                f"SELECT typeof(value) FROM (SELECT NULL::{stored_type} AS value UNION ALL SELECT NULL::{incoming_type}) LIMIT 1"
+            ).fetchone()[0]
+            compatible = conn.execute(
+                f"SELECT can_cast_implicitly(NULL::{stored_type}, NULL::{supertype}) "
+                f"AND can_cast_implicitly(NULL::{incoming_type}, NULL::{supertype})"
+            ).fetchone()[0]
+        except duckdb.Error:
+            return None
+        return supertype if compatible else None
+
+    def write_diff(self, conn, normalized_data, schema, table_name, partition_columns, sort_by, row_hash_column):
+        """
+        Apply a batch to the stored partitions it covers by row hash, inside the caller's transaction.
+
+        Duplicate rows (same partition and hash) are told apart by their occurrence number, so a
+        row repeated three times in storage and twice in the batch loses exactly one copy.
+
+        Args:
+        - conn (duckdb.DuckDBPyConnection): Connection with an open transaction.
+        - normalized_data (pd.DataFrame): The batch, with its partition columns.
+        - schema (str): The schema name.
+        - table_name (str): The table name.
+        - partition_columns (list): Columns scoping the comparison.
+        - sort_by (list): Columns to order the inserted rows by.
+        - row_hash_column (str): Column holding the row hash.
+
+        Returns:
+        - dict: The number of rows `inserted`, `deleted` and `unchanged`.
+        """
+        storage_select = self.build_storage_select(normalized_data)
+        partition_list = ', '.join(f'"{col}"' for col in partition_columns)
+        occurrence_window = f'row_number() OVER (PARTITION BY {partition_list}, "{row_hash_column}")'
+        match_clause = ' AND '.join(
+            [f'stored."{col}" IS NOT DISTINCT FROM incoming."{col}"' for col in partition_columns]
+            + [f'stored."{row_hash_column}" = incoming."{row_hash_column}"', 'stored.occurrence = incoming.occurrence']
+        )
+
+        # Number the stored and incoming rows of each (partition, hash)
+        conn.execute(f"""
+            CREATE OR REPLACE TEMP TABLE diff_incoming AS
+            SELECT *, {occurrence_window} AS occurrence FROM ({storage_select})
+        """)
+        partition_match = ' AND '.join(
+            f'{table_name}."{col}" IS NOT DISTINCT FROM batch_partitions."{col}"' for col in partition_columns
+        )
         conn.execute(f"""
-            INSERT INTO {schema}.{table_name} 
-            SELECT * FROM normalized_data
+            CREATE OR REPLACE TEMP TABLE diff_stored AS
+            SELECT {table_name}.rowid AS stored_rowid, {', '.join(f'{table_name}."{col}"' for col in partition_columns)},
+                   {table_name}."{row_hash_column}",
+                   row_number() OVER (PARTITION BY {', '.join(f'{table_name}."{col}"' for col in partition_columns)},
+                                      {table_name}."{row_hash_column}") AS occurrence
+            FROM {schema}.{table_name}
+            JOIN (SELECT DISTINCT {partition_list} FROM normalized_data) AS batch_partitions ON {partition_match}
         """)
 
-        print(f"Upserted data into DuckDB table '{schema}.{table_name}' with partitions on {partition_columns}.")
+        # Delete the stored rows missing from the batch
+        deleted = conn.execute(f"""
+            DELETE FROM {schema}.{table_name}
+            WHERE rowid IN (
+                SELECT stored_rowid FROM diff_stored AS stored
+                WHERE NOT EXISTS (SELECT 1 FROM diff_incoming AS incoming WHERE {match_clause})
+            )
+        """).fetchone()[0]
 
-        # Close the connection
-        conn.close()
+        # Insert the batch rows missing from storage, clustered by the sort key
+        order_by_clause = self.build_order_by_clause(sort_by)
+        inserted = conn.execute(f"""
+            INSERT INTO {schema}.{table_name} BY NAME
+            SELECT * EXCLUDE (occurrence) FROM diff_incoming AS incoming
+            WHERE NOT EXISTS (SELECT 1 FROM diff_stored AS stored WHERE {match_clause})
+            {order_by_clause}
+        """).fetchone()[0]
+        batch_rows = conn.execute("SELECT count(*) FROM diff_incoming").fetchone()[0]
+
+        # Temp tables created in the transaction are also discarded if it rolls back
+        conn.execute("DROP TABLE diff_incoming")
+        conn.execute("DROP TABLE diff_stored")
+
+        return {'inserted': inserted, 'deleted': deleted, 'unchanged': batch_rows - inserted}
+
+    @staticmethod
+    def append_rows(conn, schema, table_name, dataframe):
+        """
+        Append a DataFrame to a table through an open connection, creating the table from the
+        DataFrame's columns if it doesn't exist.
+        """
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {schema}.{table_name} AS SELECT * FROM dataframe WHERE 1=0")
+        conn.execute(f"INSERT INTO {schema}.{table_name} SELECT * FROM dataframe")
+
+    @staticmethod
+    def build_storage_select(dataframe, relation='normalized_data'):
+        """
+        Build the SELECT used to read a DataFrame into DuckDB with stable storage types.
+
+        Compacted frames hold categoricals and downcast numerics (see `compact_data` in the ingestion
+        pipeline). DuckDB would map these to ENUM, TINYINT or FLOAT columns that later batches may not
+        fit, so string categoricals are read as VARCHAR, integers as BIGINT and floats as DOUBLE.
+
+        Args:
+        - dataframe (pd.DataFrame): The data to be written.
+        - relation (str): Name under which the DataFrame is visible to DuckDB.
+
+        Returns:
+        - str: The SELECT statement.
+        """
+        casts = []
+        for col, dtype in dataframe.dtypes.items():
+            if isinstance(dtype, pd.CategoricalDtype) and pd.api.types.is_string_dtype(dtype.categories.dtype):
+                casts.append(f'CAST("{col}" AS VARCHAR) AS "{col}"')
+            elif pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < 8:
+                casts.append(f'CAST("{col}" AS BIGINT) AS "{col}"')
+            elif pd.api.types.is_float_dtype(dtype) and dtype.itemsize < 8:
+                casts.append(f'CAST("{col}" AS DOUBLE) AS "{col}"')
+
+        if not casts:
+            return f"SELECT * FROM {relation}"
+        replaced_columns = ', '.join(casts)
+        return f"SELECT * REPLACE ({replaced_columns}) FROM {relation}"
+
+    @staticmethod
+    def build_order_by_clause(sort_by):
+        """
+        Build the ORDER BY clause used to cluster inserted rows.
+
+        Args:
+        - sort_by (list): Columns to order by. An empty list disables ordering.
+
+        Returns:
+        - str: The ORDER BY clause, or an empty string.
+        """
+        if not sort_by:
+            return ""
+        return "ORDER BY " + ", ".join(f'"{col}"' for col in sort_by)
+
+    def export_parquet(self, db_path, schema, table_name, output_dir, partition_columns, sort_by=None):
+        """
+        Export a table to a hive-partitioned Parquet dataset (e.g. `output_dir/col=value/data_0.parquet`).
+
+        DuckDB can query the dataset with partition pruning through
+        `read_parquet('<output_dir>/**/*.parquet', hive_partitioning = true)`.
+
+        Args:
+        - db_path (str): Path to the DuckDB database file.
+        - schema (str): The schema name (e.g., 'bronze', 'silver', 'gold').
+        - table_name (str): The table name to export.
+        - output_dir (str): Root directory of the Parquet dataset. A previous export in it is replaced;
+          an existing directory that is not empty and was not written by an export is left untouched
+          and the export fails.
+        - partition_columns (list): Columns used as hive partition keys.
+        - sort_by (list, optional): Columns to order rows by within each file. Defaults to the partition columns.
+        """
+        output_dir = os.path.abspath(output_dir)
+        if os.path.isdir(output_dir) and os.listdir(output_dir) and not os.path.exists(os.path.join(output_dir, EXPORT_MARKER)):
+            raise ValueError(f"Refusing to replace '{output_dir}': it is not empty and does not hold a previous Parquet "
+                             f"export ({EXPORT_MARKER} is missing). Choose a dedicated export destination.")
+
+        # Export next to the destination, then swap it into place so the previous export is replaced as a whole
+        # and partitions deleted from the table do not linger on disk
+        parent_dir = os.path.dirname(output_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=f'.{os.path.basename(output_dir)}.', dir=parent_dir)
+        try:
+            self.copy_to_parquet(db_path, schema, table_name, staging_dir, partition_columns, sort_by)
+            with open(os.path.join(staging_dir, EXPORT_MARKER), 'w') as marker:
+                marker.write(f"{schema}.{table_name}\n")
+            self.replace_export(staging_dir, output_dir)
+        except BaseException:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        print(f"Exported DuckDB table '{schema}.{table_name}' to Parquet at '{output_dir}' partitioned by {partition_columns}.")
+
+    def copy_to_parquet(self, db_path, schema, table_name, output_dir, partition_columns, sort_by):
+        """
+        Write a table as Parquet into an empty directory.
+        """
+        conn, persistent = self.connect(db_path)
+
+        order_by_clause = self.build_order_by_clause(partition_columns if sort_by is None else sort_by)
+        options = "FORMAT PARQUET, OVERWRITE_OR_IGNORE"
+        if partition_columns:
+            partition_clause = ", ".join(f'"{col}"' for col in partition_columns)
+            options += f", PARTITION_BY ({partition_clause})"
+        else:
+            # Without partition keys, COPY writes a single file rather than a directory
+            output_dir = os.path.join(output_dir, f"{table_name}.parquet")
+
+        try:
+            conn.execute(f"""
+                COPY (SELECT * FROM {schema}.{table_name} {order_by_clause})
+                TO '{output_dir}' ({options})
+            """)
+        finally:
+            if not persistent:
+                conn.close()
+
+    @staticmethod
+    def replace_export(staging_dir, output_dir):
+        """
+        Move a staged export to its destination, removing the previous export only once it has
+        been moved aside. Only directories holding the export marker are ever removed.
+        """
+        previous_dir = None
+        if os.path.isdir(output_dir):
+            if os.listdir(output_dir):
+                previous_dir = tempfile.mkdtemp(prefix=f'.{os.path.basename(output_dir)}.previous.', dir=os.path.dirname(output_dir))
+                os.replace(output_dir, os.path.join(previous_dir, 'export'))
+            else:
+                os.rmdir(output_dir)
+        os.replace(staging_dir, output_dir)
+        if previous_dir is not None:
+            if os.path.exists(os.path.join(previous_dir, 'export', EXPORT_MARKER)):
+                shutil.rmtree(previous_dir)
+            else:
+                print(f"Kept the previous export at '{previous_dir}': it no longer holds {EXPORT_MARKER}.")
 
     def delete_tables(self, db_path, schema, tables):
         """
@@ -65,7 +478,7 @@ class DuckdbWriter:
         """
 
         # Connect to DuckDB
-        conn = duckdb.connect(db_path)
+        conn, persistent = self.connect(db_path)
 
         for table in tables:
             try:
@@ -74,4 +487,5 @@ class DuckdbWriter:
             except Exception as e:
                 print(f"Error deleting table '{schema}.{table}': {e}")
 
-        conn.close()
+        if not persistent:
+            conn.close()
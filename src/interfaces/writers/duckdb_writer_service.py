@@ -0,0 +1,376 @@
+# src/interfaces/writers/duckdb_writer_service.py
+
+import os
+import queue
+import argparse
+import itertools
+import secrets
+import threading
+import time
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+import pyarrow as pa
+from src.interfaces.writers.duckdb_writer import DuckdbWriter
+
+# Requests accepted by the service; only writes are grouped into shared transactions
+SERVICE_OPERATIONS = {'write', 'export_parquet', 'delete_tables'}
+
+def get_authkey_path(address):
+    """
+    Path of the file holding the key the service at `address` generated for its producers.
+    """
+    return f"{address}.key"
+
+def read_authkey(address):
+    """
+    Read the key generated by the service at `address`.
+    """
+    authkey_path = get_authkey_path(address)
+    if not os.path.exists(authkey_path):
+        raise FileNotFoundError(f"No authkey given and no key file found at {authkey_path}. Is the DuckDB writer service running?")
+    with open(authkey_path, 'rb') as file:
+        return file.read()
+
+def encode_dataframe(dataframe):
+    """
+    Serialize a DataFrame as an Arrow IPC stream.
+    """
+    table = pa.Table.from_pandas(dataframe, preserve_index=False)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as stream:
+        stream.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+def decode_dataframe(payload):
+    """
+    Read a DataFrame from an Arrow IPC stream.
+    """
+    return pa.ipc.open_stream(payload).read_all().to_pandas()
+
+class DuckdbWriterService:
+    """
+    Single writer process for a DuckDB database.
+
+    DuckDB allows one writer process per database file, so concurrent pipelines cannot write to the
+    same destination. The service owns the only connection, listens on a Unix socket for requests
+    from any number of producer processes (see `DuckdbWriterClient`), and applies them one after
+    another with `DuckdbWriter.upsert`. Writes that arrive together are grouped into one transaction;
+    each producer receives an acknowledgement once its batch is committed, or the error if it fails.
+
+    Producers must authenticate, as requests are unpickled. Without a configured authkey, the service
+    generates one and writes it next to the socket (see `get_authkey_path`), readable by its owner only,
+    like the socket itself.
+    """
+
+    def __init__(self, db_path, address, authkey=None, max_group_batches=32, max_group_rows=1_000_000, group_wait=0.05):
+        """
+        Initializes the DuckdbWriterService.
+
+        Args:
+        - db_path (str): Path to the DuckDB database file owned by the service.
+        - address (str): Path of the Unix socket to listen on.
+        - authkey (bytes, optional): Key producers must present to connect. Generated if not set.
+        - max_group_batches (int): Maximum number of batches committed in one transaction.
+        - max_group_rows (int): Stop adding batches to a transaction once it holds this many rows.
+        - group_wait (float): Seconds to wait for further batches after the first one of a transaction.
+        """
+        self.db_path = db_path
+        self.address = address
+        self.authkey = authkey
+        # Whether the key was generated by this service, and written for its producers
+        self.generated_authkey = authkey is None
+        self.max_group_batches = max_group_batches
+        self.max_group_rows = max_group_rows
+        self.group_wait = group_wait
+        self.writer = DuckdbWriter()
+        self.requests = queue.Queue()
+        self.stopped = threading.Event()
+        self.listener = None
+        self.threads = []
+        # Number of transactions committed, for monitoring and tests
+        self.transactions = 0
+
+    def start(self):
+        """
+        Open the database and start accepting producers in background threads.
+        """
+        for path in (self.address, get_authkey_path(self.address)):
+            if os.path.exists(path):
+                # Left over by a service that did not shut down cleanly
+                os.remove(path)
+        if self.generated_authkey:
+            self.authkey = secrets.token_bytes(32)
+            self.write_authkey()
+        self.writer.open_connection(self.db_path)
+        self.listener = Listener(self.address, family='AF_UNIX', authkey=self.authkey)
+        os.chmod(self.address, 0o600)
+        self.threads = [
+            threading.Thread(target=self.accept_producers, name='duckdb-service-accept', daemon=True),
+            threading.Thread(target=self.process_requests, name='duckdb-service-writer', daemon=True),
+        ]
+        for thread in self.threads:
+            thread.start()
+        print(f"DuckDB writer service for {self.db_path} listening on {self.address}.")
+
+    def write_authkey(self):
+        """
+        Write the generated key for producers, creating the file with owner-only permissions.
+        """
+        fd = os.open(get_authkey_path(self.address), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as file:
+            file.write(self.authkey)
+
+    def serve_forever(self):
+        """
+        Run the service until interrupted.
+        """
+        self.start()
+        try:
+            while not self.stopped.wait(1.0):
+                pass
+        except KeyboardInterrupt:
+            print("Stopping the DuckDB writer service.")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """
+        Stop accepting producers, finish the queued requests and close the database.
+        """
+        if self.stopped.is_set():
+            return
+        self.stopped.set()
+        # Wake up the accept loop with a connection of our own
+        try:
+            Client(self.address, family='AF_UNIX', authkey=self.authkey).close()
+        except OSError:
+            pass
+        for thread in self.threads:
+            thread.join()
+        self.listener.close()
+        self.writer.close_connections()
+        if self.generated_authkey and os.path.exists(get_authkey_path(self.address)):
+            os.remove(get_authkey_path(self.address))
+
+    def accept_producers(self):
+        """
+        Accept producer connections, reading each one in its own thread.
+        """
+        while not self.stopped.is_set():
+            try:
+                conn = self.listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                # Producers that disconnect or fail authentication
+                continue
+            if self.stopped.is_set():
+                conn.close()
+                break
+            threading.Thread(target=self.receive_requests, args=(conn,), name='duckdb-service-producer', daemon=True).start()
+
+    def receive_requests(self, conn):
+        """
+        Queue the requests of one producer until it disconnects. A request is a header dictionary
+        followed by one Arrow IPC payload per name listed in its `payloads`.
+        """
+        while True:
+            try:
+                header = conn.recv()
+                payloads = {name: conn.recv_bytes() for name in header.get('payloads', [])}
+            except (EOFError, OSError):
+                conn.close()
+                return
+            self.requests.put((conn, header, payloads))
+
+    def process_requests(self):
+        """
+        Apply the queued requests in arrival order, grouping consecutive writes into transactions.
+        """
+        while not (self.stopped.is_set() and self.requests.empty()):
+            try:
+                group = [self.requests.get(timeout=0.1)]
+            except queue.Empty:
+                continue
+
+            if group[0][1].get('operation') == 'write':
+                rows = group[0][1].get('rows', 0)
+                deadline = time.monotonic() + self.group_wait
+                while len(group) < self.max_group_batches and rows < self.max_group_rows:
+                    try:
+                        request = self.requests.get(timeout=max(deadline - time.monotonic(), 0))
+                    except queue.Empty:
+                        break
+                    group.append(request)
+                    if request[1].get('operation') != 'write':
+                        break
+                    rows += request[1].get('rows', 0)
+
+            writes = []
+            for request in group:
+                if request[1].get('operation') == 'write':
+                    writes.append(request)
+                    continue
+                # Other operations run on their own, after the writes received before them
+                self.apply_writes(writes)
+                writes = []
+                self.apply_operation(request)
+            self.apply_writes(writes)
+
+    def apply_writes(self, requests):
+        """
+        Commit a group of writes in one transaction and acknowledge each of them. If the group fails,
+        each write is retried in its own transaction, so only the failing batches are rejected.
+        """
+        if not requests:
+            return
+        conn, _ = self.writer.connect(self.db_path)
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            results = [self.upsert(conn, header, payloads) for _, header, payloads in requests]
+            conn.execute("COMMIT")
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            if len(requests) > 1:
+                for request in requests:
+                    self.apply_writes([request])
+                return
+            self.acknowledge(requests[0], error=e)
+            return
+
+        self.transactions += 1
+        for request, result in zip(requests, results):
+            self.acknowledge(request, result=result)
+
+    def upsert(self, conn, header, payloads):
+        """
+        Apply one write request through `DuckdbWriter.upsert`.
+        """
+        if os.path.abspath(header['db_path']) != os.path.abspath(self.db_path):
+            raise ValueError(f"This service writes to {self.db_path}, not {header['db_path']}.")
+        checkpoints = decode_dataframe(payloads['checkpoints']) if 'checkpoints' in payloads else None
+        return self.writer.upsert(conn, decode_dataframe(payloads['batch']), header['schema'], header['table_name'],
+                                  header['partition_columns'], checkpoints=checkpoints, **header['options'])
+
+    def apply_operation(self, request):
+        """
+        Run a request other than a write (e.g. `delete_tables`) with the service's writer.
+        """
+        _, header, _ = request
+        try:
+            if header.get('operation') not in SERVICE_OPERATIONS:
+                raise ValueError(f"Unsupported operation '{header.get('operation')}'. Expected one of {sorted(SERVICE_OPERATIONS)}.")
+            if os.path.abspath(header['db_path']) != os.path.abspath(self.db_path):
+                raise ValueError(f"This service writes to {self.db_path}, not {header['db_path']}.")
+            result = getattr(self.writer, header['operation'])(self.db_path, *header['args'], **header['options'])
+        except Exception as e:
+            self.acknowledge(request, error=e)
+            return
+        self.acknowledge(request, result=result)
+
+    @staticmethod
+    def acknowledge(request, result=None, error=None):
+        """
+        Send the outcome of a request back to its producer.
+        """
+        conn, header, _ = request
+        ack = {'request_id': header.get('request_id'), 'status': 'ok' if error is None else 'error', 'result': result}
+        if error is not None:
+            ack['error'] = f"{type(error).__name__}: {error}"
+        try:
+            conn.send(ack)
+        except OSError:
+            print(f"Producer disconnected before request {header.get('request_id')} was acknowledged.")
+
+class DuckdbWriterClient:
+    """
+    Writer used by producer processes to write through a `DuckdbWriterService`. It has the same
+    methods and signatures as `DuckdbWriter`; each call blocks until the service acknowledges it.
+    """
+
+    def __init__(self, address, authkey=None):
+        """
+        Initializes the DuckdbWriterClient.
+
+        Args:
+        - address (str): Path of the service's Unix socket.
+        - authkey (bytes, optional): Key configured on the service. Defaults to the key the service
+          generated, read from the file next to its socket.
+        """
+        self.address = address
+        self.authkey = authkey
+        self.conn = None
+        self.request_ids = itertools.count()
+
+    def request(self, header, payloads=None):
+        """
+        Send a request to the service and wait for its acknowledgement.
+
+        Returns:
+        - object: The result returned by the service.
+        """
+        if self.conn is None:
+            authkey = self.authkey if self.authkey is not None else read_authkey(self.address)
+            self.conn = Client(self.address, family='AF_UNIX', authkey=authkey)
+        payloads = payloads or {}
+        header = {**header, 'request_id': next(self.request_ids), 'payloads': list(payloads)}
+        self.conn.send(header)
+        for payload in payloads.values():
+            self.conn.send_bytes(payload)
+
+        ack = self.conn.recv()
+        if ack['status'] != 'ok':
+            raise RuntimeError(f"DuckDB writer service failed the {header['operation']} request: {ack['error']}")
+        return ack['result']
+
+    def write(self, normalized_data, db_path, schema, table_name, partition_columns, sort_by=None,
+              checkpoints=None, checkpoint_table='ingestion_checkpoints', write_mode='upsert', row_hash_column='row_hash'):
+        """
+        Write a batch through the service. See `DuckdbWriter.write`.
+        """
+        payloads = {'batch': encode_dataframe(normalized_data)}
+        if checkpoints is not None:
+            payloads['checkpoints'] = encode_dataframe(checkpoints)
+        header = {
+            'operation': 'write',
+            'db_path': db_path,
+            'schema': schema,
+            'table_name': table_name,
+            'partition_columns': list(partition_columns),
+            'rows': len(normalized_data),
+            'options': {'sort_by': sort_by, 'checkpoint_table': checkpoint_table,
+                        'write_mode': write_mode, 'row_hash_column': row_hash_column},
+        }
+        result = self.request(header, payloads)
+        print(f"Wrote {len(normalized_data)} rows to '{schema}.{table_name}' through the DuckDB writer service.")
+        return result
+
+    def export_parquet(self, db_path, schema, table_name, output_dir, partition_columns, sort_by=None):
+        """
+        Export a table to Parquet from the service. See `DuckdbWriter.export_parquet`.
+        """
+        return self.request({'operation': 'export_parquet', 'db_path': db_path,
+                             'args': [schema, table_name, output_dir, partition_columns], 'options': {'sort_by': sort_by}})
+
+    def delete_tables(self, db_path, schema, tables):
+        """
+        Delete tables through the service. See `DuckdbWriter.delete_tables`.
+        """
+        return self.request({'operation': 'delete_tables', 'db_path': db_path, 'args': [schema, tables], 'options': {}})
+
+    def close(self):
+        """
+        Disconnect from the service.
+        """
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run a single-writer service for a DuckDB database.')
+    parser.add_argument('--db-path', type=str, required=True, help='Path to the DuckDB database file.')
+    parser.add_argument('--address', type=str, required=True, help='Path of the Unix socket to listen on.')
+    parser.add_argument('--authkey', type=str, help='Key producers must present to connect. Generated and written next to the socket if not set.')
+    parser.add_argument('--max-group-batches', type=int, default=32, help='Maximum batches committed in one transaction.')
+    parser.add_argument('--group-wait', type=float, default=0.05, help='Seconds to wait for more batches before committing.')
+    args = parser.parse_args()
+    DuckdbWriterService(args.db_path, args.address, authkey=args.authkey.encode() if args.authkey else None,
+                        max_group_batches=args.max_group_batches, group_wait=args.group_wait).serve_forever()
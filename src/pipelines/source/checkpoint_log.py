@@ -0,0 +1,135 @@
+# src/pipelines/source/checkpoint_log.py
+import uuid
+from abc import ABC, abstractmethod
+import pandas as pd
+from src.pipelines.source.log_store import DuckdbLogStore, FileLogStore
+
+# Columns of a checkpoint entry, one entry per (file, sheet) unit of a run
+CHECKPOINT_COLUMNS = ['run_id', 'pipeline', 'source_filepath', 'source_sheetname', 'status', 'rows_written', 'recorded_at']
+
+def new_run_id():
+    """
+    Return a new unique run identifier.
+    """
+    return uuid.uuid4().hex
+
+class CheckpointLog(ABC):
+    """
+    Log of the (file, sheet) units completed by pipeline runs, used to resume a failed run
+    without redoing the units it already wrote.
+    """
+
+    def __init__(self, pipeline, run_id=None):
+        """
+        Initializes the CheckpointLog.
+
+        Args:
+        - pipeline (str): Pipeline name from the configuration, scoping the log entries.
+        - run_id (str, optional): Identifier of the current run. Defaults to a new run id.
+        """
+        self.pipeline = pipeline
+        self.run_id = run_id or new_run_id()
+
+    def build_checkpoints(self, dataframe, status='completed'):
+        """
+        Build the checkpoint entries for the units contained in a batch of validated data.
+
+        Args:
+        - dataframe (pd.DataFrame): Batch with `source_filepath` and `source_sheetname` columns.
+        - status (str): Status recorded for every unit.
+
+        Returns:
+        - pd.DataFrame: One entry per (file, sheet) with the number of rows written.
+        """
+        units = (dataframe.groupby(['source_filepath', 'source_sheetname'], observed=True, sort=False)
+                 .size().reset_index(name='rows_written'))
+        return self.build_entries(
+            zip(units['source_filepath'].astype(str), units['source_sheetname'].astype(str), units['rows_written']),
+            status,
+        )
+
+    def build_entries(self, units, status):
+        """
+        Build checkpoint entries from (file, sheet, rows written) tuples.
+        """
+        entries = pd.DataFrame(list(units), columns=['source_filepath', 'source_sheetname', 'rows_written'])
+        entries.insert(0, 'run_id', self.run_id)
+        entries.insert(1, 'pipeline', self.pipeline)
+        entries.insert(4, 'status', status)
+        entries['rows_written'] = entries['rows_written'].astype('int64')
+        entries['recorded_at'] = pd.Timestamp.now()
+        return entries[CHECKPOINT_COLUMNS]
+
+    def start_run(self):
+        """
+        Record the start of a new run, so a run that fails before writing anything is still the
+        most recent run (and resuming it redoes everything instead of continuing an older run).
+        """
+        self.record(self.build_entries([('', '', 0)], 'started'))
+
+    def resume_latest_run(self):
+        """
+        Continue the pipeline's most recent run, if any, so its completed units are skipped. The
+        most recent run is the one with the latest entry, including its `started` entry.
+
+        Returns:
+        - set: (file, sheet) pairs completed by the resumed run.
+        """
+        entries = self.read()
+        if entries.empty:
+            print(f"No previous run found for pipeline '{self.pipeline}', starting a new run {self.run_id}.")
+            return set()
+
+        self.run_id = entries.sort_values('recorded_at')['run_id'].iloc[-1]
+        completed = entries[(entries['run_id'] == self.run_id) & (entries['status'] == 'completed')]
+        print(f"Resuming run {self.run_id}: {len(completed)} sheets already completed.")
+        return set(zip(completed['source_filepath'], completed['source_sheetname']))
+
+    @abstractmethod
+    def read(self):
+        """
+        Return the pipeline's checkpoint entries as a DataFrame with `CHECKPOINT_COLUMNS`.
+        """
+        pass
+
+    @abstractmethod
+    def record(self, entries):
+        """
+        Append checkpoint entries outside of a data write (e.g. sheets that failed validation).
+        """
+        pass
+
+class DuckdbCheckpointLog(CheckpointLog):
+    """
+    Checkpoint log stored in a table next to the target table. `DuckdbWriter.write` inserts the
+    entries in the same transaction as the data, so a unit is logged if and only if it was written.
+    """
+
+    def __init__(self, pipeline, db_path, schema, table_name='ingestion_checkpoints', run_id=None):
+        super().__init__(pipeline, run_id)
+        self.table_name = table_name
+        self.store = DuckdbLogStore(db_path, schema, table_name, CHECKPOINT_COLUMNS)
+
+    def read(self):
+        return self.store.read(self.pipeline)
+
+    def record(self, entries):
+        self.store.append(entries)
+
+class FileCheckpointLog(CheckpointLog):
+    """
+    Checkpoint log stored as a JSON Lines file, for file-based writers. Entries are appended after
+    each output file is written; since the writers overwrite whole files, redoing a unit whose
+    entry was lost in a crash is harmless.
+    """
+
+    def __init__(self, pipeline, path, run_id=None):
+        super().__init__(pipeline, run_id)
+        self.store = FileLogStore(path, CHECKPOINT_COLUMNS,
+                                  text_columns=['run_id', 'pipeline', 'source_filepath', 'source_sheetname'])
+
+    def read(self):
+        return self.store.read(self.pipeline)
+
+    def record(self, entries):
+        self.store.append(entries)
@@ -1,9 +1,24 @@
 # excel_ingestion_process.py
+import os
+import time
+import functools
 import importlib
 import yaml
 import argparse
+import numpy as np
 import pandas as pd
 from src.interfaces.schema_manager import SchemaManager
+from src.interfaces.writers.duckdb_writer_service import DuckdbWriterClient
+from src.pipelines.source.checkpoint_log import DuckdbCheckpointLog, FileCheckpointLog
+from src.pipelines.source.file_watcher import FileWatcher
+from src.pipelines.source.resource_budget import LoadGovernor, ResourceBudget, estimate_source_memory
+from src.pipelines.source.sheet_dedup import DuckdbSheetIndex, FileSheetIndex
+from src.pipelines.source.source_planner import estimate_source_cost, format_plan, plan_source_files
+from src.pipelines.source.staged_executor import Stage, StagedExecutor
+from src.pipelines.source.write_buffer import WriteBuffer
+
+# Columns added to every row by `normalize_data`, excluded from the row hash
+METADATA_COLUMNS = ('source_filepath', 'source_sheetname', 'created_time')
 
 def load_config(config_path):
     """
@@ -19,7 +34,7 @@ def dynamic_import(module_name, class_name):
     module = importlib.import_module(module_name)
     return getattr(module, class_name)
 
-def normalize_data(file_path, sheet_name, sheet_data, schema_columns):
+def normalize_data(file_path, sheet_name, sheet_data, schema_columns, created_time=None, compact=False, row_hash=False):
     """
     Normalize data for a specific sheet based on schema.
 
@@ -28,6 +43,12 @@ def normalize_data(file_path, sheet_name, sheet_data, schema_columns):
     - sheet_name (str): Sheet name being processed.
     - sheet_data (pd.DataFrame): DataFrame containing sheet data.
     - schema_columns (list): List of schema columns to normalize against.
+    - created_time (pd.Timestamp, optional): Load timestamp broadcast to every row. Defaults to now;
+      the pipeline passes one timestamp per run.
+    - compact (bool): Store `source_filepath` and `source_sheetname` as single-category categoricals
+      (one byte per row) instead of repeating the strings on every row.
+    - row_hash (bool): Add a `row_hash` column (unsigned 64-bit) hashing each row's schema columns,
+      excluding the metadata columns, used by the DuckDB writer's diff write mode.
 
     Returns:
     - normalized_data (pd.DataFrame): DataFrame containing normalized data.
@@ -44,87 +65,678 @@ def normalize_data(file_path, sheet_name, sheet_data, schema_columns):
             normalized_df[col] = None
 
     # Add metadata columns for tracking the file and sheet names
-    normalized_df['source_filepath'] = file_path
-    normalized_df['source_sheetname'] = sheet_name
-    normalized_df['created_time'] = pd.Timestamp.now()
+    if compact:
+        codes = np.zeros(len(normalized_df), dtype='int8')
+        normalized_df['source_filepath'] = pd.Categorical.from_codes(codes, categories=[str(file_path)])
+        normalized_df['source_sheetname'] = pd.Categorical.from_codes(codes, categories=[str(sheet_name)])
+    else:
+        normalized_df['source_filepath'] = file_path
+        normalized_df['source_sheetname'] = sheet_name
+    normalized_df['created_time'] = pd.Timestamp.now() if created_time is None else created_time
+
+    if row_hash:
+        data_columns = [col for col in schema_columns if col not in METADATA_COLUMNS]
+        normalized_df['row_hash'] = pd.util.hash_pandas_object(normalized_df[data_columns], index=False)
 
     return normalized_df
 
-def ingest_pipeline(config_path, overwrite=False):
+def compact_data(dataframe, schema):
+    """
+    Reduce the memory footprint of validated data before it is buffered and written.
+
+    Integer and float columns declared in the schema are downcast to the smallest type that holds
+    their values exactly, and `created_time` (a single timestamp per run) becomes a categorical.
+    Writers widen these columns back to their storage types (see `DuckdbWriter.build_storage_select`).
+
+    Args:
+    - dataframe (pd.DataFrame): Data already validated against the schema.
+    - schema (DataFrameSchema): The Pandera schema the data was validated against.
+
+    Returns:
+    - pd.DataFrame: The compacted DataFrame.
+    """
+    compacted_df = dataframe.copy(deep=False)
+
+    for col, column_schema in schema.columns.items():
+        if col not in compacted_df.columns:
+            continue
+        declared_dtype = str(column_schema.dtype)
+        series = compacted_df[col]
+        if declared_dtype.startswith('int') and pd.api.types.is_integer_dtype(series.dtype):
+            compacted_df[col] = pd.to_numeric(series, downcast='integer')
+        elif declared_dtype.startswith('float') and series.dtype == 'float64':
+            downcast = series.astype('float32')
+            # Only keep float32 when every value survives the round trip
+            if (downcast.astype('float64') == series).where(series.notna(), True).all():
+                compacted_df[col] = downcast
+
+    if 'created_time' in compacted_df.columns and not isinstance(compacted_df['created_time'].dtype, pd.CategoricalDtype):
+        compacted_df['created_time'] = compacted_df['created_time'].astype('category')
+
+    return compacted_df
+
+def memory_usage_mb(dataframe):
+    """
+    Return the deep in-memory size of a DataFrame in megabytes.
+    """
+    return dataframe.memory_usage(deep=True).sum() / (1024 * 1024)
+
+def get_destination_key(writer_type, writer_config, source_file):
+    """
+    Determine where a validated sheet will be written, used to group buffered frames.
+
+    Args:
+    - writer_type (str): The target writer type (e.g. 'csv', 'duckdb').
+    - writer_config (dict): The target's writer configuration.
+    - source_file (dict): The source file entry from the pipeline configuration.
+
+    Returns:
+    - str: The output file path for file-based writers, or the fully qualified table name for DuckDB.
+    """
+    if writer_type == 'duckdb':
+        return f"{writer_config['namespace']}.{writer_config['table_name']}"
+    return f"{writer_config['destination']}/{source_file['file_name']}.csv"
+
+def write_batch(writer, writer_type, writer_config, destination_key, dataframe, checkpoint_log=None, sheet_index=None):
+    """
+    Write a (possibly concatenated) batch of validated data with the configured writer.
+
+    Args:
+    - writer (object): The writer instance.
+    - writer_type (str): The target writer type (e.g. 'csv', 'duckdb').
+    - writer_config (dict): The target's writer configuration.
+    - destination_key (str): Destination returned by `get_destination_key`.
+    - dataframe (pd.DataFrame): The data to write.
+    - checkpoint_log (CheckpointLog, optional): Log recording the (file, sheet) units of the batch
+      as completed. DuckDB commits the entries in the same transaction as the data.
+    - sheet_index (SheetIndex, optional): Dedup index recording the content of the written sheets.
+    """
+    checkpoints = checkpoint_log.build_checkpoints(dataframe) if checkpoint_log is not None else None
+
+    if writer_type == 'duckdb':
+        # Extract specific DuckDB writer parameters
+        db_path = writer_config['destination']
+        namespace = writer_config['namespace']
+        table_name = writer_config['table_name']
+        partition_columns = writer_config.get('partition_by', [])
+        sort_by = writer_config.get('sort_by')
+        write_mode = writer_config.get('write_mode', 'upsert')
+
+        # Call the write method for DuckDB writer
+        if checkpoints is not None:
+            writer.write(dataframe, db_path, namespace, table_name, partition_columns, sort_by=sort_by,
+                         checkpoints=checkpoints, checkpoint_table=checkpoint_log.table_name, write_mode=write_mode)
+        else:
+            writer.write(dataframe, db_path, namespace, table_name, partition_columns, sort_by=sort_by, write_mode=write_mode)
+
+    else:
+        # Handle other writer types, e.g., CSV, forwarding optional output settings
+        writer.write(
+            dataframe,
+            destination_key,
+            compression=writer_config.get('compression'),
+            engine=writer_config.get('engine', 'pandas'),
+            chunk_size=writer_config.get('chunk_size'),
+            compression_level=writer_config.get('compression_level'),
+        )
+        if checkpoints is not None:
+            checkpoint_log.record(checkpoints)
+
+    if sheet_index is not None:
+        sheet_index.record_written(dataframe)
+
+def get_projection(schema_manager):
+    """
+    Derive the columns and dtype hints pushed down into the loaders from the target schema.
+
+    Only string columns get a dtype hint: parsing them as text is always safe, while a numeric hint
+    would make the whole sheet fail to load on a single malformed cell instead of failing validation.
+
+    Args:
+    - schema_manager (SchemaManager): Schema manager for the target schema.
+
+    Returns:
+    - dict: `columns` and `dtypes` keyword arguments for `load_source_file`.
+    """
+    column_dtypes = schema_manager.get_column_dtypes()
+    return {
+        'columns': list(column_dtypes),
+        'dtypes': {column: str for column, dtype in column_dtypes.items() if dtype == 'str'},
+    }
+
+def load_source_file(loader_dict, source_file, columns=None, dtypes=None):
+    """
+    Load the configured sheets of a source file.
+
+    Args:
+    - loader_dict (dict): Loader instances keyed by file type.
+    - source_file (dict): The source file entry from the pipeline configuration.
+    - columns (list, optional): Columns to parse, pushed down into the loader so that columns
+      outside the target schema are never parsed.
+    - dtypes (dict, optional): Column dtype hints pushed down into the loader.
+
+    Returns:
+    - tuple: The source file entry and a dictionary of sheet name to loaded DataFrame.
+    """
+    file_path = source_file['path']
+    loader_config = source_file.get('loader_config') or {}
+    # Single-table sources (e.g. CSV) may omit tab_names
+    sheet_names = loader_config.get('tab_names')
+    loader = loader_dict[source_file['file_type']]
+
+    # Any other loader_config entries (e.g. `engine`) are forwarded as loader options
+    loader_options = {key: value for key, value in loader_config.items() if key != 'tab_names'}
+
+    # Load the data for the current file
+    data = loader.load(file_path, sheet_names=sheet_names, columns=columns, dtypes=dtypes, **loader_options)
+    return source_file, data
+
+def transform_source_data(schema_manager, loaded_source, created_time=None, compact=False, report_memory=False, row_hash=False,
+                          validation_options=None):
+    """
+    Normalize and validate every loaded sheet of a source file.
+
+    Args:
+    - schema_manager (SchemaManager): Schema manager for the target schema.
+    - loaded_source (tuple): Output of `load_source_file`.
+    - created_time (pd.Timestamp, optional): Load timestamp shared by every sheet of the run.
+    - compact (bool): Use compact metadata and downcast validated data.
+    - report_memory (bool): Print the memory used by each sheet after loading, normalization and compaction.
+    - row_hash (bool): Add the `row_hash` column to the normalized data.
+    - validation_options (dict, optional): Parallel validation options (`workers`, `chunk_rows`,
+      `executor`) forwarded to `SchemaManager.validate_data`.
+
+    Returns:
+    - tuple: The source file entry and a list of (sheet name, validated DataFrame) pairs. The
+      DataFrame is None for sheets that failed validation.
+    """
+    source_file, data = loaded_source
+    validated_sheets = []
+
+    # Process each sheet separately
+    for sheet_name, sheet_data in data.items():
+        # Normalize data for the current sheet
+        normalized_data = normalize_data(source_file['path'], sheet_name, sheet_data, schema_manager.schema.columns.keys(),
+                                         created_time=created_time, compact=compact, row_hash=row_hash)
+
+        # Validate normalized data
+        validated_data = schema_manager.validate_data(normalized_data, **(validation_options or {}))
+        if validated_data is not None:
+            if compact:
+                validated_data = compact_data(validated_data, schema_manager.schema)
+            if report_memory:
+                print(f"Memory usage for sheet '{sheet_name}': loaded {memory_usage_mb(sheet_data):.2f} MB, "
+                      f"normalized {memory_usage_mb(normalized_data):.2f} MB, "
+                      f"written {memory_usage_mb(validated_data):.2f} MB.")
+        validated_sheets.append((sheet_name, validated_data))
+
+    return source_file, validated_sheets
+
+def buffer_validated_data(write_buffer, writer_type, writer_config, transformed_source, checkpoint_log=None):
+    """
+    Add the validated sheets of a source file to the write buffer, flushing it at this
+    file boundary once it reaches its row/byte threshold.
+
+    Args:
+    - write_buffer (WriteBuffer): The pipeline's write buffer.
+    - writer_type (str): The target writer type (e.g. 'csv', 'duckdb').
+    - writer_config (dict): The target's writer configuration.
+    - transformed_source (tuple): Output of `transform_source_data`.
+    - checkpoint_log (CheckpointLog, optional): Log recording the sheets that failed validation.
+    """
+    source_file, validated_sheets = transformed_source
+    failed_units = []
+    for sheet_name, validated_data in validated_sheets:
+        if validated_data is None:
+            failed_units.append((str(source_file['path']), str(sheet_name), 0))
+            continue
+        write_buffer.add(get_destination_key(writer_type, writer_config, source_file), validated_data)
+    if failed_units and checkpoint_log is not None:
+        checkpoint_log.record(checkpoint_log.build_entries(failed_units, 'failed'))
+    write_buffer.flush_if_full()
+
+def build_checkpoint_log(config, writer_type, writer_config, force=False):
+    """
+    Create the checkpoint log configured under `checkpoint` in the pipeline configuration.
+
+    Args:
+    - config (dict): The pipeline configuration.
+    - writer_type (str): The target writer type (e.g. 'csv', 'duckdb').
+    - writer_config (dict): The target's writer configuration.
+    - force (bool): Create the log even if checkpointing is not enabled (used when resuming).
+
+    Returns:
+    - CheckpointLog: The checkpoint log, or None if checkpointing is disabled.
+    """
+    checkpoint_config = config.get('checkpoint', {})
+    if not (checkpoint_config.get('enabled', False) or force):
+        return None
+
+    pipeline_name = config.get('name', 'pipeline')
+    if writer_type == 'duckdb':
+        return DuckdbCheckpointLog(pipeline_name, writer_config['destination'], writer_config['namespace'],
+                                   table_name=checkpoint_config.get('table_name', 'ingestion_checkpoints'))
+    default_path = os.path.join(writer_config['destination'], '_checkpoints', 'checkpoints.jsonl')
+    return FileCheckpointLog(pipeline_name, checkpoint_config.get('path', default_path))
+
+def build_sheet_index(config, writer_type, writer_config):
+    """
+    Create the sheet dedup index configured under `dedup` in the pipeline configuration.
+
+    Args:
+    - config (dict): The pipeline configuration.
+    - writer_type (str): The target writer type (e.g. 'csv', 'duckdb').
+    - writer_config (dict): The target's writer configuration.
+
+    Returns:
+    - SheetIndex: The dedup index, or None if deduplication is disabled.
+    """
+    dedup_config = config.get('dedup', {})
+    if not dedup_config.get('enabled', False):
+        return None
+
+    pipeline_name = config.get('name', 'pipeline')
+    mode = dedup_config.get('mode', 'alias')
+    if writer_type == 'duckdb':
+        return DuckdbSheetIndex(pipeline_name, writer_config['destination'], writer_config['namespace'],
+                                table_name=dedup_config.get('table_name', 'sheet_content_index'), mode=mode)
+    default_path = os.path.join(writer_config['destination'], '_checkpoints', 'sheet_content_index.jsonl')
+    return FileSheetIndex(pipeline_name, dedup_config.get('path', default_path), mode=mode)
+
+def get_pending_source_files(source_files, completed_units, whole_files=False):
+    """
+    Drop the sheets completed by a resumed run from the source files.
+
+    Args:
+    - source_files (list): Source file entries from the pipeline configuration.
+    - completed_units (set): (file path, sheet name) pairs already written.
+    - whole_files (bool): Keep every sheet of a partly completed file. Needed by file-based writers,
+      which rewrite a source file's whole output file, so its completed sheets must be written again.
+
+    Returns:
+    - list: Source file entries with only their remaining sheets (or all of them with `whole_files`);
+      fully completed files are skipped.
+    """
+    if not completed_units:
+        return list(source_files)
+
+    pending = []
+    for source_file in source_files:
+        file_path = str(source_file['path'])
+        loader_config = source_file.get('loader_config') or {}
+        sheet_names = loader_config.get('tab_names')
+        if sheet_names is None:
+            # Single-table sources: the table name is chosen by the loader, so match on the file
+            if any(path == file_path for path, _ in completed_units):
+                print(f"Skipping completed file {file_path}.")
+                continue
+            pending.append(source_file)
+            continue
+
+        remaining = [sheet for sheet in sheet_names if (file_path, str(sheet)) not in completed_units]
+        if not remaining:
+            print(f"Skipping completed file {file_path}.")
+        elif len(remaining) < len(sheet_names) and whole_files:
+            print(f"Resuming file {file_path} with all its sheets, as its output file is rewritten.")
+            pending.append(source_file)
+        elif len(remaining) < len(sheet_names):
+            print(f"Resuming file {file_path} with sheets {remaining}.")
+            pending.append({**source_file, 'loader_config': {**loader_config, 'tab_names': remaining}})
+        else:
+            pending.append(source_file)
+    return pending
+
+def check_service_support(config, writer_config, resume=False):
+    """
+    Reject the features that open the target database directly when it is owned by a writer service.
+    """
+    if not writer_config.get('service'):
+        return
+    unsupported = [name for name, enabled in [
+        ('checkpoint', config.get('checkpoint', {}).get('enabled', False) or resume),
+        ('dedup', config.get('dedup', {}).get('enabled', False)),
+    ] if enabled]
+    if unsupported:
+        raise ValueError(f"{', '.join(unsupported)} cannot be used with a DuckDB writer service, "
+                         "since they read the database directly.")
+
+def get_loader(loader_dict, loader_type):
+    """
+    Return the loader for a file type, importing and instantiating it on first use.
+
+    Args:
+    - loader_dict (dict): Loader instances keyed by file type, updated in place.
+    - loader_type (str): The source file type (e.g. 'excel', 'csv').
+
+    Returns:
+    - BaseLoader: The loader instance.
+    """
+    if loader_type not in loader_dict:
+        # Define loader module and class names based on file type
+        loader_module = f"src.interfaces.loaders.{loader_type}_loader"
+        loader_class = f"{loader_type.capitalize()}Loader"
+        loader_dict[loader_type] = dynamic_import(loader_module, loader_class)()
+    return loader_dict[loader_type]
+
+def get_writer(writer_type, writer_config=None):
+    """
+    Import and instantiate the writer for a target type (e.g. 'csv', 'duckdb').
+
+    DuckDB targets with a `service` section in their writer configuration write through a running
+    `DuckdbWriterService` instead of opening the database themselves.
+    """
+    service_config = (writer_config or {}).get('service')
+    if writer_type == 'duckdb' and service_config:
+        authkey = service_config.get('authkey')
+        return DuckdbWriterClient(service_config['address'], authkey=authkey.encode() if authkey else None)
+    writer_module = f"src.interfaces.writers.{writer_type}_writer"
+    writer_class = f"{writer_type.capitalize()}Writer"
+    return dynamic_import(writer_module, writer_class)()
+
+def build_load_governor(budget, source_files):
+    """
+    Create the governor throttling concurrent loads to the budget's load memory.
+
+    Args:
+    - budget (ResourceBudget): The run's resource budget, or None.
+    - source_files (list): Source file entries to process.
+
+    Returns:
+    - tuple: The `LoadGovernor` (None without a memory ceiling) and the estimated bytes of each
+      source file keyed by path.
+    """
+    if budget is None or budget.load_memory() is None:
+        return None, {}
+    costs = {str(source_file['path']): estimate_source_memory(estimate_source_cost(source_file), source_file['file_type'])
+             for source_file in source_files}
+    return LoadGovernor(budget.load_memory()), costs
+
+def admit_source_files(source_files, governor, costs, cancelled=None):
+    """
+    Yield the source files as the governor admits them, blocking while the files in flight use the load budget.
+    """
+    for source_file in source_files:
+        if governor is not None and not governor.acquire(costs[str(source_file['path'])], cancelled=cancelled):
+            return
+        yield source_file
+
+def process_source_files(config, source_files, loader_dict, writer, schema_manager, checkpoint_log=None, sheet_index=None):
+    """
+    Load, normalize, validate and write a list of source files, then run the optional Parquet export.
+
+    Args:
+    - config (dict): The pipeline configuration.
+    - source_files (list): Source file entries to process, in processing order.
+    - loader_dict (dict): Loader instances keyed by file type.
+    - writer (object): The target writer instance.
+    - schema_manager (SchemaManager): Schema manager for the target schema.
+    - checkpoint_log (CheckpointLog, optional): Log recording the written sheets.
+    - sheet_index (SheetIndex, optional): Dedup index; sheets identical to one already loaded are
+      dropped before parsing.
+    """
+    writer_type = config['target']['type']
+    writer_config = config['target']['writer_config']
+    execution_config = config.get('execution', {})
+
+    # Drop duplicate sheets from their raw content hash, before anything is parsed
+    if sheet_index is not None:
+        source_files = sheet_index.deduplicate(source_files)
+
+    # Apply the run's resource budget to DuckDB, the loaders, the write buffer and the stage workers
+    buffer_config = writer_config.get('buffer', {})
+    buffer_max_bytes = buffer_config.get('max_bytes', 256 * 1024 * 1024)
+    load_workers = execution_config.get('load_workers', 1)
+    transform_workers = execution_config.get('transform_workers', 1)
+    validation_options = dict(config.get('validation', {}))
+    budget = ResourceBudget.from_config(config)
+    if budget is not None:
+        if writer_type == 'duckdb' and not writer_config.get('service'):
+            writer.configure(budget.duckdb_settings())
+        source_files = [budget.apply_loader_defaults(source_file) for source_file in source_files]
+        buffer_max_bytes = budget.buffer_max_bytes(buffer_max_bytes)
+        load_workers = budget.workers(load_workers)
+        transform_workers = budget.workers(transform_workers)
+        if 'workers' in validation_options:
+            validation_options['workers'] = budget.workers(validation_options['workers'])
+    governor, costs = build_load_governor(budget, source_files)
+
+    # Buffer validated sheets so many small sheets become a few bulk writes
+    write_buffer = WriteBuffer(
+        lambda key, batch: write_batch(writer, writer_type, writer_config, key, batch,
+                                       checkpoint_log=checkpoint_log, sheet_index=sheet_index),
+        max_rows=buffer_config.get('max_rows', 500_000),
+        max_bytes=buffer_max_bytes,
+    )
+
+    # Process each source file as specified in the config
+    load_stage = functools.partial(load_source_file, loader_dict, **get_projection(schema_manager))
+    normalization_config = config.get('normalization', {})
+    transform_stage = functools.partial(
+        transform_source_data,
+        schema_manager,
+        created_time=pd.Timestamp.now(),
+        compact=normalization_config.get('compact', False),
+        report_memory=normalization_config.get('report_memory', False),
+        # The diff write mode compares rows by their hash
+        row_hash=normalization_config.get('row_hash', writer_config.get('write_mode') == 'diff'),
+        validation_options=validation_options,
+    )
+    buffer_stage = functools.partial(buffer_validated_data, write_buffer, writer_type, writer_config,
+                                     checkpoint_log=checkpoint_log)
+
+    def write_stage(transformed_source):
+        buffer_stage(transformed_source)
+        # The file's data now counts against the write buffer's budget
+        if governor is not None:
+            governor.release(costs[str(transformed_source[0]['path'])])
+
+    if execution_config.get('mode', 'sequential') == 'staged':
+        # Overlap loading, validation and writing of consecutive files through bounded queues.
+        # The write stage always has a single worker since the writers are not thread-safe.
+        executor = StagedExecutor([
+            Stage('load', load_stage, workers=load_workers,
+                  use_processes=execution_config.get('load_processes', False)),
+            Stage('transform', transform_stage, workers=transform_workers),
+            Stage('write', write_stage, workers=1),
+        ], queue_size=execution_config.get('queue_size', 2))
+        executor.run(admit_source_files(source_files, governor, costs, cancelled=executor.failed.is_set))
+    else:
+        for source_file in admit_source_files(source_files, governor, costs):
+            write_stage(transform_stage(load_stage(source_file)))
+
+    # Write any remaining buffered data
+    write_buffer.flush()
+
+    # Optionally export the DuckDB table to a hive-partitioned Parquet dataset
+    parquet_export = writer_config.get('parquet_export')
+    if parquet_export and writer_type == 'duckdb':
+        writer.export_parquet(
+            writer_config['destination'],
+            writer_config['namespace'],
+            writer_config['table_name'],
+            parquet_export['destination'],
+            parquet_export.get('partition_by', writer_config.get('partition_by', [])),
+            sort_by=writer_config.get('sort_by'),
+        )
+
+def ingest_pipeline(config_path, overwrite=False, resume=False, explain=False):
     """
     Ingest pipeline to process files and normalize them into a common schema.
+
+    Args:
+    - config_path (str): Path to the YAML configuration file.
+    - overwrite (bool): Drop the target DuckDB table before loading.
+    - resume (bool): Continue the pipeline's most recent run, skipping the sheets it already wrote
+      (requires the previous run to have had checkpointing enabled). Never drops the target table.
+    - explain (bool): Print the execution plan with estimated rows and return it without loading data.
+
+    Returns:
+    - list: The execution plan when `explain` is True, otherwise None.
     """
     # Load pipeline configuration
     config = load_config(config_path)
 
-    # Determine loaders and writers from configuration
-    loader_dict = {}
-    writer_dict = {}
-
     # Identify unique loaders required
+    loader_dict = {}
     for source_file in config['source_files']:
-        loader_type = source_file['file_type']
-        if loader_type not in loader_dict:
-            # Define loader module and class names based on file type
-            loader_module = f"src.interfaces.loaders.{loader_type}_loader"
-            loader_class = f"{loader_type.capitalize()}Loader"
-            loader_dict[loader_type] = dynamic_import(loader_module, loader_class)()
+        get_loader(loader_dict, source_file['file_type'])
 
     # Identify writer required
     writer_type = config['target']['type']
-    if writer_type not in writer_dict:
-        writer_module = f"src.interfaces.writers.{writer_type}_writer"
-        writer_class = f"{writer_type.capitalize()}Writer"
-        writer_dict[writer_type] = dynamic_import(writer_module, writer_class)()
+    writer_config = config['target']['writer_config']
+    check_service_support(config, writer_config, resume=resume)
+    writer = get_writer(writer_type, writer_config)
 
     # Initialize SchemaManager for the target schema
     schema_manager = SchemaManager(config['target']['schema']['path'])
 
-    # If overwrite is true, delete existing tables
+    # Checkpoint the written sheets, and skip the ones already written when resuming
+    checkpoint_log = build_checkpoint_log(config, writer_type, writer_config, force=resume)
+    if resume:
+        completed_units = checkpoint_log.resume_latest_run()
+    else:
+        completed_units = set()
+        if checkpoint_log is not None:
+            checkpoint_log.start_run()
+    # Only DuckDB replaces data per sheet; other writers rewrite a source file's whole output
+    source_files = get_pending_source_files(config['source_files'], completed_units, whole_files=writer_type != 'duckdb')
+    sheet_index = build_sheet_index(config, writer_type, writer_config)
+
+    # Order the files by estimated cost (largest first by default when stages run concurrently)
+    execution_config = config.get('execution', {})
+    staged = execution_config.get('mode', 'sequential') == 'staged'
+    source_order = execution_config.get('order', 'largest_first' if staged else 'config')
+    if explain or source_order != 'config':
+        plan = plan_source_files(source_files, order=source_order)
+        source_files = [estimate['source_file'] for estimate in plan]
+        if explain:
+            print(format_plan(plan))
+            return plan
+
+    # If overwrite is true, delete existing tables (a resumed run keeps what it already wrote)
     if overwrite and writer_type == 'duckdb':
-        writer = writer_dict[writer_type]
-        db_path = config['target']['writer_config']['destination']
-        namespace = config['target'].get('namespace', 'public')
-        tables_to_delete = [config['target']['table_name']]
-        writer.delete_tables(db_path, namespace, tables_to_delete)
+        if resume:
+            print("Resuming a run, existing tables are kept.")
+        else:
+            db_path = writer_config['destination']
+            namespace = writer_config.get('namespace', 'public')
+            tables_to_delete = [writer_config['table_name']]
+            writer.delete_tables(db_path, namespace, tables_to_delete)
+            # The dropped sheets can no longer be aliased
+            if sheet_index is not None:
+                sheet_index.clear()
 
-    # Process each source file as specified in the config
-    for source_file in config['source_files']:
-        file_path = source_file['path']
-        sheet_names = source_file['loader_config']['tab_names']
-        loader_type = source_file['file_type']
-        loader = loader_dict[loader_type]
-
-        # Load the data for the current file
-        data = loader.load(file_path, sheet_names=sheet_names)
-
-        # Process each sheet separately
-        for sheet_name, sheet_data in data.items():
-            # Normalize data for the current sheet
-            normalized_data = normalize_data(file_path, sheet_name, sheet_data, schema_manager.schema.columns.keys())
-
-            # Validate normalized data
-            validated_data = schema_manager.validate_data(normalized_data)
-            if validated_data is not None:
-                writer = writer_dict[writer_type]
-                output_path = config['target']['writer_config']['destination']
-                if writer_type == 'duckdb':
-                    # Extract specific DuckDB writer parameters
-                    db_path = config['target']['writer_config']['destination']
-                    namespace = config['target']['writer_config']['namespace']
-                    table_name = config['target']['writer_config']['table_name']
-                    partition_columns = config['target']['writer_config'].get('partition_by', [])
-
-                    # Call the write method for DuckDB writer
-                    writer.write(validated_data, db_path, namespace, table_name, partition_columns)
-
-                else:
-                    # Handle other writer types, e.g., CSV
-                    fulloutput_path = f"{output_path}/{source_file['file_name']}.csv"
-                    writer.write(validated_data, fulloutput_path)
+    try:
+        process_source_files(config, source_files, loader_dict, writer, schema_manager, checkpoint_log=checkpoint_log,
+                             sheet_index=sheet_index)
+    finally:
+        if isinstance(writer, DuckdbWriterClient):
+            writer.close()
+
+def build_watched_source_file(file_path, configured_files, watch_config):
+    """
+    Build the source file entry of a file picked up by the watch mode.
+
+    Args:
+    - file_path (str): Path of the new or changed file.
+    - configured_files (dict): Source file entries from the configuration keyed by absolute path.
+    - watch_config (dict): The `watch` section of the pipeline configuration.
+
+    Returns:
+    - dict: The configured entry for this file if there is one, otherwise an entry built from the
+      watch section's `file_type` (inferred from the extension by default) and `loader_config`.
+    """
+    configured = configured_files.get(os.path.abspath(file_path))
+    if configured is not None:
+        return configured
+    default_type = 'csv' if file_path.lower().endswith(('.csv', '.csv.gz', '.csv.zst')) else 'excel'
+    return {
+        'file_name': os.path.basename(file_path),
+        'file_type': watch_config.get('file_type', default_type),
+        'path': file_path,
+        'loader_config': dict(watch_config.get('loader_config') or {}),
+    }
+
+def watch_pipeline(config_path, max_polls=None):
+    """
+    Run the pipeline as a long-running process that ingests source files as they land.
+
+    The configuration, schema, loaders and writer are set up once and kept warm (for DuckDB the
+    writer keeps its connection open), and the watched directories are polled every
+    `poll_interval` seconds. New or changed files are ingested once they have stopped changing for
+    `settle_seconds`, so partially copied workbooks are never read.
+
+    Args:
+    - config_path (str): Path to the YAML configuration file.
+    - max_polls (int, optional): Stop after this many polls (used in tests). Runs until interrupted by default.
+    """
+    config = load_config(config_path)
+    watch_config = config.get('watch', {})
+
+    writer_type = config['target']['type']
+    writer_config = config['target']['writer_config']
+    check_service_support(config, writer_config)
+    writer = get_writer(writer_type, writer_config)
+    schema_manager = SchemaManager(config['target']['schema']['path'])
+    checkpoint_log = build_checkpoint_log(config, writer_type, writer_config)
+    if checkpoint_log is not None:
+        checkpoint_log.start_run()
+    sheet_index = build_sheet_index(config, writer_type, writer_config)
+    keep_connection = writer_type == 'duckdb' and not writer_config.get('service')
+    if keep_connection:
+        writer.open_connection(writer_config['destination'])
+
+    # Without watched directories, only the configured source files are picked up
+    configured_files = {os.path.abspath(source_file['path']): source_file for source_file in config.get('source_files', [])}
+    directories = watch_config.get('directories')
+    if not directories:
+        directories = sorted({os.path.dirname(path) for path in configured_files})
+    watcher = FileWatcher(
+        directories,
+        patterns=watch_config.get('patterns', ['*.xlsx']),
+        settle_seconds=watch_config.get('settle_seconds', 5.0),
+        ingest_existing=watch_config.get('ingest_existing', False),
+    )
+    poll_interval = watch_config.get('poll_interval', 2.0)
+    print(f"Watching {directories} for {watcher.patterns} every {poll_interval}s.")
+
+    loader_dict = {}
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            ready_files = watcher.poll()
+            polls += 1
+            if not watch_config.get('directories'):
+                ready_files = [path for path in ready_files if os.path.abspath(path) in configured_files]
+            if ready_files:
+                print(f"Ingesting {len(ready_files)} new or changed files: {ready_files}")
+                source_files = [build_watched_source_file(path, configured_files, watch_config) for path in ready_files]
+                for source_file in source_files:
+                    get_loader(loader_dict, source_file['file_type'])
+                try:
+                    process_source_files(config, source_files, loader_dict, writer, schema_manager,
+                                         checkpoint_log=checkpoint_log, sheet_index=sheet_index)
+                except Exception as e:
+                    # Keep watching; the files are picked up again when they change
+                    print(f"Error ingesting {ready_files}: {e}")
+            if max_polls is None or polls < max_polls:
+                time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("Stopping watch mode.")
+    finally:
+        if keep_connection:
+            writer.close_connections()
+        elif isinstance(writer, DuckdbWriterClient):
+            writer.close()
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run the Excel Ingestion Pipeline.')
     parser.add_argument('--config', type=str, required=True, help='Path to the YAML configuration file.')
+    parser.add_argument('--resume', action='store_true', help='Resume the most recent run, skipping sheets it already wrote.')
+    parser.add_argument('--explain', action='store_true', help='Print the execution plan and estimated rows without loading data.')
+    parser.add_argument('--watch', action='store_true', help='Keep running and ingest source files as they land.')
     args = parser.parse_args()
-    ingest_pipeline(args.config)
+    if args.watch:
+        watch_pipeline(args.config)
+    else:
+        ingest_pipeline(args.config, resume=args.resume, explain=args.explain)
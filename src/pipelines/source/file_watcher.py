@@ -0,0 +1,102 @@
+# src/pipelines/source/file_watcher.py
+import os
+import time
+import fnmatch
+import zipfile
+
+# Extensions of zip-based workbooks, which are only complete once their central directory is written
+ZIP_EXTENSIONS = ('.xlsx', '.xlsm')
+
+class FileWatcher:
+    """
+    Polls directories for new or changed files and reports them once they have settled.
+
+    A file is reported when its size and modification time have not changed for `settle_seconds`
+    (debouncing files that are still being copied) and, for xlsx workbooks, once the zip archive
+    is complete. Each version of a file is reported once; a later change reports it again.
+    """
+
+    def __init__(self, directories, patterns=('*.xlsx',), settle_seconds=5.0, ingest_existing=False, clock=time.monotonic):
+        """
+        Initializes the FileWatcher.
+
+        Args:
+        - directories (list): Directories to watch (not recursive).
+        - patterns (tuple): Glob patterns of the file names to watch.
+        - settle_seconds (float): How long a file must stay unchanged before it is reported.
+        - ingest_existing (bool): Report files already present when the watcher starts. Otherwise
+          only files created or changed afterwards are reported.
+        - clock (callable): Monotonic clock in seconds, replaceable in tests.
+        """
+        self.directories = list(directories)
+        self.patterns = tuple(patterns)
+        self.settle_seconds = settle_seconds
+        self.clock = clock
+        # Path -> (signature, time the signature was first seen) for files waiting to settle
+        self.pending = {}
+        # Path -> signature of the version last reported
+        self.reported = {}
+        if not ingest_existing:
+            self.reported = dict(self.scan())
+
+    def scan(self):
+        """
+        List the watched files with their (size, mtime) signature.
+
+        Returns:
+        - dict: File path to (size in bytes, modification time in nanoseconds).
+        """
+        files = {}
+        for directory in self.directories:
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                # Skip hidden files and Office lock files ("~$Book.xlsx")
+                if entry.name.startswith(('.', '~$')) or not entry.is_file():
+                    continue
+                if not any(fnmatch.fnmatch(entry.name, pattern) for pattern in self.patterns):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                files[entry.path] = (stat.st_size, stat.st_mtime_ns)
+        return files
+
+    def poll(self):
+        """
+        Scan the directories once.
+
+        Returns:
+        - list: Paths of files that are new or changed and have settled, in arrival order.
+        """
+        now = self.clock()
+        files = self.scan()
+        ready = []
+
+        for path, signature in files.items():
+            if self.reported.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+            pending = self.pending.get(path)
+            if pending is None or pending[0] != signature:
+                # New file or still changing: restart the settle timer
+                self.pending[path] = (signature, now)
+                continue
+            if now - pending[1] < self.settle_seconds:
+                continue
+            if path.lower().endswith(ZIP_EXTENSIONS) and not zipfile.is_zipfile(path):
+                # Not a complete archive yet (e.g. a copy that has stalled), keep waiting
+                continue
+            ready.append((pending[1], path))
+
+        # Forget files that disappeared before settling
+        for path in list(self.pending):
+            if path not in files:
+                del self.pending[path]
+
+        for _, path in sorted(ready):
+            self.reported[path] = self.pending.pop(path)[0]
+        return [path for _, path in sorted(ready)]
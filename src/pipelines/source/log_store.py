@@ -0,0 +1,145 @@
+# src/pipelines/source/log_store.py
+import os
+import json
+from abc import ABC, abstractmethod
+import duckdb
+import pandas as pd
+from src.interfaces.writers.duckdb_writer import DuckdbWriter
+
+class LogStore(ABC):
+    """
+    Append-only store of log entries scoped by pipeline, used by the checkpoint log and the sheet
+    dedup index. Entries are DataFrames with the store's columns, including `pipeline` and a
+    `recorded_at` timestamp.
+    """
+
+    def __init__(self, columns):
+        """
+        Initializes the LogStore.
+
+        Args:
+        - columns (list): Columns of an entry.
+        """
+        self.columns = list(columns)
+
+    @abstractmethod
+    def read(self, pipeline):
+        """
+        Return the entries of a pipeline as a DataFrame with the store's columns.
+        """
+        pass
+
+    @abstractmethod
+    def append(self, entries):
+        """
+        Append entries.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, pipeline):
+        """
+        Remove the entries of a pipeline.
+        """
+        pass
+
+class DuckdbLogStore(LogStore):
+    """
+    Log stored in a DuckDB table, next to the pipeline's target table.
+    """
+
+    def __init__(self, db_path, schema, table_name, columns):
+        super().__init__(columns)
+        self.db_path = db_path
+        self.schema = schema
+        self.table_name = table_name
+
+    def read(self, pipeline):
+        conn = duckdb.connect(self.db_path)
+        try:
+            return conn.execute(
+                f"SELECT {', '.join(self.columns)} FROM {self.schema}.{self.table_name} WHERE pipeline = ?",
+                [pipeline],
+            ).fetchdf()
+        except duckdb.CatalogException:
+            # Nothing has been logged in this database yet
+            return pd.DataFrame(columns=self.columns)
+        finally:
+            conn.close()
+
+    def append(self, entries):
+        conn = duckdb.connect(self.db_path)
+        try:
+            DuckdbWriter.append_rows(conn, self.schema, self.table_name, entries)
+        finally:
+            conn.close()
+
+    def delete(self, pipeline):
+        conn = duckdb.connect(self.db_path)
+        try:
+            conn.execute(f"DELETE FROM {self.schema}.{self.table_name} WHERE pipeline = ?", [pipeline])
+        except duckdb.CatalogException:
+            pass
+        finally:
+            conn.close()
+
+class FileLogStore(LogStore):
+    """
+    Log stored as a JSON Lines file, for file-based writers. Writes are flushed to disk before
+    returning, so recorded entries survive a crash.
+    """
+
+    def __init__(self, path, columns, text_columns=None):
+        """
+        Initializes the FileLogStore.
+
+        Args:
+        - path (str): Path to the JSON Lines file.
+        - columns (list): Columns of an entry.
+        - text_columns (list, optional): Columns read back as strings (e.g. file paths and sheet names
+          that look like numbers). Defaults to every column but `recorded_at`.
+        """
+        super().__init__(columns)
+        self.path = path
+        self.text_columns = [col for col in self.columns if col != 'recorded_at'] if text_columns is None else text_columns
+
+    def read_all(self):
+        """
+        Return the entries of every pipeline.
+        """
+        if not os.path.exists(self.path):
+            return pd.DataFrame(columns=self.columns)
+        entries = pd.read_json(self.path, lines=True, dtype={col: str for col in self.text_columns})
+        if entries.empty:
+            return pd.DataFrame(columns=self.columns)
+        return entries
+
+    def read(self, pipeline):
+        entries = self.read_all()
+        return entries[entries['pipeline'] == pipeline]
+
+    def append(self, entries):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with open(self.path, 'a') as file:
+            self.write_entries(file, entries)
+
+    def delete(self, pipeline):
+        entries = self.read_all()
+        if entries.empty:
+            return
+        # Rewrite the other pipelines' entries aside, then swap the file in one step
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w') as file:
+            self.write_entries(file, entries[entries['pipeline'] != pipeline])
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def write_entries(file, entries):
+        """
+        Write entries as JSON lines and flush them to disk.
+        """
+        for entry in entries.to_dict(orient='records'):
+            entry['recorded_at'] = pd.Timestamp(entry['recorded_at']).isoformat()
+            file.write(json.dumps(entry) + '\n')
+        file.flush()
+        os.fsync(file.fileno())
@@ -0,0 +1,199 @@
+# src/pipelines/source/resource_budget.py
+import os
+import re
+import threading
+
+# Suffixes accepted by `parse_size`, in bytes
+SIZE_UNITS = {
+    '': 1, 'B': 1,
+    'KB': 1000, 'MB': 1000 ** 2, 'GB': 1000 ** 3, 'TB': 1000 ** 4,
+    'KIB': 1024, 'MIB': 1024 ** 2, 'GIB': 1024 ** 3, 'TIB': 1024 ** 4,
+}
+
+# Rough in-memory size of one loaded cell (object columns hold a Python object per cell)
+BYTES_PER_CELL = 64
+
+# Rough ratio of loaded DataFrame size to file size, for sources without declared dimensions
+FILE_EXPANSION = {'excel': 10, 'csv': 3}
+DEFAULT_FILE_EXPANSION = 5
+
+def parse_size(value):
+    """
+    Parse a memory size such as '8GB', '512MiB' or 1073741824 into bytes.
+
+    Args:
+    - value (int | str): The size, in bytes or with a unit suffix.
+
+    Returns:
+    - int: The size in bytes.
+    """
+    if isinstance(value, (int, float)):
+        return int(value)
+    match = re.fullmatch(r'\s*([0-9.]+)\s*([A-Za-z]*)\s*', str(value))
+    if not match or match.group(2).upper() not in SIZE_UNITS:
+        raise ValueError(f"Invalid memory size '{value}'. Expected a number of bytes or a size such as '8GB' or '512MiB'.")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2).upper()])
+
+def estimate_source_memory(estimate, file_type):
+    """
+    Estimate the memory a source file takes once loaded.
+
+    Args:
+    - estimate (dict): The file's estimate from `estimate_source_cost`.
+    - file_type (str): The source file type (e.g. 'excel', 'csv').
+
+    Returns:
+    - int: Estimated bytes, from the declared sheet dimensions when every sheet has one,
+      otherwise from the file size.
+    """
+    sheets = estimate['sheets']
+    if sheets and all(sheet['rows'] is not None for sheet in sheets):
+        return sum(sheet['estimated_rows'] * sheet['columns'] for sheet in sheets) * BYTES_PER_CELL
+    return estimate['file_size'] * FILE_EXPANSION.get(file_type, DEFAULT_FILE_EXPANSION)
+
+class LoadGovernor:
+    """
+    Weighted semaphore bounding the estimated memory of the source files loaded at the same time.
+
+    A file is admitted once the files already in flight leave room for its estimate; a file larger
+    than the whole budget is admitted on its own, so an oversized file slows the run down rather than
+    blocking it.
+    """
+
+    def __init__(self, budget_bytes):
+        """
+        Initializes the LoadGovernor.
+
+        Args:
+        - budget_bytes (int): Estimated bytes allowed in flight.
+        """
+        self.budget_bytes = budget_bytes
+        self.in_use = 0
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self, cost, cancelled=None):
+        """
+        Wait until a file of the given estimated size can be loaded.
+
+        Args:
+        - cost (int): Estimated bytes of the file.
+        - cancelled (callable, optional): Checked while waiting; stop waiting once it returns True
+          (e.g. when a pipeline stage has failed and nothing will be released anymore).
+
+        Returns:
+        - bool: True if admitted, False if cancelled.
+        """
+        with self.condition:
+            while self.in_flight and self.in_use + cost > self.budget_bytes:
+                if cancelled is not None and cancelled():
+                    return False
+                self.condition.wait(timeout=0.1)
+            self.in_use += cost
+            self.in_flight += 1
+            return True
+
+    def release(self, cost):
+        """
+        Return the budget of a file once its data has been handed to the write buffer.
+        """
+        with self.condition:
+            self.in_use -= cost
+            self.in_flight -= 1
+            self.condition.notify_all()
+
+class ResourceBudget:
+    """
+    Run-level resource budget read from the `resources` section of the pipeline configuration.
+
+    The memory ceiling is split between DuckDB (`memory_limit` setting), the write buffer, and the
+    source files being loaded and validated, whose concurrency is throttled by a `LoadGovernor`.
+    The thread count caps DuckDB's threads, the stage workers and the sheets parsed per workbook,
+    and the temp directory is where DuckDB spills operators that exceed its share.
+    """
+
+    def __init__(self, memory_limit=None, threads=None, temp_directory=None, duckdb_memory_fraction=0.4,
+                 buffer_memory_fraction=0.2):
+        """
+        Initializes the ResourceBudget.
+
+        Args:
+        - memory_limit (int | str, optional): Memory ceiling of the run (e.g. '8GB'). Unbounded if None.
+        - threads (int, optional): Threads the run may use. Defaults to the CPU count.
+        - temp_directory (str, optional): Directory for DuckDB to spill to.
+        - duckdb_memory_fraction (float): Share of the ceiling given to DuckDB.
+        - buffer_memory_fraction (float): Share of the ceiling given to the write buffer. Loads get the rest.
+        """
+        if duckdb_memory_fraction + buffer_memory_fraction >= 1:
+            raise ValueError("duckdb_memory_fraction and buffer_memory_fraction must leave memory for loading.")
+        self.memory_limit = parse_size(memory_limit) if memory_limit is not None else None
+        self.threads = threads or os.cpu_count() or 1
+        self.temp_directory = temp_directory
+        self.duckdb_memory_fraction = duckdb_memory_fraction
+        self.buffer_memory_fraction = buffer_memory_fraction
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build the budget from the pipeline configuration, or return None without a `resources` section.
+        """
+        resources = config.get('resources')
+        if not resources:
+            return None
+        return cls(**resources)
+
+    def duckdb_settings(self):
+        """
+        Return the DuckDB settings enforcing the budget (see `DuckdbWriter.configure`).
+        """
+        settings = {'threads': self.threads}
+        if self.memory_limit is not None:
+            settings['memory_limit'] = f"{int(self.memory_limit * self.duckdb_memory_fraction) // (1024 * 1024)}MiB"
+        if self.temp_directory:
+            settings['temp_directory'] = self.temp_directory
+        return settings
+
+    def buffer_max_bytes(self, configured):
+        """
+        Cap the write buffer's byte threshold to its share of the ceiling.
+        """
+        if self.memory_limit is None:
+            return configured
+        return min(configured, int(self.memory_limit * self.buffer_memory_fraction))
+
+    def load_memory(self):
+        """
+        Return the bytes available to source files in flight, or None if unbounded.
+        """
+        if self.memory_limit is None:
+            return None
+        return int(self.memory_limit * (1 - self.duckdb_memory_fraction - self.buffer_memory_fraction))
+
+    def workers(self, configured):
+        """
+        Cap a stage's worker count to the thread budget.
+        """
+        return max(1, min(configured, self.threads))
+
+    def apply_loader_defaults(self, source_file):
+        """
+        Size the loader's batches to the budget, keeping any option set in the configuration.
+
+        Args:
+        - source_file (dict): The source file entry from the pipeline configuration.
+
+        Returns:
+        - dict: The source file entry with budget-derived loader options.
+        """
+        loader_config = dict(source_file.get('loader_config') or {})
+        file_type = source_file.get('file_type')
+        load_memory = self.load_memory()
+
+        if file_type == 'excel' and 'sheet_workers' in loader_config:
+            loader_config['sheet_workers'] = self.workers(loader_config['sheet_workers'])
+        elif file_type == 'csv' and load_memory is not None and 'block_size' not in loader_config:
+            # One block per thread in flight, with headroom for the parsed columns
+            loader_config['block_size'] = max(1024 * 1024, min(64 * 1024 * 1024, load_memory // (self.threads * 16)))
+        elif file_type == 'duckdb' and load_memory is not None and 'batch_size' not in loader_config:
+            loader_config['batch_size'] = max(10_000, min(1_000_000, load_memory // (self.threads * 1024)))
+        return {**source_file, 'loader_config': loader_config}
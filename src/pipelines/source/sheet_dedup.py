@@ -0,0 +1,221 @@
+# src/pipelines/source/sheet_dedup.py
+import json
+import hashlib
+import zipfile
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+import pandas as pd
+from src.interfaces.loaders.xlsx_metadata import hash_sheet_contents
+from src.pipelines.source.log_store import DuckdbLogStore, FileLogStore
+
+# Columns of a dedup index entry, one entry per (file, sheet) whose content was loaded or aliased
+INDEX_COLUMNS = ['pipeline', 'content_hash', 'source_filepath', 'source_sheetname', 'status',
+                 'original_filepath', 'original_sheetname', 'recorded_at']
+
+# What happens to a duplicate sheet: 'skip' only reports it, 'alias' also records it in the index
+DEDUP_MODES = {'skip', 'alias'}
+
+def get_sheet_key(source_file, content_hash):
+    """
+    Combine a sheet's content hash with the options it is parsed with, so the same sheet read with
+    a different header row or row limit is not mistaken for a duplicate.
+    """
+    loader_config = source_file.get('loader_config') or {}
+    options = {key: value for key, value in loader_config.items() if key != 'tab_names'}
+    options_digest = hashlib.blake2b(json.dumps(options, sort_keys=True, default=str).encode(), digest_size=8)
+    return f"{content_hash}:{options_digest.hexdigest()}"
+
+class SheetIndex(ABC):
+    """
+    Index of the sheet contents loaded by a pipeline, used to detect sheets that are identical to a
+    sheet already loaded (e.g. the same workbook copied into another folder or re-sent under a new
+    name) before they are parsed.
+
+    Sheets are keyed by `hash_sheet_contents` (computed from the raw worksheet XML) combined with
+    their loader options. The first sheet with a given key is the original and is loaded as usual;
+    later ones are duplicates and are not loaded. In 'alias' mode a duplicate is recorded in the
+    index as an alias of the original's `source_filepath` and `source_sheetname`, so downstream
+    models can resolve it to the original load.
+    """
+
+    def __init__(self, pipeline, mode='alias'):
+        """
+        Initializes the SheetIndex.
+
+        Args:
+        - pipeline (str): Pipeline name from the configuration, scoping the index entries.
+        - mode (str): 'alias' to record duplicates as aliases of the original, or 'skip' to only report them.
+        """
+        if mode not in DEDUP_MODES:
+            raise ValueError(f"Unsupported dedup mode '{mode}'. Expected one of {sorted(DEDUP_MODES)}.")
+        self.pipeline = pipeline
+        self.mode = mode
+        # (file, sheet) -> key of the originals planned in this run, recorded once they are written
+        self.planned = {}
+        # (file, sheet) of an original planned in this run -> aliases recorded with it
+        self.pending_aliases = {}
+
+    def get_loaded_sheets(self):
+        """
+        Return the key of every sheet currently loaded, mapped to its (file, sheet).
+
+        Only the latest entry of each (file, sheet) counts, so a sheet that was re-sent with other
+        content no longer stands for its previous content.
+        """
+        entries = self.read()
+        if entries.empty:
+            return {}
+        latest = entries.sort_values('recorded_at').groupby(['source_filepath', 'source_sheetname']).tail(1)
+        loaded = latest[latest['status'] == 'loaded']
+        return {key: (path, sheet) for key, path, sheet in
+                zip(loaded['content_hash'], loaded['source_filepath'], loaded['source_sheetname'])}
+
+    def deduplicate(self, source_files):
+        """
+        Hash the sheets of the source files and drop the duplicates before anything is parsed.
+
+        Args:
+        - source_files (list): Source file entries, in processing order.
+
+        Returns:
+        - list: Source file entries without their duplicate sheets; files with only duplicates are dropped.
+        """
+        originals = self.get_loaded_sheets()
+        aliases = []
+        pending = []
+
+        for source_file in source_files:
+            file_path = str(source_file['path'])
+            loader_config = source_file.get('loader_config') or {}
+            sheet_names = loader_config.get('tab_names')
+            try:
+                if not zipfile.is_zipfile(file_path):
+                    # Only xlsx workbooks are hashed, other sources are always loaded
+                    pending.append(source_file)
+                    continue
+                hashes = hash_sheet_contents(file_path, sheet_names)
+            except (OSError, zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+                print(f"Unable to hash the sheets of {file_path}, loading it without deduplication: {e}")
+                pending.append(source_file)
+                continue
+
+            remaining = []
+            for sheet_name in (sheet_names if sheet_names is not None else list(hashes)):
+                if sheet_name not in hashes:
+                    # Left to the loader to report
+                    remaining.append(sheet_name)
+                    continue
+                unit = (file_path, str(sheet_name))
+                key = get_sheet_key(source_file, hashes[sheet_name])
+                original = originals.get(key)
+                if original is None or original == unit:
+                    originals[key] = unit
+                    self.planned[unit] = key
+                    remaining.append(sheet_name)
+                    continue
+
+                print(f"Skipping sheet '{sheet_name}' of {file_path}: identical to sheet '{original[1]}' of {original[0]}.")
+                if self.mode == 'alias':
+                    aliases.append((key, unit, original))
+
+            if remaining == (sheet_names if sheet_names is not None else list(hashes)):
+                pending.append(source_file)
+            elif remaining:
+                pending.append({**source_file, 'loader_config': {**loader_config, 'tab_names': remaining}})
+
+        # Aliases of sheets loaded by a previous run are recorded now, the others once their original is written
+        ready_aliases = []
+        for key, unit, original in aliases:
+            if original in self.planned:
+                self.pending_aliases.setdefault(original, []).append((key, unit))
+            else:
+                ready_aliases.append((key, unit, 'alias', original))
+        if ready_aliases:
+            self.record(self.build_entries(ready_aliases))
+        return pending
+
+    def record_written(self, dataframe):
+        """
+        Record the original sheets contained in a written batch, and the aliases waiting for them.
+
+        Args:
+        - dataframe (pd.DataFrame): Written batch with `source_filepath` and `source_sheetname` columns.
+        """
+        units = dataframe[['source_filepath', 'source_sheetname']].drop_duplicates().astype(str)
+        entries = []
+        for unit in zip(units['source_filepath'], units['source_sheetname']):
+            key = self.planned.pop(unit, None)
+            if key is None:
+                continue
+            entries.append((key, unit, 'loaded', unit))
+            for alias_key, alias_unit in self.pending_aliases.pop(unit, []):
+                entries.append((alias_key, alias_unit, 'alias', unit))
+        if entries:
+            self.record(self.build_entries(entries))
+
+    def build_entries(self, entries):
+        """
+        Build index entries from (key, (file, sheet), status, (original file, original sheet)) tuples.
+        """
+        return pd.DataFrame(
+            [(self.pipeline, key, unit[0], unit[1], status, original[0], original[1], pd.Timestamp.now())
+             for key, unit, status, original in entries],
+            columns=INDEX_COLUMNS,
+        )
+
+    @abstractmethod
+    def read(self):
+        """
+        Return the pipeline's index entries as a DataFrame with `INDEX_COLUMNS`.
+        """
+        pass
+
+    @abstractmethod
+    def record(self, entries):
+        """
+        Append index entries.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """
+        Remove the pipeline's index entries, e.g. when the target table is dropped.
+        """
+        pass
+
+class DuckdbSheetIndex(SheetIndex):
+    """
+    Sheet index stored in a table next to the target table.
+    """
+
+    def __init__(self, pipeline, db_path, schema, table_name='sheet_content_index', mode='alias'):
+        super().__init__(pipeline, mode)
+        self.store = DuckdbLogStore(db_path, schema, table_name, INDEX_COLUMNS)
+
+    def read(self):
+        return self.store.read(self.pipeline)
+
+    def record(self, entries):
+        self.store.append(entries)
+
+    def clear(self):
+        self.store.delete(self.pipeline)
+
+class FileSheetIndex(SheetIndex):
+    """
+    Sheet index stored as a JSON Lines file, for file-based writers.
+    """
+
+    def __init__(self, pipeline, path, mode='alias'):
+        super().__init__(pipeline, mode)
+        self.store = FileLogStore(path, INDEX_COLUMNS)
+
+    def read(self):
+        return self.store.read(self.pipeline)
+
+    def record(self, entries):
+        self.store.append(entries)
+
+    def clear(self):
+        self.store.delete(self.pipeline)
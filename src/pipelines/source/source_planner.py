@@ -0,0 +1,116 @@
+# src/pipelines/source/source_planner.py
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from src.interfaces.loaders.xlsx_metadata import get_sheet_dimensions
+
+# Source file orderings accepted by `plan_source_files`
+SOURCE_ORDERS = {'config', 'largest_first'}
+
+def estimate_source_cost(source_file):
+    """
+    Estimate the cost of loading a source file without parsing any cells.
+
+    The cost is expressed in bytes of the source file. For xlsx workbooks the file size is split
+    across sheets in proportion to the cell counts declared by each sheet's `<dimension>` element,
+    so a small tab of a large workbook is not mistaken for a large unit of work. Other files (or
+    workbooks whose sheets declare no usable dimension) are costed by their size alone.
+
+    Args:
+    - source_file (dict): The source file entry from the pipeline configuration.
+
+    Returns:
+    - dict: `source_file`, `file_size`, `cost`, `estimated_rows` (None if unknown) and a `sheets`
+      list with the `sheet_name`, `rows`, `columns`, `estimated_rows` and `cost` of each sheet.
+    """
+    file_path = source_file['path']
+    loader_config = source_file.get('loader_config') or {}
+    sheet_names = loader_config.get('tab_names')
+    header_row = loader_config.get('header_row', 0)
+    max_rows = loader_config.get('max_rows')
+
+    try:
+        file_size = os.path.getsize(file_path)
+    except OSError:
+        print(f"Unable to read the size of {file_path}, planning it last.")
+        file_size = 0
+
+    dimensions = {}
+    if sheet_names and zipfile.is_zipfile(file_path):
+        try:
+            dimensions = get_sheet_dimensions(file_path)
+        except (zipfile.BadZipFile, KeyError, ET.ParseError) as e:
+            print(f"Unable to read sheet dimensions of {file_path}: {e}")
+
+    known = {name: dims for name, dims in dimensions.items() if dims is not None}
+    total_cells = sum(rows * columns for rows, columns in known.values())
+    all_known = bool(dimensions) and len(known) == len(dimensions) and total_cells > 0
+
+    sheets = []
+    for sheet_name in (sheet_names or [None]):
+        rows, columns = known.get(sheet_name, (None, None))
+        if all_known and rows is not None:
+            cost = file_size * rows * columns / total_cells
+        else:
+            cost = file_size / max(len(dimensions), len(sheet_names or [None]))
+        estimated_rows = None
+        if rows is not None:
+            estimated_rows = max(rows - header_row - 1, 0)
+            if max_rows is not None:
+                estimated_rows = min(estimated_rows, max_rows)
+        sheets.append({'sheet_name': sheet_name, 'rows': rows, 'columns': columns,
+                       'estimated_rows': estimated_rows, 'cost': cost})
+
+    sheet_rows = [sheet['estimated_rows'] for sheet in sheets]
+    return {
+        'source_file': source_file,
+        'file_size': file_size,
+        'cost': sum(sheet['cost'] for sheet in sheets),
+        'estimated_rows': None if None in sheet_rows else sum(sheet_rows),
+        'sheets': sheets,
+    }
+
+def plan_source_files(source_files, order='largest_first'):
+    """
+    Estimate every source file and order the work.
+
+    Feeding the largest files first means that with several workers the long units start
+    immediately and the small ones fill the gaps at the end, instead of one large workbook at the
+    end of the list dominating the tail of the run (longest-processing-time-first scheduling).
+
+    Args:
+    - source_files (list): Source file entries from the pipeline configuration.
+    - order (str): 'largest_first', or 'config' to keep the configuration order.
+
+    Returns:
+    - list: Estimates from `estimate_source_cost`, in processing order.
+    """
+    if order not in SOURCE_ORDERS:
+        raise ValueError(f"Unsupported source order '{order}'. Expected one of {sorted(SOURCE_ORDERS)}.")
+    plan = [estimate_source_cost(source_file) for source_file in source_files]
+    if order == 'largest_first':
+        # Stable sort, so files of equal cost keep their configuration order
+        plan.sort(key=lambda estimate: estimate['cost'], reverse=True)
+    return plan
+
+def format_plan(plan):
+    """
+    Render a plan as a human-readable table, one line per file and per sheet.
+    """
+    def format_rows(rows):
+        return 'unknown' if rows is None else f"{rows:,}"
+
+    total_bytes = sum(estimate['file_size'] for estimate in plan)
+    known_rows = [estimate['estimated_rows'] for estimate in plan if estimate['estimated_rows'] is not None]
+    lines = [f"Execution plan: {len(plan)} files, {total_bytes / (1024 * 1024):.1f} MB, "
+             f"~{sum(known_rows):,} estimated rows"
+             + ("" if len(known_rows) == len(plan) else " (some files unknown)")]
+    for position, estimate in enumerate(plan, start=1):
+        lines.append(f"{position:>4}. {estimate['source_file']['path']} "
+                     f"[{estimate['file_size'] / (1024 * 1024):.1f} MB, ~{format_rows(estimate['estimated_rows'])} rows]")
+        for sheet in estimate['sheets']:
+            if sheet['sheet_name'] is None:
+                continue
+            extent = '' if sheet['rows'] is None else f" {sheet['rows']:,} x {sheet['columns']} cells,"
+            lines.append(f"        - {sheet['sheet_name']}:{extent} ~{format_rows(sheet['estimated_rows'])} rows")
+    return '\n'.join(lines)
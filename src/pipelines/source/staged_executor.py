@@ -0,0 +1,136 @@
+# src/pipelines/source/staged_executor.py
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+# Marker passed down the queues once a stage has no more items to emit
+_END_OF_STREAM = object()
+
+class Stage:
+    """
+    A single step of a staged pipeline.
+    """
+
+    def __init__(self, name, function, workers=1, use_processes=False):
+        """
+        Initializes the Stage.
+
+        Args:
+        - name (str): Stage name used in log messages.
+        - function (callable): Called with one input item; returns the item passed to the next stage,
+          or None to drop it. Must be picklable when `use_processes` is True.
+        - workers (int): Number of items processed concurrently by this stage.
+        - use_processes (bool): Run the function in a process pool instead of the worker threads,
+          for CPU-bound work that holds the GIL (e.g. pure-Python parsing).
+        """
+        self.name = name
+        self.function = function
+        self.workers = workers
+        self.use_processes = use_processes
+
+class StagedExecutor:
+    """
+    Runs items through a chain of stages connected by bounded queues, so that each stage works
+    on a different item at the same time (e.g. parsing file N+1 while validating file N and
+    writing file N-1). A full queue blocks the upstream stage, which bounds the number of items
+    held in memory to roughly `queue_size` plus the number of workers per stage.
+    """
+
+    def __init__(self, stages, queue_size=2):
+        """
+        Initializes the StagedExecutor.
+
+        Args:
+        - stages (list): Ordered list of `Stage` objects.
+        - queue_size (int): Maximum number of items waiting between two stages.
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+        self.error = None
+        self.failed = threading.Event()
+        self.error_lock = threading.Lock()
+
+    def run(self, items):
+        """
+        Feed the items through every stage and wait for the pipeline to drain.
+
+        Args:
+        - items (iterable): Input items for the first stage.
+
+        Raises:
+        - Exception: The first exception raised by any stage, after all threads have stopped.
+        """
+        self.error = None
+        self.failed.clear()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        threads = []
+        pools = []
+
+        for index, stage in enumerate(self.stages):
+            pool = ProcessPoolExecutor(max_workers=stage.workers) if stage.use_processes else None
+            if pool is not None:
+                pools.append(pool)
+            input_queue = queues[index]
+            output_queue = queues[index + 1] if index + 1 < len(self.stages) else None
+            downstream_workers = self.stages[index + 1].workers if output_queue is not None else 0
+            remaining = [stage.workers]
+            lock = threading.Lock()
+
+            for worker_id in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    args=(stage, pool, input_queue, output_queue, downstream_workers, remaining, lock),
+                    name=f"{stage.name}-{worker_id}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        # Feed the first stage from the calling thread; blocks when the first queue is full
+        for item in items:
+            if self.failed.is_set():
+                break
+            queues[0].put(item)
+        for _ in range(self.stages[0].workers):
+            queues[0].put(_END_OF_STREAM)
+
+        for thread in threads:
+            thread.join()
+        for pool in pools:
+            pool.shutdown()
+
+        if self.error is not None:
+            raise self.error
+
+    def _run_worker(self, stage, pool, input_queue, output_queue, downstream_workers, remaining, lock):
+        """
+        Worker loop: process items until the end-of-stream marker, then signal the next stage
+        once every worker of this stage has finished.
+        """
+        while True:
+            item = input_queue.get()
+            if item is _END_OF_STREAM:
+                break
+            # After a failure keep draining the queue so upstream stages never block forever
+            if self.failed.is_set():
+                continue
+            try:
+                if pool is not None:
+                    result = pool.submit(stage.function, item).result()
+                else:
+                    result = stage.function(item)
+                if result is not None and output_queue is not None:
+                    output_queue.put(result)
+            except Exception as e:
+                print(f"Error in pipeline stage '{stage.name}': {e}")
+                with self.error_lock:
+                    if self.error is None:
+                        self.error = e
+                self.failed.set()
+
+        with lock:
+            remaining[0] -= 1
+            last_worker = remaining[0] == 0
+        if last_worker and output_queue is not None:
+            for _ in range(downstream_workers):
+                output_queue.put(_END_OF_STREAM)
@@ -0,0 +1,70 @@
+# src/pipelines/source/write_buffer.py
+import pandas as pd
+
+class WriteBuffer:
+    """
+    Accumulates validated frames and hands them to a writer as concatenated batches.
+
+    Frames are grouped by a destination key (e.g. the output CSV path, or the DuckDB table),
+    so each flush issues one write per destination instead of one write per sheet.
+    """
+
+    def __init__(self, flush_callback, max_rows=500_000, max_bytes=256 * 1024 * 1024):
+        """
+        Initializes the WriteBuffer.
+
+        Args:
+        - flush_callback (callable): Called as `flush_callback(key, dataframe)` for each destination on flush.
+        - max_rows (int): Row threshold above which `flush_if_full` flushes. 0 flushes on every check.
+        - max_bytes (int): In-memory size threshold (bytes) above which `flush_if_full` flushes.
+        """
+        self.flush_callback = flush_callback
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.frames = {}
+        self.buffered_rows = 0
+        self.buffered_bytes = 0
+
+    def add(self, key, dataframe: pd.DataFrame):
+        """
+        Add a frame to the buffer for the given destination.
+
+        Args:
+        - key (hashable): Destination the frame will be written to.
+        - dataframe (pd.DataFrame): Validated data to buffer.
+        """
+        self.frames.setdefault(key, []).append(dataframe)
+        self.buffered_rows += len(dataframe)
+        self.buffered_bytes += int(dataframe.memory_usage(deep=True).sum())
+
+    def is_full(self):
+        """
+        Checks whether the buffered data has reached the row or byte threshold.
+
+        Returns:
+        - bool: True if the buffer should be flushed.
+        """
+        return self.buffered_rows >= self.max_rows or self.buffered_bytes >= self.max_bytes
+
+    def flush_if_full(self):
+        """
+        Flush the buffer if it has reached its row or byte threshold.
+        """
+        if self.frames and self.is_full():
+            self.flush()
+
+    def flush(self):
+        """
+        Write every buffered destination as one concatenated batch and empty the buffer.
+        """
+        frames, self.frames = self.frames, {}
+        rows = self.buffered_rows
+        self.buffered_rows = 0
+        self.buffered_bytes = 0
+
+        for key, dataframes in frames.items():
+            batch = dataframes[0] if len(dataframes) == 1 else pd.concat(dataframes, ignore_index=True)
+            self.flush_callback(key, batch)
+
+        if frames:
+            print(f"Flushed {rows} buffered rows in {sum(len(d) for d in frames.values())} frames to {len(frames)} destination(s).")
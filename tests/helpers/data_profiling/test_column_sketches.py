@@ -0,0 +1,61 @@
+import random
+import datetime
+from src.helpers.data_profiling.column_sketches import ColumnSketch, HyperLogLog, KllSketch, MisraGries
+
+def test_hyperloglog_estimates_distinct_count():
+    hll = HyperLogLog()
+    for i in range(50_000):
+        hll.add(f"value-{i % 20_000}")
+    assert abs(hll.estimate() - 20_000) / 20_000 < 0.05
+
+def test_kll_quantiles_after_merge():
+    left, right = KllSketch(), KllSketch()
+    values = list(range(100_000))
+    random.Random(7).shuffle(values)
+    for value in values[:50_000]:
+        left.add(value)
+    for value in values[50_000:]:
+        right.add(value)
+    left.merge(KllSketch.from_dict(right.to_dict()))
+
+    assert left.n == 100_000
+    assert sum(len(level) for level in left.levels) < 1_000
+    for fraction, estimate in zip([0.1, 0.5, 0.9], left.quantiles([0.1, 0.5, 0.9])):
+        assert abs(estimate - fraction * 100_000) < 2_000
+
+def test_misra_gries_keeps_heavy_hitters_across_merges():
+    left, right = MisraGries(k=8), MisraGries(k=8)
+    for i in range(10_000):
+        left.add('frequent' if i % 3 == 0 else f"rare-{i}")
+        right.add('common' if i % 5 == 0 else f"other-{i}")
+    left.merge(right)
+
+    top = dict(left.top(2))
+    assert set(top) == {'frequent', 'common'}
+    # Counts are underestimates by at most n / (k + 1)
+    assert 3_334 - 20_000 / 9 <= top['frequent'] <= 3_334
+
+def test_column_sketch_statistics_and_round_trip():
+    sketch = ColumnSketch()
+    for value in [3, 1.5, None, 7, '', 1]:
+        sketch.add(value)
+    statistics = ColumnSketch.from_dict(sketch.to_dict()).to_dict()
+
+    assert statistics['count'] == 4
+    assert statistics['null_count'] == 2
+    assert statistics['inferred_type'] == 'float'
+    assert (statistics['min'], statistics['max']) == (1, 7)
+    assert statistics['distinct_count'] == 4
+    assert statistics['quantiles']['p50'] == 1.5
+
+def test_column_sketch_merges_datetime_ranges():
+    january, march = ColumnSketch(), ColumnSketch()
+    january.add(datetime.datetime(2024, 1, 15))
+    march.add(datetime.datetime(2024, 3, 1))
+    march.add('n/a')
+    january.merge(march)
+
+    statistics = january.to_dict()
+    assert statistics['inferred_type'] == 'mixed'
+    assert statistics['type_counts'] == {'datetime': 2, 'str': 1}
+    assert january.ranges['datetime'] == ['2024-01-15T00:00:00', '2024-03-01T00:00:00']
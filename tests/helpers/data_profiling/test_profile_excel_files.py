@@ -1,14 +1,19 @@
 import os
 import json
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.chart import (BarChart)
+import zipfile
+from openpyxl import Workbook, load_workbook
+from openpyxl.chart import (BarChart, PieChart, Reference)
 from src.helpers.data_profiling.profile_excel_files import (
     detect_charts_in_sheet,
     detect_formulas_in_sheet,
     profile_excel_file,
-    profile_excel_files
+    profile_excel_files,
+    merge_profile_statistics,
+    scan_charts_in_sheet,
+    scan_formulas_in_sheet
 )
+from src.interfaces.loaders.xlsx_metadata import read_sheet_paths
 
 def test_detect_charts_in_sheet():
     # Create a mock worksheet with a chart
@@ -85,3 +90,153 @@ def test_profile_excel_files(tmp_path):
     assert profiles[str(excel_path)]['Sheet1']['num_columns'] == 3
     assert os.path.exists(output_dir / "file1.json")
 
+
+def test_profile_excel_file_column_statistics(tmp_path):
+    # Create a mock Excel file with a trailing blank row
+    file_path = tmp_path / "test.xlsx"
+    df = pd.DataFrame({
+        'A': [1, 2, 3, None],
+        'B': ['x', 'y', 'x', None],
+    })
+    df.to_excel(file_path, index=False)
+
+    profile = profile_excel_file(file_path)
+    statistics = profile['Sheet1']['column_statistics']
+    assert profile['Sheet1']['num_rows'] == 3
+    assert statistics['A']['inferred_type'] == 'int'
+    assert (statistics['A']['min'], statistics['A']['max']) == (1, 3)
+    assert statistics['B']['distinct_count'] == 2
+    assert statistics['B']['top_values'][0] == ['x', 2]
+
+    # Profiles survive JSON and merge into corpus-level statistics
+    other_path = tmp_path / "other.xlsx"
+    pd.DataFrame({'A': [10, 20], 'C': ['z', 'z']}).to_excel(other_path, index=False)
+    profiles = [json.loads(json.dumps(profile_excel_file(path), default=str)) for path in (file_path, other_path)]
+    merged = merge_profile_statistics(profiles)
+    assert set(merged) == {'A', 'B', 'C'}
+    assert merged['A']['count'] == 5
+    assert merged['A']['max'] == 20
+    assert merged['A']['distinct_count'] == 5
+
+def test_scan_matches_object_model_detection(tmp_path):
+    # Create a workbook with formulas in two columns and a chart on one of two sheets
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for i in range(1, 6):
+        ws.append([i, f"=A{i}*2", None])
+    ws['C5'] = "=SUM(B1:B4)"
+    chart = PieChart()
+    chart.add_data(Reference(ws, min_col=1, min_row=1, max_row=5))
+    ws.add_chart(chart, "E2")
+    wb.create_sheet("Plain").append([1, 2, 3])
+    file_path = tmp_path / "scan.xlsx"
+    wb.save(file_path)
+
+    workbook = load_workbook(file_path)
+    with zipfile.ZipFile(file_path) as archive:
+        sheet_paths = read_sheet_paths(archive)
+        for sheet_name in workbook.sheetnames:
+            worksheet = workbook[sheet_name]
+            assert scan_charts_in_sheet(archive, sheet_paths[sheet_name]) == detect_charts_in_sheet(worksheet)
+            assert scan_formulas_in_sheet(archive, sheet_paths[sheet_name]) == detect_formulas_in_sheet(worksheet)
+
+    profile = profile_excel_file(file_path)
+    assert profile['Data']['charts'] == True
+    assert profile['Data']['columns_with_formulas'] == {'B': '=A1*2', 'C': '=SUM(B1:B4)'}
+    assert profile['Plain']['contains_formulas'] == False
+
+def test_profile_excel_file_sampled_mode(tmp_path):
+    # Create a workbook with mixed types, missing values and a formula column
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['Id', 'Name', 'Date', 'Score', 'Total'])
+    for i in range(1, 2001):
+        ws.append([i, f"name-{i % 7}", pd.Timestamp('2024-01-01') + pd.Timedelta(days=i % 30),
+                   None if i % 4 == 0 else i / 2, f"=A{i + 1}*2"])
+    file_path = tmp_path / "large.xlsx"
+    wb.save(file_path)
+
+    full = profile_excel_file(file_path)['Sheet']
+    sampled = profile_excel_file(file_path, sample_size=200)['Sheet']
+
+    # Extent, header and formula presence are exact
+    for key in ['columns', 'num_rows', 'num_columns', 'contains_formulas', 'columns_with_formulas', 'charts']:
+        assert sampled[key] == full[key]
+    assert sampled['profile_mode'] == 'sampled'
+    assert sampled['statistics_accuracy']['num_rows'] == 'exact'
+    assert sampled['statistics_accuracy']['missing_values_percentage'] == 'estimated'
+    # Statistics come from the sample
+    assert sampled['sampled_rows'] == 200
+    assert sampled['column_statistics']['Id']['count'] == 200
+    assert sampled['column_statistics']['Date']['inferred_type'] == 'datetime'
+    assert sampled['column_statistics']['Name']['distinct_count'] == 7
+    assert abs(sampled['missing_values_percentage']['Score'] - 0.25) < 0.1
+
+    # Sampling every row reproduces the full profile's values
+    exhaustive = profile_excel_file(file_path, sample_size=5000)['Sheet']
+    assert exhaustive['missing_values_percentage'] == full['missing_values_percentage']
+    assert exhaustive['column_statistics']['Score']['min'] == full['column_statistics']['Score']['min']
+
+def test_profile_excel_file_sampled_mode_counts_rows_not_stored(tmp_path):
+    # Rows without any cell are not stored in the sheet XML but still count as rows
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['A', 'B'])
+    ws.append([1, 2])
+    ws['A6'] = 5
+    file_path = tmp_path / "gaps.xlsx"
+    wb.save(file_path)
+
+    full = profile_excel_file(file_path)['Sheet']
+    sampled = profile_excel_file(file_path, sample_size=10)['Sheet']
+    assert sampled['num_rows'] == full['num_rows'] == 5
+    assert sampled['missing_values_percentage'] == full['missing_values_percentage']
+
+def test_profile_excel_file_sampled_mode_ignores_styled_trailing_rows(tmp_path):
+    # Column A is bold down to row 500 but only the first 100 rows hold values
+    from openpyxl.styles import Font
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['A', 'B'])
+    for idx in range(99):
+        ws.append([idx, idx * 2])
+    for row in range(1, 501):
+        ws.cell(row=row, column=1).font = Font(bold=True)
+    file_path = tmp_path / "styled.xlsx"
+    wb.save(file_path)
+
+    full = profile_excel_file(file_path)['Sheet']
+    sampled = profile_excel_file(file_path, sample_size=50)['Sheet']
+    assert sampled['num_rows'] == full['num_rows'] == 99
+    assert sampled['missing_values_percentage'] == full['missing_values_percentage'] == {'A': 0.0, 'B': 0.0}
+    assert sampled['sampled_rows'] == 50
+    assert sampled['column_statistics']['A']['null_count'] == 0
+
+def test_profile_excel_file_columns_span_widest_row(tmp_path):
+    # Values past the header's last cell, and a blank header row, get 'Unnamed: n' columns as in pd.read_excel
+    wb = Workbook()
+    ws = wb.active
+    ws.append(['a', 'b'])
+    ws.append([1, 2, 3])
+    ws.append([4, None])
+    wide_path = tmp_path / "wide.xlsx"
+    wb.save(wide_path)
+
+    wb = Workbook()
+    ws = wb.active
+    ws['A2'], ws['B2'] = 'x', 'y'
+    for row in range(3, 6):
+        ws.cell(row=row, column=1, value=row)
+        ws.cell(row=row, column=2, value=row * 2)
+    blank_header_path = tmp_path / "blank_header.xlsx"
+    wb.save(blank_header_path)
+
+    for file_path in [wide_path, blank_header_path]:
+        expected = pd.read_excel(file_path)
+        for sample_size in [None, 100]:
+            profile = profile_excel_file(file_path, sample_size=sample_size)['Sheet']
+            assert profile['columns'] == list(expected.columns)
+            assert profile['num_rows'] == len(expected)
+            assert profile['missing_values_percentage'] == {
+                column: round(expected[column].isna().mean(), 4) for column in expected.columns}
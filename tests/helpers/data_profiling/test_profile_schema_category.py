@@ -5,7 +5,8 @@ from src.helpers.data_profiling.profile_schema_category import (
     traverse_files,
     filter_columns,
     check_schema_match,
-    categorize_files
+    categorize_files,
+    main
 )
 
 
@@ -54,3 +55,60 @@ def test_categorize_files():
     assert len(categorized['exact_match_groups']) == 2
     assert "Schema 1" in categorized['exact_match_groups']
     assert "Schema 2" in categorized['exact_match_groups']
+
+def write_profile(path, filepath, sheets):
+    with open(path, 'w') as f:
+        json.dump({"filepath": filepath, **{sheet: {"columns": columns} for sheet, columns in sheets.items()}}, f)
+
+def test_main_recategorizes_only_changed_profiles(tmp_path, monkeypatch):
+    from src.helpers.data_profiling import profile_schema_category
+
+    json_dir = tmp_path / "json_files"
+    json_dir.mkdir()
+    output_dir = tmp_path / "output"
+    schemas_path = tmp_path / "schemas.json"
+    with open(schemas_path, 'w') as f:
+        json.dump({"Schema 1": ["Column A", "Column B"], "Schema 2": ["Column C", "Column D"]}, f)
+    write_profile(json_dir / "file1.json", "file1.xlsx", {"Sheet1": ["Column A", "Column B"]})
+    write_profile(json_dir / "file2.json", "file2.xlsx", {"Sheet1": ["Column C", "Column D"]})
+    main(str(json_dir), str(output_dir), "categories", str(schemas_path))
+
+    loaded = []
+    original_load = profile_schema_category.load_json_file
+    monkeypatch.setattr(profile_schema_category, "load_json_file",
+                        lambda path: loaded.append(path) or original_load(path))
+
+    # A new profile and a changed one: only those are loaded
+    write_profile(json_dir / "file3.json", "file3.xlsx", {"Sheet1": ["Column A", "Column B", "Column E"]})
+    write_profile(json_dir / "file2.json", "file2.xlsx", {"Sheet1": ["Column A", "Column B"], "Sheet2": ["Column C"]})
+    main(str(json_dir), str(output_dir), "categories", str(schemas_path))
+    assert sorted(os.path.basename(path) for path in loaded if path.startswith(str(json_dir))) == [
+        "file2.json", "file3.json"]
+
+    with open(output_dir / "categories.json") as f:
+        incremental = json.load(f)
+    main(str(json_dir), str(output_dir), "full", str(schemas_path), incremental=False)
+    with open(output_dir / "full.json") as f:
+        assert incremental == json.load(f)
+    assert sorted(entry[:2] for entry in incremental['exact_match_groups']['Schema 1']) == [
+        ["file1.xlsx", "Sheet1"], ["file2.xlsx", "Sheet1"]]
+    assert "Schema 2" not in incremental['exact_match_groups']
+
+def test_main_recomputes_all_profiles_when_schemas_change(tmp_path):
+    json_dir = tmp_path / "json_files"
+    json_dir.mkdir()
+    output_dir = tmp_path / "output"
+    schemas_path = tmp_path / "schemas.json"
+    with open(schemas_path, 'w') as f:
+        json.dump({"Schema 1": ["Column A", "Column B"]}, f)
+    write_profile(json_dir / "file1.json", "file1.xlsx", {"Sheet1": ["Column A", "Column B", "Column C"]})
+    main(str(json_dir), str(output_dir), "categories", str(schemas_path))
+
+    with open(schemas_path, 'w') as f:
+        json.dump({"Schema 1": ["Column A", "Column B", "Column C"]}, f)
+    main(str(json_dir), str(output_dir), "categories", str(schemas_path))
+
+    with open(output_dir / "categories.json") as f:
+        categorized = json.load(f)
+    assert list(categorized['exact_match_groups']) == ["Schema 1"]
+    assert categorized['extended_match_groups'] == {}
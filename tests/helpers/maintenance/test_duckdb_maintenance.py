@@ -0,0 +1,53 @@
+# tests/helpers/maintenance/test_duckdb_maintenance.py
+
+import os
+import duckdb
+import numpy as np
+import pandas as pd
+import pytest
+from src.helpers.maintenance.duckdb_maintenance import compact, report, rewrite_table, vacuum
+
+@pytest.fixture()
+def create_churned_duckdb_db(tmp_path):
+    """Fixture to create a bronze table whose partitions were re-upserted several times."""
+    db_path = os.path.join(tmp_path, 'test_db.duckdb')
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame({'Column1': np.arange(300_000), 'source_filepath': rng.integers(0, 20, 300_000).astype(str)})
+    conn = duckdb.connect(db_path)
+    conn.execute("CREATE SCHEMA test_schema")
+    conn.execute("CREATE TABLE test_schema.test_table AS SELECT * FROM data")
+    # Re-upsert a few partitions the way DuckdbWriter does
+    for partition in ['0', '1', '2']:
+        conn.execute("DELETE FROM test_schema.test_table WHERE source_filepath = ?", [partition])
+        conn.execute("INSERT INTO test_schema.test_table SELECT * FROM data WHERE source_filepath = ?", [partition])
+    conn.close()
+    return db_path
+
+def test_report(create_churned_duckdb_db):
+    """Test that the report counts live rows and measures partition spread."""
+    fragmentation = report(create_churned_duckdb_db, partition_columns=['source_filepath'])
+
+    row = fragmentation.iloc[0]
+    assert (row['schema'], row['table'], row['live_rows']) == ('test_schema', 'test_table', 300_000)
+    assert row['row_groups_per_partition'] > row['ideal_row_groups_per_partition']
+
+def test_rewrite_table_clusters_partitions(create_churned_duckdb_db):
+    """Test that rewriting sorted by the partition column keeps the rows and clusters the partitions."""
+    vacuum(create_churned_duckdb_db)
+    rewrite_table(create_churned_duckdb_db, 'test_schema', 'test_table', ['source_filepath'])
+
+    row = report(create_churned_duckdb_db, partition_columns=['source_filepath']).iloc[0]
+    assert row['live_rows'] == 300_000
+    assert row['deleted_rows'] == 0
+    assert row['row_groups_per_partition'] <= row['ideal_row_groups_per_partition'] + 1
+
+def test_compact_keeps_data(create_churned_duckdb_db):
+    """Test that compaction copies every table into a file that is no larger than the original."""
+    rewrite_table(create_churned_duckdb_db, 'test_schema', 'test_table', ['source_filepath'])
+
+    size_before, size_after = compact(create_churned_duckdb_db)
+
+    assert size_after <= size_before
+    conn = duckdb.connect(create_churned_duckdb_db, read_only=True)
+    assert conn.execute("SELECT count(*), sum(Column1) FROM test_schema.test_table").fetchone() == (300_000, sum(range(300_000)))
+    conn.close()
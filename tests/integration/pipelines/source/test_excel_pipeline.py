@@ -35,6 +35,7 @@ def temp_dirs():
         for file in os.listdir(sub_dir):
             os.remove(os.path.join(sub_dir, file))
         os.rmdir(sub_dir)
+    os.rmdir(datalake_dir)
     os.rmdir(tmp_base_dir)  # Remove the top-level test directory
 
 @pytest.fixture()
@@ -236,6 +237,405 @@ def test_ingest_pipeline_duckdb(create_test_files, temp_dirs, create_test_schema
 
     print("DuckDB writer test passed successfully!")
 
+def test_ingest_pipeline_staged(create_test_files, temp_dirs, create_test_schema):
+    import duckdb
+    """Test the ingest_pipeline function with the staged executor and compact normalization."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+
+    # Create a unique configuration file dynamically
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_staged_{unique_id}.yaml')
+    db_path = os.path.join(bronze_dir, 'test_duckdb.db')
+
+    # Create a DuckDB connection and schema
+    conn = duckdb.connect(db_path)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS main_bronze;")
+    conn.close()
+
+    with open(config_path, 'w') as config_file:
+        config_file.write(f"""
+        name: "Test_Staged_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files:
+          - file_name: "test_file_1.xlsx"
+            file_type: "excel"
+            path: "{os.path.join(source_dir, 'test_file_1.xlsx')}"
+            loader_config:
+              tab_names:
+                - "Sheet1"
+
+          - file_name: "test_file_2.xlsx"
+            file_type: "excel"
+            path: "{os.path.join(source_dir, 'test_file_2.xlsx')}"
+            loader_config:
+              tab_names:
+                - "Sheet2"
+
+        execution:
+          mode: "staged"
+          queue_size: 1
+          load_workers: 2
+          load_processes: true
+
+        normalization:
+          compact: true
+          report_memory: true
+
+        target:
+          type: "duckdb"
+          writer_config:
+            destination: "{db_path}"
+            namespace: "main_bronze"
+            table_name: "example"
+            partition_by:
+              - source_filepath
+              - source_sheetname
+            buffer:
+              max_rows: 0
+          schema:
+            path: "{schema_path}"
+        """)
+
+    # Run the ingest pipeline
+    ingest_pipeline(config_path)
+
+    # Both files are written, regardless of the order the load workers finished in
+    conn = duckdb.connect(db_path)
+    result_df = conn.execute("SELECT * FROM main_bronze.example ORDER BY Column1").fetchdf()
+    conn.close()
+
+    assert result_df['Column1'].tolist() == [1, 2, 3, 4, 5, 6, 7, 8]
+    assert set(result_df['source_sheetname']) == {'Sheet1', 'Sheet2'}
+
 if __name__ == "__main__":
     test_ingest_pipeline_csv()
     test_ingest_pipeline_duckdb()
+
+def test_ingest_pipeline_csv_source(temp_dirs, create_test_schema):
+    import duckdb
+    """Test the ingest_pipeline function with a CSV source file loaded by the CsvLoader."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+
+    # Create a CSV source, e.g. an output of the Airflow DAG
+    csv_path = os.path.join(source_dir, 'test_file_1_Sheet1.csv')
+    pd.DataFrame({'Column1': [1, 2, 3], 'Column2': ['A', None, 'C'], 'Extra': [0, 0, 0]}).to_csv(csv_path, index=False)
+
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_csv_source_{unique_id}.yaml')
+    db_path = os.path.join(bronze_dir, 'test_duckdb.db')
+
+    conn = duckdb.connect(db_path)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS main_bronze;")
+    conn.close()
+
+    with open(config_path, 'w') as config_file:
+        config_file.write(f"""
+        name: "Test_CSV_source_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files:
+          - file_name: "test_file_1_Sheet1.csv"
+            file_type: "csv"
+            path: "{csv_path}"
+
+        target:
+          type: "duckdb"
+          writer_config:
+            destination: "{db_path}"
+            namespace: "main_bronze"
+            table_name: "example"
+            partition_by:
+              - source_filepath
+              - source_sheetname
+          schema:
+            path: "{schema_path}"
+        """)
+
+    # Run the ingest pipeline
+    ingest_pipeline(config_path)
+
+    conn = duckdb.connect(db_path)
+    result_df = conn.execute("SELECT * FROM main_bronze.example ORDER BY Column1").fetchdf()
+    conn.close()
+
+    assert result_df['Column1'].tolist() == [1, 2, 3]
+    assert 'Extra' not in result_df.columns
+    assert set(result_df['source_sheetname']) == {'test_file_1_Sheet1'}
+
+def test_ingest_pipeline_resume(create_test_files, temp_dirs, create_test_schema):
+    import duckdb
+    """Test that a resumed run skips the sheets checkpointed by the interrupted run."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_resume_{unique_id}.yaml')
+    db_path = os.path.join(bronze_dir, 'test_duckdb.db')
+
+    conn = duckdb.connect(db_path)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS main_bronze;")
+    conn.close()
+
+    def write_config(file_names):
+        source_files = ''.join(f"""
+          - file_name: "{file_name}"
+            file_type: "excel"
+            path: "{os.path.join(source_dir, file_name)}"
+            loader_config:
+              tab_names:
+                - "{sheet_name}"
+""" for file_name, sheet_name in file_names)
+        with open(config_path, 'w') as config_file:
+            config_file.write(f"""
+        name: "Test_Resume_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files:
+{source_files}
+        checkpoint:
+          enabled: true
+
+        target:
+          type: "duckdb"
+          writer_config:
+            destination: "{db_path}"
+            namespace: "main_bronze"
+            table_name: "example"
+            partition_by:
+              - source_filepath
+              - source_sheetname
+          schema:
+            path: "{schema_path}"
+        """)
+
+    # The interrupted run only got through the first file
+    write_config([('test_file_1.xlsx', 'Sheet1')])
+    ingest_pipeline(config_path)
+
+    # The resumed run skips it and loads the remaining file under the same run id
+    write_config([('test_file_1.xlsx', 'Sheet1'), ('test_file_2.xlsx', 'Sheet2')])
+    ingest_pipeline(config_path, overwrite=True, resume=True)
+
+    conn = duckdb.connect(db_path)
+    checkpoints = conn.execute(
+        "SELECT run_id, source_sheetname, rows_written FROM main_bronze.ingestion_checkpoints "
+        "WHERE status = 'completed' ORDER BY recorded_at"
+    ).fetchall()
+    started_runs = conn.execute(
+        "SELECT DISTINCT run_id FROM main_bronze.ingestion_checkpoints WHERE status = 'started'"
+    ).fetchall()
+    row_count = conn.execute("SELECT count(*) FROM main_bronze.example").fetchone()[0]
+    conn.close()
+
+    assert [(sheet, rows) for _, sheet, rows in checkpoints] == [('Sheet1', 4), ('Sheet2', 4)]
+    assert checkpoints[0][0] == checkpoints[1][0]
+    assert started_runs == [(checkpoints[0][0],)]
+    assert row_count == 8
+
+def test_ingest_pipeline_explain(create_test_files, temp_dirs, create_test_schema, capsys):
+    """Test that --explain prints the plan and writes nothing."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_explain_{unique_id}.yaml')
+    with open(config_path, 'w') as config_file:
+        config_file.write(f"""
+        name: "Test_Explain_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files:
+          - file_name: "test_file_1.xlsx"
+            file_type: "excel"
+            path: "{os.path.join(source_dir, 'test_file_1.xlsx')}"
+            loader_config:
+              tab_names:
+                - "Sheet1"
+
+        target:
+          type: "csv"
+          writer_config:
+            destination: "{bronze_dir}"
+          schema:
+            path: "{schema_path}"
+        """)
+
+    plan = ingest_pipeline(config_path, explain=True)
+
+    assert plan[0]['estimated_rows'] == 4
+    assert 'Execution plan: 1 files' in capsys.readouterr().out
+    assert os.listdir(bronze_dir) == []
+
+def test_watch_pipeline(create_test_files, temp_dirs, create_test_schema):
+    import duckdb
+    from src.pipelines.source.excel_ingestion_process import watch_pipeline
+    """Test that the watch mode ingests the workbooks found in the watched directory."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_watch_{unique_id}.yaml')
+    db_path = os.path.join(bronze_dir, 'test_duckdb.db')
+
+    conn = duckdb.connect(db_path)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS main_bronze;")
+    conn.close()
+
+    with open(config_path, 'w') as config_file:
+        config_file.write(f"""
+        name: "Test_Watch_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files: []
+
+        watch:
+          directories:
+            - "{source_dir}"
+          patterns:
+            - "*.xlsx"
+          poll_interval: 0
+          settle_seconds: 0
+          ingest_existing: true
+
+        target:
+          type: "duckdb"
+          writer_config:
+            destination: "{db_path}"
+            namespace: "main_bronze"
+            table_name: "example"
+            partition_by:
+              - source_filepath
+              - source_sheetname
+          schema:
+            path: "{schema_path}"
+        """)
+
+    # The first poll sees the files, the second one ingests them once they have settled
+    watch_pipeline(config_path, max_polls=2)
+
+    conn = duckdb.connect(db_path)
+    sheets = conn.execute("SELECT source_sheetname, count(*) FROM main_bronze.example GROUP BY ALL ORDER BY 1").fetchall()
+    conn.close()
+
+    assert sheets == [('Sheet1', 4), ('Sheet2', 4)]
+
+def test_ingest_pipeline_dedup(create_test_files, temp_dirs, create_test_schema):
+    import duckdb
+    import shutil
+    """Test that a renamed copy of a workbook is aliased to the original instead of loaded again."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+    shutil.copy(os.path.join(source_dir, 'test_file_1.xlsx'), os.path.join(source_dir, 'test_file_1_copy.xlsx'))
+
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_dedup_{unique_id}.yaml')
+    db_path = os.path.join(bronze_dir, 'test_duckdb.db')
+
+    conn = duckdb.connect(db_path)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS main_bronze;")
+    conn.close()
+
+    source_files = ''.join(f"""
+          - file_name: "{file_name}"
+            file_type: "excel"
+            path: "{os.path.join(source_dir, file_name)}"
+            loader_config:
+              tab_names:
+                - "Sheet1"
+""" for file_name in ['test_file_1.xlsx', 'test_file_1_copy.xlsx'])
+    with open(config_path, 'w') as config_file:
+        config_file.write(f"""
+        name: "Test_Dedup_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files:
+{source_files}
+        dedup:
+          enabled: true
+          mode: alias
+
+        target:
+          type: "duckdb"
+          writer_config:
+            destination: "{db_path}"
+            namespace: "main_bronze"
+            table_name: "example"
+            partition_by:
+              - source_filepath
+              - source_sheetname
+          schema:
+            path: "{schema_path}"
+        """)
+
+    ingest_pipeline(config_path)
+
+    conn = duckdb.connect(db_path)
+    loaded_files = conn.execute("SELECT DISTINCT source_filepath FROM main_bronze.example").fetchall()
+    aliases = conn.execute(
+        "SELECT source_filepath, original_filepath FROM main_bronze.sheet_content_index WHERE status = 'alias'"
+    ).fetchall()
+    conn.close()
+
+    assert loaded_files == [(os.path.join(source_dir, 'test_file_1.xlsx'),)]
+    assert aliases == [(os.path.join(source_dir, 'test_file_1_copy.xlsx'), os.path.join(source_dir, 'test_file_1.xlsx'))]
+
+def test_ingest_pipeline_resource_budget(create_test_files, temp_dirs, create_test_schema):
+    import duckdb
+    """Test that a staged run applies the resource budget and completes within it."""
+    source_dir, bronze_dir, configs_dir, schemas_dir = temp_dirs
+    schema_path = create_test_schema
+
+    unique_id = uuid.uuid4()
+    config_path = os.path.join(configs_dir, f'test_config_budget_{unique_id}.yaml')
+    db_path = os.path.join(bronze_dir, 'test_duckdb.db')
+
+    conn = duckdb.connect(db_path)
+    conn.execute(f"CREATE SCHEMA IF NOT EXISTS main_bronze;")
+    conn.close()
+
+    source_files = ''.join(f"""
+          - file_name: "{file_name}"
+            file_type: "excel"
+            path: "{os.path.join(source_dir, file_name)}"
+            loader_config:
+              tab_names:
+                - "{sheet_name}"
+""" for file_name, sheet_name in [('test_file_1.xlsx', 'Sheet1'), ('test_file_2.xlsx', 'Sheet2')])
+    with open(config_path, 'w') as config_file:
+        config_file.write(f"""
+        name: "Test_Budget_pipeline_{unique_id}"
+        version: "1.0"
+
+        source_files:
+{source_files}
+        execution:
+          mode: "staged"
+          load_workers: 4
+
+        resources:
+          memory_limit: "256MiB"
+          threads: 1
+
+        target:
+          type: "duckdb"
+          writer_config:
+            destination: "{db_path}"
+            namespace: "main_bronze"
+            table_name: "example"
+            partition_by:
+              - source_filepath
+              - source_sheetname
+          schema:
+            path: "{schema_path}"
+        """)
+
+    ingest_pipeline(config_path)
+
+    conn = duckdb.connect(db_path)
+    row_count = conn.execute("SELECT count(*) FROM main_bronze.example").fetchone()[0]
+    conn.close()
+
+    assert row_count == 8
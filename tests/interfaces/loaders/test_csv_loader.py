@@ -0,0 +1,50 @@
+# tests/interfaces/loaders/test_csv_loader.py
+
+import os
+import pandas as pd
+import pytest
+from src.interfaces.loaders.csv_loader import CsvLoader
+
+@pytest.fixture()
+def create_test_csv_file(tmp_path):
+    """Fixture to create a temporary CSV file with missing values for testing."""
+    test_file_path = os.path.join(tmp_path, 'test_file.csv')
+    data = {'Column1': [1, 2, None, 4], 'Column2': ['A', None, 'C', 'D'], 'Code': ['001', '002', '003', '004']}
+    pd.DataFrame(data).to_csv(test_file_path, index=False)
+    return test_file_path
+
+def test_csv_loader(create_test_csv_file):
+    """Test that the CsvLoader returns the same data as pandas.read_csv."""
+    loader = CsvLoader()
+
+    data = loader.load(create_test_csv_file)
+
+    assert list(data) == ['test_file']
+    expected = pd.read_csv(create_test_csv_file)
+    pd.testing.assert_frame_equal(data['test_file'], expected)
+
+def test_csv_loader_projection_and_dtypes(create_test_csv_file):
+    """Test that only schema columns are parsed, missing columns are ignored and dtype hints are applied."""
+    loader = CsvLoader()
+
+    data = loader.load(create_test_csv_file, sheet_names=['bronze'], columns=['Code', 'Column2', 'Missing'], dtypes={'Code': str})
+
+    assert list(data['bronze'].columns) == ['Code', 'Column2']
+    assert data['bronze']['Code'].tolist() == ['001', '002', '003', '004']
+    assert pd.isna(data['bronze']['Column2'][1])
+
+def test_csv_loader_compressed(create_test_csv_file, tmp_path):
+    """Test that gzip-compressed CSV files are decompressed transparently."""
+    compressed_path = os.path.join(tmp_path, 'test_file.csv.gz')
+    pd.read_csv(create_test_csv_file).to_csv(compressed_path, index=False, compression='gzip')
+
+    data = CsvLoader().load(compressed_path)
+
+    assert len(data['test_file']) == 4
+
+def test_csv_loader_iter_batches(create_test_csv_file):
+    """Test that streamed batches add up to the whole file."""
+    batches = list(CsvLoader().iter_batches(create_test_csv_file, block_size=32))
+
+    assert len(batches) > 1
+    assert sum(batch.num_rows for batch in batches) == 4
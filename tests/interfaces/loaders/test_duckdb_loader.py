@@ -0,0 +1,68 @@
+# tests/interfaces/loaders/test_duckdb_loader.py
+
+import os
+import duckdb
+import pandas as pd
+import pytest
+from src.interfaces.loaders.duckdb_loader import DuckdbLoader, build_select_query
+
+@pytest.fixture()
+def create_test_duckdb_table(tmp_path):
+    """Fixture to create a DuckDB database with a partitioned bronze table."""
+    db_path = os.path.join(tmp_path, 'test_db.duckdb')
+    data = pd.DataFrame({
+        'Column1': [1, 2, 3, 4],
+        'Column2': ['A', None, 'C', 'D'],
+        'source_filepath': ['a.xlsx', 'a.xlsx', 'b.xlsx', 'c.xlsx'],
+    })
+    conn = duckdb.connect(db_path)
+    conn.execute("CREATE SCHEMA test_schema")
+    conn.execute("CREATE TABLE test_schema.test_table AS SELECT * FROM data")
+    conn.close()
+    return db_path
+
+def test_duckdb_loader(create_test_duckdb_table):
+    """Test that the DuckdbLoader reads a whole table into a DataFrame."""
+    data = DuckdbLoader().load(create_test_duckdb_table, ['test_schema.test_table'])
+
+    result = data['test_schema.test_table']
+    assert result['Column1'].tolist() == [1, 2, 3, 4]
+    assert pd.isna(result['Column2'][1])
+
+def test_duckdb_loader_projection_and_filters(create_test_duckdb_table):
+    """Test that only the requested columns and partitions are returned as Arrow batches."""
+    reader = DuckdbLoader().iter_batches(create_test_duckdb_table, 'test_schema.test_table',
+                                         columns=['Column1', 'Missing'],
+                                         filters={'source_filepath': ['a.xlsx', 'c.xlsx']}, batch_size=1)
+
+    batches = list(reader)
+    assert len(batches) == 3
+    assert [name for name in batches[0].schema.names] == ['Column1']
+    assert sorted(value for batch in batches for value in batch.column('Column1').to_pylist()) == [1, 2, 4]
+
+def test_build_select_query_null_filter():
+    """Test that scalar filters match NULLs and identifiers are quoted."""
+    query, parameters = build_select_query('test_schema.test_table', ['Column1'], {'Column2': None})
+
+    assert query == 'SELECT "Column1" FROM "test_schema"."test_table" WHERE "Column2" IS NOT DISTINCT FROM ?'
+    assert parameters == [None]
+
+@pytest.mark.parametrize("batches_read", [0, 1])
+def test_duckdb_loader_closes_dropped_readers(create_test_duckdb_table, batches_read):
+    """Test that the read-only connection is closed when a reader is dropped, iterated or not."""
+    reader = DuckdbLoader().iter_batches(create_test_duckdb_table, 'test_schema.test_table', batch_size=1)
+    for _ in range(batches_read):
+        reader.read_next_batch()
+    del reader
+
+    # DuckDB refuses a read-write connection while a read-only one is open in this process
+    conn = duckdb.connect(create_test_duckdb_table)
+    conn.close()
+
+def test_duckdb_loader_caller_connection(create_test_duckdb_table):
+    """Test that a connection passed by the caller is used and left open."""
+    with duckdb.connect(create_test_duckdb_table, read_only=True) as conn:
+        reader = DuckdbLoader().iter_batches(create_test_duckdb_table, 'test_schema.test_table',
+                                             filters={'source_filepath': 'b.xlsx'}, conn=conn)
+        assert reader.read_all().column('Column1').to_pylist() == [3]
+        assert conn.execute("SELECT 1").fetchone() == (1,)
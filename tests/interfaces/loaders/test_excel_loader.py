@@ -3,7 +3,9 @@
 import os
 import pandas as pd
 import pytest
-from src.interfaces.loaders.excel_loader import ExcelLoader
+from openpyxl import load_workbook
+from openpyxl.worksheet._reader import WorkSheetParser
+from src.interfaces.loaders.excel_loader import ExcelLoader, check_openpyxl_internals
 
 @pytest.fixture()
 def create_test_excel_file(tmp_path):
@@ -27,3 +29,130 @@ def test_excel_loader(create_test_excel_file):
     # Verify that the data is loaded correctly
     assert 'Sheet1' in data
     assert data['Sheet1'].equals(pd.DataFrame({'Column1': [1, 2, 3, 4], 'Column2': ['A', 'B', 'C', 'D']}))
+
+@pytest.fixture()
+def create_mixed_type_excel_file(tmp_path):
+    """Fixture to create an Excel file with mixed dtypes and missing values."""
+    test_file_path = os.path.join(tmp_path, 'mixed_file.xlsx')
+    data = pd.DataFrame({
+        'Integer': [1, 2, 3],
+        'IntegerWithGap': [1, None, 3],
+        'Float': [1.5, 2.0, 3.25],
+        'String': ['A', None, 'C'],
+        'Date': pd.to_datetime(['2024-01-01', '2024-01-02', None]),
+        'Bool': [True, False, True],
+    })
+    with pd.ExcelWriter(test_file_path, engine='openpyxl') as writer:
+        data.to_excel(writer, sheet_name='Sheet1', index=False)
+        data.to_excel(writer, sheet_name='Sheet2', index=False)
+    return test_file_path
+
+@pytest.mark.parametrize("engine", ["openpyxl_stream", "calamine"])
+def test_excel_loader_engines_match_openpyxl(create_mixed_type_excel_file, engine):
+    """Test that every engine returns the same values and dtypes as the default openpyxl engine."""
+    if engine == "calamine":
+        pytest.importorskip("python_calamine")
+    loader = ExcelLoader()
+    sheet_names = ['Sheet1', 'Sheet2']
+
+    expected = loader.load(create_mixed_type_excel_file, sheet_names)
+    data = loader.load(create_mixed_type_excel_file, sheet_names, engine=engine)
+
+    assert list(data) == sheet_names
+    for sheet_name in sheet_names:
+        assert data[sheet_name].dtypes.equals(expected[sheet_name].dtypes)
+        pd.testing.assert_frame_equal(data[sheet_name], expected[sheet_name])
+
+def test_excel_loader_invalid_engine(create_test_excel_file):
+    """Test that an unknown engine is rejected."""
+    with pytest.raises(ValueError):
+        ExcelLoader().load(create_test_excel_file, ['Sheet1'], engine='xlrd2')
+
+@pytest.mark.parametrize("engine", ["openpyxl", "openpyxl_stream", "calamine"])
+def test_excel_loader_projection(create_mixed_type_excel_file, engine):
+    """Test that only the requested columns and rows are parsed, with dtype hints applied."""
+    if engine == "calamine":
+        pytest.importorskip("python_calamine")
+    loader = ExcelLoader()
+
+    data = loader.load(create_mixed_type_excel_file, ['Sheet1'], engine=engine,
+                       columns=['Integer', 'String', 'NotInSheet'], max_rows=2,
+                       dtypes={'Integer': str, 'NotInSheet': str})
+
+    sheet_data = data['Sheet1']
+    assert list(sheet_data.columns) == ['Integer', 'String']
+    assert sheet_data['Integer'].tolist() == ['1', '2']
+    assert sheet_data['String'].iloc[0] == 'A'
+    assert pd.isna(sheet_data['String'].iloc[1])
+
+def test_excel_loader_header_row(tmp_path):
+    """Test loading a sheet whose header is not on the first row."""
+    test_file_path = os.path.join(tmp_path, 'offset_header.xlsx')
+    data = pd.DataFrame({'Column1': [1, 2], 'Column2': ['A', 'B']})
+    with pd.ExcelWriter(test_file_path, engine='openpyxl') as writer:
+        data.to_excel(writer, sheet_name='Sheet1', index=False, startrow=2)
+
+    for engine in ['openpyxl', 'openpyxl_stream']:
+        loaded = ExcelLoader().load(test_file_path, ['Sheet1'], engine=engine, header_row=2, columns=['Column2'])
+        assert loaded['Sheet1'].equals(pd.DataFrame({'Column2': ['A', 'B']}))
+
+@pytest.mark.parametrize("engine", ["openpyxl", "openpyxl_stream", "calamine"])
+def test_excel_loader_projection_numeric_headers(tmp_path, engine):
+    """Test that every engine matches numeric header cells against the projected column names."""
+    if engine == "calamine":
+        pytest.importorskip("python_calamine")
+    test_file_path = os.path.join(tmp_path, 'numeric_header.xlsx')
+    data = pd.DataFrame([[1, 2, 3]], columns=['Name', 2024, 2025])
+    with pd.ExcelWriter(test_file_path, engine='openpyxl') as writer:
+        data.to_excel(writer, sheet_name='Sheet1', index=False)
+
+    loaded = ExcelLoader().load(test_file_path, ['Sheet1'], engine=engine, columns=['Name', '2024'])
+
+    assert loaded['Sheet1'].values.tolist() == [[1, 2]]
+
+def test_openpyxl_internals_available(create_test_excel_file):
+    """Test that the installed openpyxl has the private attributes the streaming engine relies on."""
+    workbook = load_workbook(create_test_excel_file, read_only=True)
+    try:
+        check_openpyxl_internals(workbook, workbook['Sheet1'], WorkSheetParser)
+        with pytest.raises(RuntimeError, match="does not support openpyxl"):
+            check_openpyxl_internals(workbook, object(), WorkSheetParser)
+    finally:
+        workbook.close()
+
+@pytest.mark.parametrize("sheet_executor", ["thread", "process"])
+def test_excel_loader_parallel_sheets(create_mixed_type_excel_file, sheet_executor):
+    """Test that sheets parsed concurrently match the sequential result and keep the requested order."""
+    loader = ExcelLoader()
+    sheet_names = ['Sheet2', 'Sheet1']
+
+    expected = loader.load(create_mixed_type_excel_file, sheet_names)
+    data = loader.load(create_mixed_type_excel_file, sheet_names, sheet_workers=2, sheet_executor=sheet_executor)
+
+    assert list(data) == sheet_names
+    for sheet_name in sheet_names:
+        pd.testing.assert_frame_equal(data[sheet_name], expected[sheet_name])
+
+def test_excel_loader_iter_sheets_yields_every_sheet(create_mixed_type_excel_file):
+    """Test that iter_sheets yields each sheet once, in completion order."""
+    loader = ExcelLoader()
+
+    sheets = dict(loader.iter_sheets(create_mixed_type_excel_file, ['Sheet1', 'Sheet2'], sheet_workers=2, sheet_executor='thread'))
+
+    assert set(sheets) == {'Sheet1', 'Sheet2'}
+
+@pytest.mark.parametrize("sheet_workers", [1, 2])
+def test_excel_loader_parallel_missing_sheet(create_mixed_type_excel_file, sheet_workers, capsys):
+    """Test that a failing sheet is reported and the other sheets are still returned."""
+    loader = ExcelLoader()
+
+    data = loader.load(create_mixed_type_excel_file, ['Missing', 'Sheet1'], sheet_workers=sheet_workers, sheet_executor='thread')
+
+    assert set(data) == {'Sheet1'}
+    assert "Error loading sheet Missing" in capsys.readouterr().out
+
+def test_excel_loader_all_sheets(create_mixed_type_excel_file):
+    """Test that every sheet is read, in workbook order, when no sheet names are given."""
+    data = ExcelLoader().load(create_mixed_type_excel_file, None)
+
+    assert list(data) == ['Sheet1', 'Sheet2']
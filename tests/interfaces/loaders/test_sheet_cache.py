@@ -0,0 +1,96 @@
+# tests/interfaces/loaders/test_sheet_cache.py
+
+import os
+import time
+import pandas as pd
+import pytest
+from src.interfaces.loaders.excel_loader import ExcelLoader
+from src.interfaces.loaders.sheet_cache import SheetCache
+
+@pytest.fixture()
+def create_test_excel_file(tmp_path):
+    """Fixture to create a temporary Excel file with missing values for testing."""
+    test_file_path = os.path.join(tmp_path, 'test_file.xlsx')
+    data = {'Column1': [1, 2, None], 'Column2': ['A', None, 'C'], 'Column3': pd.to_datetime(['2024-01-01', None, '2024-01-03'])}
+    with pd.ExcelWriter(test_file_path, engine='openpyxl') as writer:
+        pd.DataFrame(data).to_excel(writer, sheet_name='Sheet1', index=False)
+    return test_file_path
+
+def test_sheet_cache_round_trip(create_test_excel_file, tmp_path):
+    """Test that a cached sheet is returned identical to the parsed one."""
+    cache_dir = os.path.join(tmp_path, 'cache')
+    loader = ExcelLoader()
+
+    parsed = loader.load(create_test_excel_file, ['Sheet1'], cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+
+    cached = loader.load(create_test_excel_file, ['Sheet1'], cache_dir=cache_dir)
+    pd.testing.assert_frame_equal(cached['Sheet1'], parsed['Sheet1'])
+
+def test_sheet_cache_key_changes_with_workbook_and_options(create_test_excel_file, tmp_path):
+    """Test that the key depends on the workbook contents, the sheet and the loader options."""
+    cache = SheetCache(os.path.join(tmp_path, 'cache'))
+
+    key = cache.build_key(create_test_excel_file, 'Sheet1', {'engine': 'openpyxl', 'columns': None})
+    assert key == cache.build_key(create_test_excel_file, 'Sheet1', {'engine': 'openpyxl', 'columns': None})
+    assert key != cache.build_key(create_test_excel_file, 'Sheet2', {'engine': 'openpyxl', 'columns': None})
+    assert key != cache.build_key(create_test_excel_file, 'Sheet1', {'engine': 'openpyxl', 'columns': ['Column1']})
+
+    with pd.ExcelWriter(create_test_excel_file, engine='openpyxl') as writer:
+        pd.DataFrame({'Column1': [9]}).to_excel(writer, sheet_name='Sheet1', index=False)
+    assert key != cache.build_key(create_test_excel_file, 'Sheet1', {'engine': 'openpyxl', 'columns': None})
+
+def test_sheet_cache_lru_eviction(tmp_path):
+    """Test that the least recently used entries are evicted once the size limit is exceeded."""
+    cache = SheetCache(os.path.join(tmp_path, 'cache'))
+    data = pd.DataFrame({'Column1': range(1000)})
+
+    cache.put('first', data)
+    entry_size = os.path.getsize(cache.entry_path('first'))
+    cache.max_bytes = 2 * entry_size
+    time.sleep(0.01)
+    cache.put('second', data)
+    time.sleep(0.01)
+    # Reading 'first' makes 'second' the least recently used entry
+    assert cache.get('first') is not None
+    time.sleep(0.01)
+    cache.put('third', data)
+
+    assert cache.get('second') is None
+    assert cache.get('first') is not None
+    assert cache.get('third') is not None
+
+def test_sheet_cache_round_trip_numeric_header(tmp_path):
+    """Test that non-string column labels come back from the cache with their type."""
+    test_file_path = os.path.join(tmp_path, 'numeric_header.xlsx')
+    with pd.ExcelWriter(test_file_path, engine='openpyxl') as writer:
+        pd.DataFrame([[1, 'x']], columns=[2024, 'a']).to_excel(writer, sheet_name='Sheet1', index=False)
+    cache_dir = os.path.join(tmp_path, 'cache')
+    loader = ExcelLoader()
+
+    parsed = loader.load(test_file_path, ['Sheet1'], cache_dir=cache_dir)
+    cached = loader.load(test_file_path, ['Sheet1'], cache_dir=cache_dir)
+
+    assert list(parsed['Sheet1'].columns) == [2024, 'a']
+    assert list(cached['Sheet1'].columns) == [2024, 'a']
+    pd.testing.assert_frame_equal(cached['Sheet1'], parsed['Sheet1'])
+
+def test_sheet_cache_eviction_skips_entries_removed_by_another_worker(tmp_path, monkeypatch):
+    """Test that eviction does not fail when another worker removed an entry first."""
+    from src.interfaces.loaders import sheet_cache
+
+    cache = SheetCache(os.path.join(tmp_path, 'cache'))
+    data = pd.DataFrame({'Column1': range(1000)})
+    cache.put('first', data)
+    cache.put('second', data)
+    cache.max_bytes = 0
+
+    original_remove = os.remove
+    def remove_first_elsewhere(path):
+        # Another worker wins the race for this entry
+        original_remove(path)
+        raise FileNotFoundError(path)
+    monkeypatch.setattr(sheet_cache.os, 'remove', remove_first_elsewhere)
+
+    cache.evict()
+    assert os.listdir(cache.cache_dir) == []
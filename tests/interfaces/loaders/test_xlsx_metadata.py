@@ -0,0 +1,107 @@
+# tests/interfaces/loaders/test_xlsx_metadata.py
+
+import os
+import zipfile
+import pandas as pd
+import pytest
+import shutil
+from openpyxl import Workbook
+from openpyxl.chart import BarChart, Reference
+from src.interfaces.loaders.xlsx_metadata import (get_sheet_dimensions, hash_sheet_contents, iter_sheet_formulas,
+                                                  read_sheet_chart_types, read_sheet_paths, resolve_target)
+
+@pytest.fixture()
+def create_test_excel_file(tmp_path):
+    """Fixture to create an Excel file with sheets of different sizes."""
+    test_file_path = os.path.join(tmp_path, 'test_file.xlsx')
+    with pd.ExcelWriter(test_file_path, engine='openpyxl') as writer:
+        pd.DataFrame({'Column1': range(10), 'Column2': range(10), 'Column3': range(10)}).to_excel(writer, sheet_name='Large', index=False)
+        pd.DataFrame({'Column1': range(3)}).to_excel(writer, sheet_name='Small sheet', index=False)
+    return test_file_path
+
+def test_read_sheet_paths(create_test_excel_file):
+    """Test that sheet names are mapped to their worksheet parts in workbook order."""
+    with zipfile.ZipFile(create_test_excel_file) as archive:
+        sheet_paths = read_sheet_paths(archive)
+
+    assert list(sheet_paths) == ['Large', 'Small sheet']
+    assert all(path in zipfile.ZipFile(create_test_excel_file).namelist() for path in sheet_paths.values())
+
+def test_get_sheet_dimensions(create_test_excel_file):
+    """Test that the declared extent includes the header row and ignores unknown sheets."""
+    dimensions = get_sheet_dimensions(create_test_excel_file, ['Small sheet', 'Missing'])
+
+    assert dimensions == {'Small sheet': (4, 1)}
+    assert get_sheet_dimensions(create_test_excel_file)['Large'] == (11, 3)
+
+@pytest.mark.parametrize("source_path, target, expected", [
+    ('xl/workbook.xml', 'worksheets/sheet1.xml', 'xl/worksheets/sheet1.xml'),
+    ('xl/worksheets/sheet1.xml', '../drawings/drawing1.xml', 'xl/drawings/drawing1.xml'),
+    ('xl/workbook.xml', '/xl/worksheets/sheet2.xml', 'xl/worksheets/sheet2.xml'),
+])
+def test_resolve_target(source_path, target, expected):
+    """Test that relative and absolute relationship targets resolve to zip paths."""
+    assert resolve_target(source_path, target) == expected
+
+def test_hash_sheet_contents(create_test_excel_file, tmp_path):
+    """Test that copies of a workbook hash identically and sheets with other content do not."""
+    copy_path = os.path.join(tmp_path, 'renamed_copy.xlsx')
+    shutil.copy(create_test_excel_file, copy_path)
+    edited_path = os.path.join(tmp_path, 'edited.xlsx')
+    with pd.ExcelWriter(edited_path, engine='openpyxl') as writer:
+        pd.DataFrame({'Column1': range(10), 'Column2': range(10), 'Column3': range(10)}).to_excel(writer, sheet_name='Large', index=False)
+        pd.DataFrame({'Column1': [0, 1, 99]}).to_excel(writer, sheet_name='Small sheet', index=False)
+
+    hashes = hash_sheet_contents(create_test_excel_file)
+
+    assert list(hashes) == ['Large', 'Small sheet']
+    assert hashes['Large'] != hashes['Small sheet']
+    assert hash_sheet_contents(copy_path) == hashes
+    assert hash_sheet_contents(edited_path, ['Small sheet', 'Missing']) == {'Small sheet': hash_sheet_contents(edited_path)['Small sheet']}
+    assert hash_sheet_contents(edited_path)['Small sheet'] != hashes['Small sheet']
+
+def test_iter_sheet_formulas(tmp_path):
+    """Test that shared formulas are translated for each cell and cells without a reference are located."""
+    template_path = os.path.join(tmp_path, 'template.xlsx')
+    workbook = Workbook()
+    workbook.active['A1'] = 1
+    workbook.save(template_path)
+
+    # Rewrite the sheet with a shared formula in B1:B3 and a row whose cells omit their reference
+    sheet_data = (
+        '<sheetData>'
+        '<row r="1"><c r="A1"><v>1</v></c><c r="B1"><f t="shared" ref="B1:B3" si="0">A1*2</f><v>2</v></c></row>'
+        '<row r="2"><c r="A2"><v>2</v></c><c r="B2"><f t="shared" si="0"/><v>4</v></c></row>'
+        '<row><c><v>3</v></c><c><f t="shared" si="0"/><v>6</v></c><c><f>SUM(A1:A3)</f><v>6</v></c></row>'
+        '</sheetData>'
+    )
+    file_path = os.path.join(tmp_path, 'shared.xlsx')
+    with zipfile.ZipFile(template_path) as source, zipfile.ZipFile(file_path, 'w') as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == 'xl/worksheets/sheet1.xml':
+                xml = content.decode()
+                content = (xml[:xml.index('<sheetData')] + sheet_data + xml[xml.index('</sheetData>') + len('</sheetData>'):]).encode()
+            target.writestr(item, content)
+
+    with zipfile.ZipFile(file_path) as archive:
+        formulas = list(iter_sheet_formulas(archive, 'xl/worksheets/sheet1.xml'))
+
+    assert formulas == [('B1', '=A1*2'), ('B2', '=A2*2'), ('B3', '=A3*2'), ('C3', '=SUM(A1:A3)')]
+
+def test_read_sheet_chart_types(create_test_excel_file, tmp_path):
+    """Test that charts are found through the sheet's drawing relationships."""
+    workbook = Workbook()
+    worksheet = workbook.active
+    for row in [(1, 2), (3, 4)]:
+        worksheet.append(row)
+    chart = BarChart()
+    chart.add_data(Reference(worksheet, min_col=1, min_row=1, max_col=2, max_row=2))
+    worksheet.add_chart(chart, 'D2')
+    file_path = os.path.join(tmp_path, 'chart.xlsx')
+    workbook.save(file_path)
+
+    with zipfile.ZipFile(file_path) as archive:
+        assert read_sheet_chart_types(archive, read_sheet_paths(archive)['Sheet']) == ['barChart']
+    with zipfile.ZipFile(create_test_excel_file) as archive:
+        assert read_sheet_chart_types(archive, read_sheet_paths(archive)['Large']) == []
@@ -1,5 +1,7 @@
 import unittest
+from unittest import mock
 import pandas as pd
+import pandera as pa
 from src.interfaces.schema_manager import SchemaManager
 
 class TestSchemaManager(unittest.TestCase):
@@ -60,5 +62,71 @@ class TestSchemaManager(unittest.TestCase):
         self.assertEqual(self.schema_manager.producer, "test", "Producer should be correctly inferred.")
         self.assertEqual(self.schema_manager.schema_name, "test_schema", "Schema name should be correctly inferred.")
 
+    def use_checked_schema(self):
+        """
+        Replace the test schema with one holding row-level checks and a uniqueness constraint.
+        """
+        self.schema_manager.schema = pa.DataFrameSchema({
+            "IntegerColumn": pa.Column(int, checks=pa.Check.greater_than_or_equal_to(0), unique=True),
+            "FloatColumn": pa.Column(float, checks=pa.Check.in_range(0, 100)),
+            "StringColumn": pa.Column(str, checks=pa.Check.isin(["A", "B"])),
+        })
+
+    def build_frame(self, num_rows):
+        return pd.DataFrame({
+            "IntegerColumn": range(num_rows),
+            "FloatColumn": [float(i % 100) for i in range(num_rows)],
+            "StringColumn": ["A" if i % 2 else "B" for i in range(num_rows)],
+        })
+
+    def test_parallel_validation_matches_serial(self):
+        """
+        Test that chunked validation returns the same DataFrame as validating the whole frame.
+        """
+        self.use_checked_schema()
+        dataframe = self.build_frame(1000)
+
+        serial_df = self.schema_manager.validate_data(dataframe)
+        parallel_df = self.schema_manager.validate_data(dataframe, workers=3, chunk_rows=128)
+
+        pd.testing.assert_frame_equal(parallel_df, serial_df)
+
+    def test_parallel_validation_reports_global_indices(self):
+        """
+        Test that failure cases from every chunk are merged with the row indices of the whole frame.
+        """
+        self.use_checked_schema()
+        dataframe = self.build_frame(1000)
+        dataframe.loc[5, "FloatColumn"] = 150.0
+        dataframe.loc[640, "StringColumn"] = "Z"
+        dataframe.loc[999, "IntegerColumn"] = -1
+
+        with mock.patch.object(self.schema_manager, 'handle_validation_error') as handle_error:
+            validated_df = self.schema_manager.validate_data(dataframe, workers=4, chunk_rows=100)
+
+        self.assertIsNone(validated_df)
+        failure_cases = handle_error.call_args[0][0].failure_cases
+        self.assertEqual(sorted(failure_cases['index']), [5, 640, 999])
+        try:
+            self.schema_manager.schema.validate(dataframe, lazy=True)
+        except pa.errors.SchemaErrors as e:
+            self.assertEqual(sorted(e.failure_cases['index']), sorted(failure_cases['index']))
+
+    def test_parallel_validation_checks_uniqueness_across_chunks(self):
+        """
+        Test that a duplicate spread over two chunks is caught by the full-frame pass.
+        """
+        self.use_checked_schema()
+        dataframe = self.build_frame(300)
+        dataframe.loc[250, "IntegerColumn"] = 10
+
+        with mock.patch.object(self.schema_manager, 'handle_validation_error') as handle_error:
+            validated_df = self.schema_manager.validate_data(dataframe, workers=2, chunk_rows=100, executor='process')
+
+        self.assertIsNone(validated_df)
+        failure_cases = handle_error.call_args[0][0].failure_cases
+        self.assertEqual(set(failure_cases['check']), {'field_uniqueness'})
+        self.assertEqual(sorted(failure_cases['index']), [10, 250])
+
 if __name__ == '__main__':
     unittest.main()
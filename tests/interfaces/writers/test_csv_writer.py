@@ -23,3 +23,42 @@ def test_csv_writer(create_temp_dir):
     assert os.path.exists(output_path)
     written_data = pd.read_csv(output_path)
     assert written_data.equals(test_data)
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_csv_writer_gzip(create_temp_dir, engine):
+    """Test compressed, chunked output with both CSV engines."""
+    writer = CsvWriter()
+    test_data = pd.DataFrame({'Column1': [1, 2, 3], 'Column2': ['A', 'B,C', 'D']})
+    output_path = os.path.join(create_temp_dir, f'test_output_{engine}.csv')
+
+    written_path = writer.write(test_data, output_path, compression='gzip', engine=engine, chunk_size=2)
+
+    assert written_path == f"{output_path}.gz"
+    assert os.path.exists(written_path)
+    written_data = pd.read_csv(written_path)
+    assert written_data.equals(test_data)
+
+@pytest.mark.parametrize("engine", ["pandas", "pyarrow"])
+def test_csv_writer_zstd(create_temp_dir, engine):
+    """Test zstd output with both CSV engines, with or without the optional zstandard package."""
+    import pyarrow.csv as pacsv
+
+    writer = CsvWriter()
+    test_data = pd.DataFrame({'Column1': [1, 2, 3], 'Column2': ['A', 'B,C', 'D']})
+    output_path = os.path.join(create_temp_dir, f'test_output_{engine}.csv')
+
+    written_path = writer.write(test_data, output_path, compression='zstd', engine=engine, chunk_size=2)
+
+    assert written_path == f"{output_path}.zst"
+    assert pacsv.read_csv(written_path).to_pandas().equals(test_data)
+
+def test_csv_writer_invalid_options(create_temp_dir):
+    """Test that unsupported engines and codecs are rejected."""
+    writer = CsvWriter()
+    test_data = pd.DataFrame({'Column1': [1]})
+    output_path = os.path.join(create_temp_dir, 'test_output.csv')
+
+    with pytest.raises(ValueError):
+        writer.write(test_data, output_path, compression='bz2')
+    with pytest.raises(ValueError):
+        writer.write(test_data, output_path, engine='polars')
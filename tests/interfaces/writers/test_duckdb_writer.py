@@ -4,7 +4,7 @@ import os
 import pandas as pd
 import pytest
 import duckdb
-from src.interfaces.writers.duckdb_writer import DuckdbWriter
+from src.interfaces.writers.duckdb_writer import DuckdbWriter, EXPORT_MARKER
 
 @pytest.fixture()
 def create_temp_duckdb_db(tmp_path):
@@ -43,3 +43,229 @@ def test_duckdb_writer(create_temp_duckdb_db):
 
     # Close the connection
     conn.close()
+
+def test_duckdb_writer_sort_by(create_temp_duckdb_db):
+    """Test that rows are inserted clustered by the declared sort key."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+
+    test_data = pd.DataFrame({'Column1': [3, 1, 2], 'Column2': ['C', 'A', 'B'], 'source_filepath': ['f.xlsx'] * 3})
+    writer.write(test_data, db_path, 'test_schema', 'sorted_table', ['source_filepath'], sort_by=['Column1'])
+
+    conn = duckdb.connect(db_path)
+    result = conn.execute("SELECT Column1 FROM test_schema.sorted_table").fetchdf()
+    conn.close()
+
+    assert result['Column1'].tolist() == [1, 2, 3]
+
+def test_duckdb_writer_export_parquet(create_temp_duckdb_db, tmp_path):
+    """Test exporting a table to a hive-partitioned Parquet dataset."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+    partition_columns = ['source_filepath', 'source_sheetname']
+
+    for file_path in ['dir/a.xlsx', 'dir/b.xlsx']:
+        test_data = pd.DataFrame({'Column1': [1, 2], 'source_filepath': file_path, 'source_sheetname': 'Sheet1'})
+        writer.write(test_data, db_path, 'test_schema', 'export_table', partition_columns)
+
+    output_dir = os.path.join(tmp_path, 'parquet')
+    writer.export_parquet(db_path, 'test_schema', 'export_table', output_dir, partition_columns)
+
+    assert sorted(os.listdir(output_dir)) == [EXPORT_MARKER, 'source_filepath=dir%2Fa.xlsx', 'source_filepath=dir%2Fb.xlsx']
+    conn = duckdb.connect()
+    result = conn.execute(f"""
+        SELECT * FROM read_parquet('{output_dir}/**/*.parquet', hive_partitioning = true)
+        WHERE source_filepath = 'dir/a.xlsx'
+    """).fetchdf()
+    conn.close()
+
+    assert result['Column1'].tolist() == [1, 2]
+    assert set(result['source_sheetname']) == {'Sheet1'}
+
+def test_duckdb_writer_export_parquet_replaces_only_exports(create_temp_duckdb_db, tmp_path):
+    """Test that a re-export replaces the previous one and a directory not written by an export is left untouched."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+    writer.write(pd.DataFrame({'Column1': [1], 'source_filepath': 'a.xlsx'}), db_path, 'test_schema', 'export_table', ['source_filepath'])
+
+    output_dir = os.path.join(tmp_path, 'parquet')
+    writer.export_parquet(db_path, 'test_schema', 'export_table', output_dir, ['source_filepath'])
+    conn = duckdb.connect(db_path)
+    conn.execute("UPDATE test_schema.export_table SET source_filepath = 'b.xlsx'")
+    conn.close()
+    writer.export_parquet(db_path, 'test_schema', 'export_table', output_dir, ['source_filepath'])
+    assert sorted(os.listdir(output_dir)) == [EXPORT_MARKER, 'source_filepath=b.xlsx']
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('.parquet')]
+
+    bronze_dir = os.path.join(tmp_path, 'bronze')
+    os.makedirs(bronze_dir)
+    open(os.path.join(bronze_dir, 'data.xlsx'), 'w').close()
+    with pytest.raises(ValueError, match="Refusing to replace"):
+        writer.export_parquet(db_path, 'test_schema', 'export_table', bronze_dir, ['source_filepath'])
+    assert os.listdir(bronze_dir) == ['data.xlsx']
+
+def test_duckdb_writer_multi_partition_batch(create_temp_duckdb_db):
+    """Test that a batch spanning several partitions replaces each of them."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+    partition_columns = ['source_filepath', 'source_sheetname']
+
+    first_load = pd.DataFrame({
+        'Column1': [1, 2, 3],
+        'source_filepath': ['a.xlsx', 'a.xlsx', 'b.xlsx'],
+        'source_sheetname': ['Sheet1', 'Sheet2', 'Sheet1'],
+    })
+    writer.write(first_load, db_path, 'test_schema', 'batch_table', partition_columns)
+
+    # Reload both sheets of a.xlsx in one concatenated batch
+    second_load = pd.DataFrame({
+        'Column1': [10, 20],
+        'source_filepath': ['a.xlsx', 'a.xlsx'],
+        'source_sheetname': ['Sheet1', 'Sheet2'],
+    })
+    writer.write(second_load, db_path, 'test_schema', 'batch_table', partition_columns)
+
+    conn = duckdb.connect(db_path)
+    result = conn.execute("SELECT Column1 FROM test_schema.batch_table ORDER BY Column1").fetchdf()
+    conn.close()
+
+    assert result['Column1'].tolist() == [3, 10, 20]
+
+def test_duckdb_writer_widens_compact_columns(create_temp_duckdb_db):
+    """Test that categoricals and downcast numerics are stored with stable types across batches."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+    partition_columns = ['source_filepath']
+
+    for file_path, value in [('a.xlsx', 1), ('b.xlsx', 100_000)]:
+        compact_batch = pd.DataFrame({
+            'Column1': pd.to_numeric(pd.Series([value]), downcast='integer'),
+            'Column2': pd.Series([0.5], dtype='float32'),
+            'source_filepath': pd.Categorical([file_path]),
+        })
+        writer.write(compact_batch, db_path, 'test_schema', 'compact_table', partition_columns)
+
+    conn = duckdb.connect(db_path)
+    column_types = dict(conn.execute("SELECT column_name, data_type FROM information_schema.columns WHERE table_name = 'compact_table'").fetchall())
+    result = conn.execute("SELECT * FROM test_schema.compact_table ORDER BY Column1").fetchdf()
+    conn.close()
+
+    assert column_types == {'Column1': 'BIGINT', 'Column2': 'DOUBLE', 'source_filepath': 'VARCHAR'}
+    assert result['Column1'].tolist() == [1, 100_000]
+    assert result['source_filepath'].tolist() == ['a.xlsx', 'b.xlsx']
+
+def test_duckdb_writer_commits_checkpoints_with_data(create_temp_duckdb_db):
+    """Test that checkpoint entries are committed together with the data, or not at all."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+    test_data = pd.DataFrame({'Column1': [1, 2], 'source_filepath': ['a.xlsx', 'a.xlsx']})
+    checkpoints = pd.DataFrame({'source_filepath': ['a.xlsx'], 'rows_written': [2]})
+
+    writer.write(test_data.copy(), db_path, 'test_schema', 'test_table', ['source_filepath'],
+                 checkpoints=checkpoints, checkpoint_table='checkpoints')
+
+    # A checkpoint that cannot be inserted rolls back the data written in the same call
+    bad_checkpoints = pd.DataFrame({'source_filepath': ['b.xlsx'], 'rows_written': ['not a number']})
+    with pytest.raises(duckdb.Error):
+        writer.write(pd.DataFrame({'Column1': [3], 'source_filepath': ['b.xlsx']}), db_path, 'test_schema', 'test_table',
+                     ['source_filepath'], checkpoints=bad_checkpoints, checkpoint_table='checkpoints')
+
+    conn = duckdb.connect(db_path)
+    assert conn.execute("SELECT count(*) FROM test_schema.test_table").fetchone()[0] == 2
+    assert conn.execute("SELECT source_filepath, rows_written FROM test_schema.checkpoints").fetchall() == [('a.xlsx', 2)]
+    conn.close()
+
+def test_duckdb_writer_diff_mode(create_temp_duckdb_db):
+    """Test that the diff mode only inserts new rows and deletes vanished ones, duplicates included."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+
+    def make_batch(values, file_name='f.xlsx'):
+        data = pd.DataFrame({'Column1': values, 'source_filepath': file_name, 'created_time': pd.Timestamp.now()})
+        data['row_hash'] = pd.util.hash_pandas_object(data[['Column1']], index=False)
+        return data
+
+    first = writer.write(make_batch([1, 2, 2, 2, 3]), db_path, 'test_schema', 'diff_table', ['source_filepath'], write_mode='diff')
+    conn = duckdb.connect(db_path)
+    first_created = conn.execute("SELECT min(created_time) FROM test_schema.diff_table").fetchone()[0]
+    conn.close()
+
+    second = writer.write(make_batch([1, 2, 2, 4]), db_path, 'test_schema', 'diff_table', ['source_filepath'], write_mode='diff')
+    other = writer.write(make_batch([9], 'g.xlsx'), db_path, 'test_schema', 'diff_table', ['source_filepath'], write_mode='diff')
+
+    conn = duckdb.connect(db_path)
+    rows = conn.execute("SELECT source_filepath, Column1 FROM test_schema.diff_table ORDER BY ALL").fetchall()
+    unchanged_created = conn.execute(
+        "SELECT DISTINCT created_time FROM test_schema.diff_table WHERE Column1 IN (1, 2)").fetchall()
+    conn.close()
+
+    assert first == {'inserted': 5, 'deleted': 0, 'unchanged': 0}
+    assert second == {'inserted': 1, 'deleted': 2, 'unchanged': 3}
+    assert other == {'inserted': 1, 'deleted': 0, 'unchanged': 0}
+    assert rows == [('f.xlsx', 1), ('f.xlsx', 2), ('f.xlsx', 2), ('f.xlsx', 4), ('g.xlsx', 9)]
+    assert unchanged_created == [(first_created,)]
+
+def test_duckdb_writer_diff_mode_requires_row_hash(create_temp_duckdb_db):
+    """Test that the diff mode rejects data without a row hash."""
+    writer = DuckdbWriter()
+    test_data = pd.DataFrame({'Column1': [1], 'source_filepath': ['f.xlsx']})
+
+    with pytest.raises(ValueError, match="requires a 'row_hash' column"):
+        writer.write(test_data, create_temp_duckdb_db, 'test_schema', 'diff_table', ['source_filepath'], write_mode='diff')
+
+def test_duckdb_writer_schema_evolution(create_temp_duckdb_db):
+    """Test that new columns are added, compatible types widened and incompatible types rebuilt as VARCHAR."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+
+    writer.write(pd.DataFrame({'Column1': [1, 2], 'Column2': [10, 20], 'source_filepath': ['f.xlsx'] * 2}),
+                 db_path, 'test_schema', 'evolving_table', ['source_filepath'])
+    # A new column and a wider type
+    writer.write(pd.DataFrame({'Column1': [1.5], 'Column3': ['new'], 'source_filepath': ['g.xlsx']}),
+                 db_path, 'test_schema', 'evolving_table', ['source_filepath'])
+    # An incompatible type
+    writer.write(pd.DataFrame({'Column2': ['text'], 'source_filepath': ['h.xlsx']}),
+                 db_path, 'test_schema', 'evolving_table', ['source_filepath'])
+
+    conn = duckdb.connect(db_path)
+    column_types = dict(conn.execute("SELECT column_name, column_type FROM (DESCRIBE test_schema.evolving_table)").fetchall())
+    rows = conn.execute("SELECT * FROM test_schema.evolving_table ORDER BY source_filepath, Column1").fetchall()
+    conn.close()
+
+    assert column_types == {'Column1': 'DOUBLE', 'Column2': 'VARCHAR', 'source_filepath': 'VARCHAR', 'Column3': 'VARCHAR'}
+    assert rows == [(1.0, '10', 'f.xlsx', None), (2.0, '20', 'f.xlsx', None), (1.5, None, 'g.xlsx', 'new'), (None, 'text', 'h.xlsx', None)]
+
+def test_duckdb_writer_schema_evolution_all_null_column(create_temp_duckdb_db, capsys):
+    """Test that a column only holding nulls does not fix the column's type."""
+    writer = DuckdbWriter()
+    db_path = create_temp_duckdb_db
+
+    # An older file without the column, filled with None by normalize_data, then files with values
+    writer.write(pd.DataFrame({'Column1': [1], 'opt': [None], 'source_filepath': ['a.xlsx']}),
+                 db_path, 'test_schema', 'null_table', ['source_filepath'])
+    writer.write(pd.DataFrame({'Column1': [2], 'opt': ['text'], 'source_filepath': ['b.xlsx']}),
+                 db_path, 'test_schema', 'null_table', ['source_filepath'])
+    writer.write(pd.DataFrame({'Column1': [3], 'opt': [None], 'source_filepath': ['c.xlsx']}),
+                 db_path, 'test_schema', 'null_table', ['source_filepath'])
+
+    conn = duckdb.connect(db_path)
+    column_types = dict(conn.execute("SELECT column_name, column_type FROM (DESCRIBE test_schema.null_table)").fetchall())
+    rows = conn.execute("SELECT Column1, opt FROM test_schema.null_table ORDER BY Column1").fetchall()
+    conn.close()
+
+    assert column_types['opt'] == 'VARCHAR'
+    assert rows == [(1, None), (2, 'text'), (3, None)]
+    assert "Altered column" not in capsys.readouterr().out
+
+def test_duckdb_writer_configure(create_temp_duckdb_db):
+    """Test that configured settings apply to kept-open and new connections."""
+    writer = DuckdbWriter()
+    writer.open_connection(create_temp_duckdb_db)
+    writer.configure({'threads': 1, 'memory_limit': '128MiB'})
+
+    conn, persistent = writer.connect(create_temp_duckdb_db)
+    settings = conn.execute("SELECT current_setting('threads'), current_setting('memory_limit')").fetchone()
+    writer.close_connections()
+
+    assert persistent
+    assert settings == (1, '128.0 MiB')
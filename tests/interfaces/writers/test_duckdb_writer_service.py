@@ -0,0 +1,106 @@
+# tests/interfaces/writers/test_duckdb_writer_service.py
+
+import os
+import multiprocessing
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client
+import duckdb
+import pandas as pd
+import pytest
+from src.interfaces.writers.duckdb_writer_service import DuckdbWriterClient, DuckdbWriterService, get_authkey_path
+
+def produce(address, db_path, producer_id, num_batches):
+    """Write batches from a producer process, one partition per batch."""
+    client = DuckdbWriterClient(address)
+    for batch_id in range(num_batches):
+        batch = pd.DataFrame({'Column1': range(100), 'source_filepath': f'producer_{producer_id}_{batch_id}.xlsx'})
+        client.write(batch, db_path, 'main', 'test_table', ['source_filepath'])
+    client.close()
+
+@pytest.fixture()
+def start_service(tmp_path):
+    """Fixture to run a writer service on a temporary database."""
+    db_path = os.path.join(tmp_path, 'test_db.duckdb')
+    address = os.path.join(tmp_path, 'writer.sock')
+    service = DuckdbWriterService(db_path, address, group_wait=0.2)
+    service.start()
+    yield service
+    service.stop()
+
+def test_service_writes_batches_from_many_producers(start_service):
+    """Test that concurrent producer processes write through one service, in grouped transactions."""
+    service = start_service
+    producers = [multiprocessing.Process(target=produce, args=(service.address, service.db_path, producer_id, 5))
+                 for producer_id in range(4)]
+    for producer in producers:
+        producer.start()
+    for producer in producers:
+        producer.join(timeout=60)
+
+    assert [producer.exitcode for producer in producers] == [0, 0, 0, 0]
+    assert service.transactions < 20
+
+    service.stop()
+    conn = duckdb.connect(service.db_path)
+    partitions = conn.execute("SELECT count(DISTINCT source_filepath), count(*) FROM main.test_table").fetchone()
+    conn.close()
+    assert partitions == (20, 2000)
+
+def test_service_rejects_only_failing_batches(start_service):
+    """Test that a failing batch is reported to its producer without rolling back the others."""
+    service = start_service
+    client = DuckdbWriterClient(service.address)
+
+    counts = client.write(pd.DataFrame({'Column1': [1, 2], 'source_filepath': ['a.xlsx'] * 2, 'row_hash': [1, 2]}),
+                          service.db_path, 'main', 'test_table', ['source_filepath'], write_mode='diff')
+    with pytest.raises(RuntimeError, match="requires a 'row_hash' column"):
+        client.write(pd.DataFrame({'Column1': [3], 'source_filepath': ['b.xlsx']}),
+                     service.db_path, 'main', 'test_table', ['source_filepath'], write_mode='diff')
+    with pytest.raises(RuntimeError, match="This service writes to"):
+        client.write(pd.DataFrame({'Column1': [3]}), 'other.duckdb', 'main', 'test_table', [])
+    client.delete_tables(service.db_path, 'main', ['missing_table'])
+    client.close()
+
+    assert counts == {'inserted': 2, 'deleted': 0, 'unchanged': 0}
+    service.stop()
+    conn = duckdb.connect(service.db_path)
+    assert conn.execute("SELECT count(*) FROM main.test_table").fetchone()[0] == 2
+    conn.close()
+
+def test_service_requires_authkey(start_service):
+    """Test that the socket and generated key are owner-only and that producers without the key are refused."""
+    service = start_service
+    key_path = get_authkey_path(service.address)
+
+    assert os.stat(service.address).st_mode & 0o777 == 0o600
+    assert os.stat(key_path).st_mode & 0o777 == 0o600
+    with open(key_path, 'rb') as file:
+        assert file.read() == service.authkey
+
+    with pytest.raises(AuthenticationError):
+        Client(service.address, family='AF_UNIX', authkey=b'wrong-key')
+    with pytest.raises(AuthenticationError):
+        DuckdbWriterClient(service.address, authkey=b'wrong-key').delete_tables(service.db_path, 'main', [])
+
+    # The service keeps accepting producers with the key
+    client = DuckdbWriterClient(service.address)
+    client.delete_tables(service.db_path, 'main', [])
+    client.close()
+
+    service.stop()
+    assert not os.path.exists(key_path)
+
+def test_service_with_configured_authkey(tmp_path):
+    """Test that a configured key is used as is and not written to disk."""
+    address = os.path.join(tmp_path, 'writer.sock')
+    service = DuckdbWriterService(os.path.join(tmp_path, 'test_db.duckdb'), address, authkey=b'shared-key')
+    service.start()
+    try:
+        assert not os.path.exists(get_authkey_path(address))
+        with pytest.raises(FileNotFoundError, match="No authkey given"):
+            DuckdbWriterClient(address).delete_tables(service.db_path, 'main', [])
+        client = DuckdbWriterClient(address, authkey=b'shared-key')
+        client.delete_tables(service.db_path, 'main', [])
+        client.close()
+    finally:
+        service.stop()
@@ -0,0 +1,99 @@
+# tests/pipelines/source/test_checkpoint_log.py
+
+import os
+import duckdb
+import pandas as pd
+import pytest
+from src.pipelines.source.checkpoint_log import DuckdbCheckpointLog, FileCheckpointLog
+from src.pipelines.source.excel_ingestion_process import get_pending_source_files
+
+@pytest.fixture()
+def create_test_batch():
+    """Fixture to create a validated batch spanning two sheets."""
+    return pd.DataFrame({
+        'Column1': [1, 2, 3],
+        'source_filepath': ['a.xlsx', 'a.xlsx', 'b.xlsx'],
+        'source_sheetname': ['Sheet1', 'Sheet1', 'Sheet2'],
+    })
+
+def test_build_checkpoints(create_test_batch):
+    """Test that one completed entry is built per (file, sheet) with its row count."""
+    log = FileCheckpointLog('test_pipeline', 'unused.jsonl', run_id='run-1')
+
+    entries = log.build_checkpoints(create_test_batch)
+
+    assert entries[['source_filepath', 'source_sheetname', 'rows_written']].values.tolist() == [
+        ['a.xlsx', 'Sheet1', 2], ['b.xlsx', 'Sheet2', 1]]
+    assert set(entries['status']) == {'completed'}
+    assert set(entries['run_id']) == {'run-1'}
+
+@pytest.mark.parametrize("log_type", ["file", "duckdb"])
+def test_resume_latest_run(create_test_batch, tmp_path, log_type):
+    """Test that resuming continues the latest run and returns only its completed sheets."""
+    def make_log(run_id=None):
+        if log_type == 'file':
+            return FileCheckpointLog('test_pipeline', os.path.join(tmp_path, 'checkpoints.jsonl'), run_id=run_id)
+        return DuckdbCheckpointLog('test_pipeline', os.path.join(tmp_path, 'test_db.duckdb'), 'main', run_id=run_id)
+
+    old_run = make_log('old-run')
+    old_run.record(old_run.build_checkpoints(create_test_batch.iloc[2:]))
+    latest_run = make_log('latest-run')
+    latest_run.record(latest_run.build_checkpoints(create_test_batch.iloc[:2]))
+    latest_run.record(latest_run.build_entries([('b.xlsx', 'Sheet2', 0)], 'failed'))
+
+    resumed = make_log()
+    completed = resumed.resume_latest_run()
+
+    assert resumed.run_id == 'latest-run'
+    assert completed == {('a.xlsx', 'Sheet1')}
+
+def test_resume_without_previous_run(tmp_path):
+    """Test that resuming without checkpoints starts a new run."""
+    log = DuckdbCheckpointLog('test_pipeline', os.path.join(tmp_path, 'test_db.duckdb'), 'main', run_id='new-run')
+
+    assert log.resume_latest_run() == set()
+    assert log.run_id == 'new-run'
+
+def test_get_pending_source_files():
+    """Test that completed sheets are dropped and fully completed files are skipped."""
+    source_files = [
+        {'path': 'a.xlsx', 'file_type': 'excel', 'loader_config': {'tab_names': ['Sheet1', 'Sheet2'], 'engine': 'calamine'}},
+        {'path': 'b.xlsx', 'file_type': 'excel', 'loader_config': {'tab_names': ['Sheet1']}},
+        {'path': 'c.csv', 'file_type': 'csv'},
+    ]
+    completed = {('a.xlsx', 'Sheet1'), ('b.xlsx', 'Sheet1'), ('c.csv', 'c')}
+
+    pending = get_pending_source_files(source_files, completed)
+
+    assert pending == [{'path': 'a.xlsx', 'file_type': 'excel', 'loader_config': {'tab_names': ['Sheet2'], 'engine': 'calamine'}}]
+
+def test_get_pending_source_files_whole_files():
+    """Test that file-based writers resume a partly completed file with all its sheets."""
+    source_files = [
+        {'path': 'a.xlsx', 'file_type': 'excel', 'loader_config': {'tab_names': ['Sheet1', 'Sheet2']}},
+        {'path': 'b.xlsx', 'file_type': 'excel', 'loader_config': {'tab_names': ['Sheet1']}},
+    ]
+    completed = {('a.xlsx', 'Sheet1'), ('b.xlsx', 'Sheet1')}
+
+    pending = get_pending_source_files(source_files, completed, whole_files=True)
+
+    assert pending == [source_files[0]]
+
+@pytest.mark.parametrize("log_type", ["file", "duckdb"])
+def test_resume_run_that_failed_before_writing(create_test_batch, tmp_path, log_type):
+    """Test that a started run without written units is resumed, instead of the completed run before it."""
+    def make_log(run_id=None):
+        if log_type == 'file':
+            return FileCheckpointLog('test_pipeline', os.path.join(tmp_path, 'checkpoints.jsonl'), run_id=run_id)
+        return DuckdbCheckpointLog('test_pipeline', os.path.join(tmp_path, 'test_db.duckdb'), 'main', run_id=run_id)
+
+    completed_run = make_log('completed-run')
+    completed_run.start_run()
+    completed_run.record(completed_run.build_checkpoints(create_test_batch))
+    make_log('crashed-run').start_run()
+
+    resumed = make_log()
+    completed = resumed.resume_latest_run()
+
+    assert resumed.run_id == 'crashed-run'
+    assert completed == set()
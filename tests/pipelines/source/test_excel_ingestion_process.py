@@ -0,0 +1,58 @@
+# tests/pipelines/source/test_excel_ingestion_process.py
+
+import pandas as pd
+import pandera as pa
+from src.pipelines.source.excel_ingestion_process import normalize_data, compact_data, memory_usage_mb
+
+def test_normalize_data_compact():
+    """Test that compact normalization stores metadata as categoricals with a shared timestamp."""
+    sheet_data = pd.DataFrame({'Column1': [1, 2, 3], 'Extra': ['x', 'y', 'z']})
+    created_time = pd.Timestamp('2024-01-01 10:00:00')
+
+    normalized = normalize_data('dir/file.xlsx', 'Sheet1', sheet_data, ['Column1', 'Column2'],
+                                created_time=created_time, compact=True)
+
+    assert list(normalized.columns) == ['Column1', 'Column2', 'source_filepath', 'source_sheetname', 'created_time']
+    assert isinstance(normalized['source_filepath'].dtype, pd.CategoricalDtype)
+    assert normalized['source_filepath'].tolist() == ['dir/file.xlsx'] * 3
+    assert normalized['source_sheetname'].tolist() == ['Sheet1'] * 3
+    assert (normalized['created_time'] == created_time).all()
+
+def test_normalize_data_row_hash():
+    """Test that the row hash covers the data columns only, so reloads of the same rows hash identically."""
+    sheet_data = pd.DataFrame({'Column1': [1, 2, 1], 'Column2': ['a', 'b', 'a']})
+
+    normalized = normalize_data('dir/file.xlsx', 'Sheet1', sheet_data, ['Column1', 'Column2', 'created_time'],
+                                created_time=pd.Timestamp('2024-01-01'), row_hash=True)
+    reloaded = normalize_data('dir/copy.xlsx', 'Sheet2', sheet_data, ['Column1', 'Column2', 'created_time'],
+                              created_time=pd.Timestamp('2024-02-01'), row_hash=True)
+
+    assert normalized['row_hash'].dtype == 'uint64'
+    assert normalized['row_hash'].tolist() == reloaded['row_hash'].tolist()
+    assert normalized['row_hash'][0] == normalized['row_hash'][2] != normalized['row_hash'][1]
+
+def test_compact_data_downcasts_schema_columns():
+    """Test schema-guided downcasting and the resulting memory reduction."""
+    schema = pa.DataFrameSchema({
+        'IntegerColumn': pa.Column('int64'),
+        'FloatColumn': pa.Column('float64'),
+        'PreciseColumn': pa.Column('float64'),
+    })
+    num_rows = 10_000
+    data = pd.DataFrame({
+        'IntegerColumn': pd.Series(range(num_rows)) % 100,
+        'FloatColumn': 0.5,
+        'PreciseColumn': 0.1,
+        'created_time': pd.Timestamp('2024-01-01'),
+    })
+
+    compacted = compact_data(data, schema)
+
+    assert compacted['IntegerColumn'].dtype == 'int8'
+    assert compacted['FloatColumn'].dtype == 'float32'
+    # 0.1 is not exactly representable in float32, so it stays float64
+    assert compacted['PreciseColumn'].dtype == 'float64'
+    assert isinstance(compacted['created_time'].dtype, pd.CategoricalDtype)
+    assert memory_usage_mb(compacted) < memory_usage_mb(data) / 2
+    # The input frame is left untouched
+    assert data['IntegerColumn'].dtype == 'int64'
@@ -0,0 +1,69 @@
+# tests/pipelines/source/test_file_watcher.py
+
+import os
+import pandas as pd
+import pytest
+from src.pipelines.source.file_watcher import FileWatcher
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def write_workbook(file_path, row_count=3):
+    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+        pd.DataFrame({'Column1': range(row_count)}).to_excel(writer, sheet_name='Sheet1', index=False)
+
+def test_file_watcher_debounces_new_files(tmp_path):
+    """Test that a new file is reported once it has been unchanged for the settle period."""
+    clock = FakeClock()
+    watcher = FileWatcher([str(tmp_path)], settle_seconds=5, clock=clock)
+    file_path = os.path.join(tmp_path, 'new.xlsx')
+    write_workbook(file_path)
+
+    assert watcher.poll() == []
+    clock.now = 3
+    assert watcher.poll() == []
+    clock.now = 6
+    assert watcher.poll() == [file_path]
+    clock.now = 20
+    assert watcher.poll() == []
+
+def test_file_watcher_reports_changed_files_again(tmp_path):
+    """Test that a file is reported again after it changes, and that growing files restart the timer."""
+    clock = FakeClock()
+    file_path = os.path.join(tmp_path, 'existing.xlsx')
+    write_workbook(file_path)
+    watcher = FileWatcher([str(tmp_path)], settle_seconds=5, clock=clock)
+
+    # Files present at startup are ignored by default
+    clock.now = 10
+    assert watcher.poll() == []
+
+    write_workbook(file_path, row_count=100)
+    assert watcher.poll() == []
+    clock.now = 13
+    write_workbook(file_path, row_count=200)
+    os.utime(file_path, ns=(1, 1))
+    assert watcher.poll() == []
+    clock.now = 16
+    assert watcher.poll() == []
+    clock.now = 19
+    assert watcher.poll() == [file_path]
+
+def test_file_watcher_waits_for_complete_archives(tmp_path):
+    """Test that truncated workbooks and lock files are never reported."""
+    clock = FakeClock()
+    watcher = FileWatcher([str(tmp_path)], settle_seconds=0, ingest_existing=True, clock=clock)
+    with open(os.path.join(tmp_path, 'partial.xlsx'), 'wb') as file:
+        file.write(b'PK\x03\x04 not finished')
+    with open(os.path.join(tmp_path, '~$partial.xlsx'), 'wb') as file:
+        file.write(b'lock')
+
+    assert watcher.poll() == []
+    clock.now = 1
+    assert watcher.poll() == []
@@ -0,0 +1,26 @@
+# tests/pipelines/source/test_log_store.py
+
+import os
+import pandas as pd
+import pytest
+from src.pipelines.source.log_store import DuckdbLogStore, FileLogStore
+
+COLUMNS = ['pipeline', 'source_sheetname', 'rows_written', 'recorded_at']
+
+@pytest.mark.parametrize("store_type", ["file", "duckdb"])
+def test_log_store_scopes_entries_by_pipeline(tmp_path, store_type):
+    """Test that entries are read and deleted per pipeline, keeping text columns as strings."""
+    if store_type == 'file':
+        store = FileLogStore(os.path.join(tmp_path, 'log.jsonl'), COLUMNS, text_columns=['pipeline', 'source_sheetname'])
+    else:
+        store = DuckdbLogStore(os.path.join(tmp_path, 'test_db.duckdb'), 'main', 'log', COLUMNS)
+
+    assert store.read('first').empty
+    store.append(pd.DataFrame([('first', '2024', 3, pd.Timestamp.now()), ('second', 'Sheet1', 1, pd.Timestamp.now())],
+                              columns=COLUMNS))
+    store.append(pd.DataFrame([('first', 'Sheet2', 5, pd.Timestamp.now())], columns=COLUMNS))
+
+    assert store.read('first')[['source_sheetname', 'rows_written']].values.tolist() == [['2024', 3], ['Sheet2', 5]]
+    store.delete('first')
+    assert store.read('first').empty
+    assert store.read('second')['source_sheetname'].tolist() == ['Sheet1']
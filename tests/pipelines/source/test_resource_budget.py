@@ -0,0 +1,64 @@
+# tests/pipelines/source/test_resource_budget.py
+
+import threading
+import time
+import pytest
+from src.pipelines.source.resource_budget import LoadGovernor, ResourceBudget, estimate_source_memory, parse_size
+
+@pytest.mark.parametrize("value, expected", [
+    (1024, 1024),
+    ('8GB', 8 * 1000 ** 3),
+    ('512MiB', 512 * 1024 ** 2),
+    ('1.5 gib', int(1.5 * 1024 ** 3)),
+])
+def test_parse_size(value, expected):
+    """Test that sizes are parsed with decimal and binary units."""
+    assert parse_size(value) == expected
+
+def test_parse_size_invalid():
+    """Test that unknown units are rejected."""
+    with pytest.raises(ValueError, match="Invalid memory size"):
+        parse_size('8 parsecs')
+
+def test_budget_split():
+    """Test that the ceiling is split between DuckDB, the write buffer and loads, and loader batches are sized."""
+    budget = ResourceBudget.from_config({'resources': {'memory_limit': '1GiB', 'threads': 2, 'temp_directory': '/tmp/spill'}})
+
+    assert budget.duckdb_settings() == {'threads': 2, 'memory_limit': '409MiB', 'temp_directory': '/tmp/spill'}
+    assert budget.buffer_max_bytes(256 * 1024 ** 2) == int(1024 ** 3 * 0.2)
+    assert budget.load_memory() == int(1024 ** 3 * 0.4)
+    assert budget.workers(8) == 2
+
+    csv_file = budget.apply_loader_defaults({'path': 'a.csv', 'file_type': 'csv'})
+    excel_file = budget.apply_loader_defaults({'path': 'a.xlsx', 'file_type': 'excel',
+                                               'loader_config': {'tab_names': ['Sheet1'], 'sheet_workers': 4}})
+    assert csv_file['loader_config'] == {'block_size': budget.load_memory() // 32}
+    assert excel_file['loader_config'] == {'tab_names': ['Sheet1'], 'sheet_workers': 2}
+    assert ResourceBudget.from_config({}) is None
+
+def test_estimate_source_memory():
+    """Test that declared dimensions are preferred over the file size."""
+    known = {'file_size': 1000, 'sheets': [{'rows': 11, 'columns': 3, 'estimated_rows': 10}]}
+    unknown = {'file_size': 1000, 'sheets': [{'rows': None, 'columns': None, 'estimated_rows': None}]}
+
+    assert estimate_source_memory(known, 'excel') == 10 * 3 * 64
+    assert estimate_source_memory(unknown, 'csv') == 3000
+
+def test_load_governor_throttles():
+    """Test that files wait for budget, and that an oversized file is admitted on its own."""
+    governor = LoadGovernor(100)
+    assert governor.acquire(60)
+
+    admitted = threading.Event()
+    waiter = threading.Thread(target=lambda: governor.acquire(60) and admitted.set())
+    waiter.start()
+    time.sleep(0.2)
+    assert not admitted.is_set()
+
+    governor.release(60)
+    waiter.join(timeout=5)
+    assert admitted.is_set()
+    governor.release(60)
+
+    assert governor.acquire(500)
+    assert not governor.acquire(10, cancelled=lambda: True)
@@ -0,0 +1,93 @@
+# tests/pipelines/source/test_sheet_dedup.py
+
+import os
+import shutil
+import pandas as pd
+import pytest
+from src.pipelines.source.sheet_dedup import DuckdbSheetIndex, FileSheetIndex
+
+@pytest.fixture()
+def create_test_files(tmp_path):
+    """Fixture to create a workbook, a renamed copy of it and a CSV file."""
+    original_path = os.path.join(tmp_path, 'original.xlsx')
+    with pd.ExcelWriter(original_path, engine='openpyxl') as writer:
+        pd.DataFrame({'Column1': [1, 2, 3]}).to_excel(writer, sheet_name='Sheet1', index=False)
+        pd.DataFrame({'Column1': [4, 5]}).to_excel(writer, sheet_name='Sheet2', index=False)
+    copy_path = os.path.join(tmp_path, 'copy.xlsx')
+    shutil.copy(original_path, copy_path)
+    csv_path = os.path.join(tmp_path, 'data.csv')
+    pd.DataFrame({'Column1': [1]}).to_csv(csv_path, index=False)
+    return original_path, copy_path, csv_path
+
+def make_source_file(path, tab_names=None, **loader_options):
+    """Build a source file entry as found in the pipeline configuration."""
+    loader_config = dict(loader_options)
+    if tab_names is not None:
+        loader_config['tab_names'] = tab_names
+    return {'path': path, 'file_type': 'csv' if path.endswith('.csv') else 'excel', 'loader_config': loader_config}
+
+def make_written_batch(units):
+    """Build a written batch containing the given (file, sheet) units."""
+    return pd.DataFrame(units, columns=['source_filepath', 'source_sheetname'])
+
+@pytest.mark.parametrize("index_type", ["file", "duckdb"])
+def test_deduplicate_across_runs(create_test_files, tmp_path, index_type):
+    """Test that a copy is dropped within a run and across runs, and aliased to the original load."""
+    original_path, copy_path, csv_path = create_test_files
+
+    def make_index():
+        if index_type == 'file':
+            return FileSheetIndex('test_pipeline', os.path.join(tmp_path, 'index.jsonl'))
+        return DuckdbSheetIndex('test_pipeline', os.path.join(tmp_path, 'test_db.duckdb'), 'main')
+
+    first_run = make_index()
+    pending = first_run.deduplicate([make_source_file(original_path, ['Sheet1']), make_source_file(copy_path, ['Sheet1', 'Sheet2']),
+                                     make_source_file(csv_path)])
+    assert pending == [make_source_file(original_path, ['Sheet1']), make_source_file(copy_path, ['Sheet2']), make_source_file(csv_path)]
+    first_run.record_written(make_written_batch([(original_path, 'Sheet1'), (copy_path, 'Sheet2')]))
+
+    # Reading every sheet of the copy again only reloads the sheet it was the original of
+    second_run = make_index()
+    assert second_run.deduplicate([make_source_file(copy_path)]) == [make_source_file(copy_path, ['Sheet2'])]
+
+    entries = second_run.read().sort_values(['status', 'source_filepath', 'source_sheetname'])
+    assert entries[['source_filepath', 'source_sheetname', 'status', 'original_filepath', 'original_sheetname']].values.tolist() == [
+        [copy_path, 'Sheet1', 'alias', original_path, 'Sheet1'],
+        [copy_path, 'Sheet1', 'alias', original_path, 'Sheet1'],
+        [copy_path, 'Sheet2', 'loaded', copy_path, 'Sheet2'],
+        [original_path, 'Sheet1', 'loaded', original_path, 'Sheet1'],
+    ]
+
+    second_run.clear()
+    assert second_run.read().empty
+
+def test_deduplicate_skip_mode_and_options(create_test_files, tmp_path):
+    """Test that skip mode records no aliases and that other loader options are not duplicates."""
+    original_path, copy_path, _ = create_test_files
+    index = FileSheetIndex('test_pipeline', os.path.join(tmp_path, 'index.jsonl'), mode='skip')
+
+    pending = index.deduplicate([make_source_file(original_path, ['Sheet1']), make_source_file(copy_path, ['Sheet1']),
+                                 make_source_file(copy_path, ['Sheet1'], header_row=1)])
+    index.record_written(make_written_batch([(original_path, 'Sheet1')]))
+
+    assert pending == [make_source_file(original_path, ['Sheet1']), make_source_file(copy_path, ['Sheet1'], header_row=1)]
+    assert index.read()['status'].tolist() == ['loaded']
+
+def test_changed_sheet_is_no_longer_an_original(create_test_files, tmp_path):
+    """Test that a re-sent sheet with new content no longer stands for its previous content."""
+    original_path, copy_path, _ = create_test_files
+    index = FileSheetIndex('test_pipeline', os.path.join(tmp_path, 'index.jsonl'))
+    index.deduplicate([make_source_file(original_path, ['Sheet1'])])
+    index.record_written(make_written_batch([(original_path, 'Sheet1')]))
+
+    with pd.ExcelWriter(original_path, engine='openpyxl') as writer:
+        pd.DataFrame({'Column1': [1, 2, 99]}).to_excel(writer, sheet_name='Sheet1', index=False)
+    index.deduplicate([make_source_file(original_path, ['Sheet1'])])
+    index.record_written(make_written_batch([(original_path, 'Sheet1')]))
+
+    assert index.deduplicate([make_source_file(copy_path, ['Sheet1'])]) == [make_source_file(copy_path, ['Sheet1'])]
+
+def test_unknown_mode():
+    """Test that an unsupported mode is rejected."""
+    with pytest.raises(ValueError, match="Unsupported dedup mode"):
+        FileSheetIndex('test_pipeline', 'unused.jsonl', mode='merge')
@@ -0,0 +1,49 @@
+# tests/pipelines/source/test_source_planner.py
+
+import os
+import pandas as pd
+import pytest
+from src.pipelines.source.source_planner import estimate_source_cost, format_plan, plan_source_files
+
+@pytest.fixture()
+def create_test_source_files(tmp_path):
+    """Fixture to create a small and a large workbook, listed small first."""
+    source_files = []
+    for file_name, row_count in [('small.xlsx', 5), ('large.xlsx', 2000)]:
+        file_path = os.path.join(tmp_path, file_name)
+        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+            pd.DataFrame({'Column1': range(row_count), 'Column2': ['A'] * row_count}).to_excel(writer, sheet_name='Sheet1', index=False)
+            pd.DataFrame({'Column1': range(2)}).to_excel(writer, sheet_name='Sheet2', index=False)
+        source_files.append({'file_name': file_name, 'file_type': 'excel', 'path': file_path,
+                             'loader_config': {'tab_names': ['Sheet1', 'Sheet2']}})
+    return source_files
+
+def test_estimate_source_cost(create_test_source_files):
+    """Test that rows come from the sheet dimensions and the cost is split by cell count."""
+    estimate = estimate_source_cost(create_test_source_files[1])
+
+    assert [sheet['estimated_rows'] for sheet in estimate['sheets']] == [2000, 2]
+    assert estimate['estimated_rows'] == 2002
+    assert estimate['sheets'][0]['cost'] > estimate['sheets'][1]['cost']
+    assert estimate['cost'] == pytest.approx(estimate['file_size'])
+
+def test_plan_source_files_largest_first(create_test_source_files):
+    """Test that the largest file is planned first and config order is kept on request."""
+    plan = plan_source_files(create_test_source_files)
+    assert [estimate['source_file']['file_name'] for estimate in plan] == ['large.xlsx', 'small.xlsx']
+
+    plan = plan_source_files(create_test_source_files, order='config')
+    assert [estimate['source_file']['file_name'] for estimate in plan] == ['small.xlsx', 'large.xlsx']
+
+def test_estimate_source_cost_without_dimensions(tmp_path):
+    """Test that non-xlsx and missing files fall back to their size with unknown rows."""
+    csv_path = os.path.join(tmp_path, 'data.csv')
+    pd.DataFrame({'Column1': range(10)}).to_csv(csv_path, index=False)
+
+    plan = plan_source_files([{'path': os.path.join(tmp_path, 'missing.xlsx'), 'loader_config': {'tab_names': ['Sheet1']}},
+                              {'path': csv_path, 'file_type': 'csv'}])
+
+    assert plan[0]['source_file']['path'] == csv_path
+    assert plan[0]['estimated_rows'] is None
+    assert plan[1]['cost'] == 0
+    assert 'unknown' in format_plan(plan)
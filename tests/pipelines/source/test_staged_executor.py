@@ -0,0 +1,74 @@
+# tests/pipelines/source/test_staged_executor.py
+
+import threading
+import time
+import pytest
+from src.pipelines.source.staged_executor import Stage, StagedExecutor
+
+def test_staged_executor_runs_all_stages():
+    """Test that every item flows through every stage in order for single-worker stages."""
+    written = []
+    executor = StagedExecutor([
+        Stage('load', lambda item: item * 10),
+        Stage('transform', lambda item: item + 1),
+        Stage('write', written.append),
+    ])
+
+    executor.run(range(5))
+
+    assert written == [1, 11, 21, 31, 41]
+
+def test_staged_executor_overlaps_stages():
+    """Test that a downstream stage runs while the upstream stage is still busy."""
+    second_item_loading = threading.Event()
+    overlap_seen = []
+
+    def load(item):
+        if item == 1:
+            second_item_loading.set()
+            time.sleep(0.05)
+        return item
+
+    def write(item):
+        if item == 0:
+            # The first item is written while the second one is still being loaded
+            overlap_seen.append(second_item_loading.wait(timeout=1))
+
+    StagedExecutor([Stage('load', load), Stage('write', write)]).run([0, 1])
+
+    assert overlap_seen == [True]
+
+def test_staged_executor_bounds_items_in_flight():
+    """Test that a slow downstream stage applies back-pressure to the feeder."""
+    loaded = []
+    release = threading.Event()
+
+    def write(item):
+        release.wait(timeout=1)
+
+    executor = StagedExecutor([Stage('load', lambda item: loaded.append(item) or item), Stage('write', write)], queue_size=1)
+    runner = threading.Thread(target=executor.run, args=(range(20),))
+    runner.start()
+    time.sleep(0.1)
+
+    # One item in each queue plus one held by each worker
+    assert len(loaded) <= 4
+    release.set()
+    runner.join()
+    assert len(loaded) == 20
+
+def test_staged_executor_propagates_errors():
+    """Test that the first stage error is raised from run after the pipeline drains."""
+    def transform(item):
+        if item == 2:
+            raise ValueError("bad sheet")
+        return item
+
+    executor = StagedExecutor([
+        Stage('load', lambda item: item, workers=2),
+        Stage('transform', transform),
+        Stage('write', lambda item: None),
+    ])
+
+    with pytest.raises(ValueError, match="bad sheet"):
+        executor.run(range(10))
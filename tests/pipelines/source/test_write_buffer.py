@@ -0,0 +1,32 @@
+# tests/pipelines/source/test_write_buffer.py
+
+import pandas as pd
+from src.pipelines.source.write_buffer import WriteBuffer
+
+def test_write_buffer_groups_frames_by_destination():
+    """Test that buffered frames are concatenated into one write per destination."""
+    writes = []
+    buffer = WriteBuffer(lambda key, batch: writes.append((key, batch)))
+
+    buffer.add('a.csv', pd.DataFrame({'Column1': [1, 2]}))
+    buffer.add('a.csv', pd.DataFrame({'Column1': [3]}))
+    buffer.add('b.csv', pd.DataFrame({'Column1': [4]}))
+    buffer.flush()
+
+    assert [key for key, _ in writes] == ['a.csv', 'b.csv']
+    assert writes[0][1]['Column1'].tolist() == [1, 2, 3]
+    assert buffer.buffered_rows == 0 and buffer.frames == {}
+
+def test_write_buffer_flush_if_full():
+    """Test that the buffer only flushes once the row threshold is reached."""
+    writes = []
+    buffer = WriteBuffer(lambda key, batch: writes.append(batch), max_rows=3)
+
+    buffer.add('table', pd.DataFrame({'Column1': [1, 2]}))
+    buffer.flush_if_full()
+    assert writes == []
+
+    buffer.add('table', pd.DataFrame({'Column1': [3]}))
+    buffer.flush_if_full()
+    assert len(writes) == 1
+    assert len(writes[0]) == 3